@@ -21,7 +21,14 @@ fi
 echo "Running benchmarks..."
 echo ""
 
-# Parse benchmarks
+echo "=== Parser Microbenchmark ==="
+python benchmark_parser.py --requirements 200
+
+echo ""
+echo "=== Startup Benchmark ==="
+python benchmark_startup.py
+
+echo ""
 echo "=== Parse + Generate Benchmarks ==="
 for size in small medium large; do
     echo -n "$size: "
@@ -0,0 +1,150 @@
+"""Parser microbenchmark on a generated 200-requirement PRD.
+
+Compares PRDParser against a copy of the original per-line ``re.match``
+list-item and header matching, on the same content. The PRD has one
+``###`` feature subsection per 10 requirements.
+
+Usage:
+    python benchmark_parser.py [--requirements N] [--repeat R]
+"""
+
+import argparse
+import re
+import tempfile
+import timeit
+from pathlib import Path
+
+from spec_test_generator.parser import ParsedPRD, PRDParser
+
+
+def make_prd(requirements: int) -> str:
+    """Build a PRD with numbered requirements and prose between sections."""
+    lines = ["# PRD: Benchmark Feature", "", "## Goal", "Measure parser throughput.", ""]
+    lines += ["## Overview"]
+    lines += [f"Context paragraph {i} describing the feature in prose." for i in range(50)]
+    lines += ["", "## Functional Requirements"]
+    for i in range(1, requirements + 1):
+        if i % 10 == 1:
+            lines.append(f"### Feature {i // 10 + 1}")
+        lines.append(f"{i}) The system must handle case {i} within the documented limits.")
+        lines.append(f"   Rationale: case {i} is reported by customers.")
+    lines += ["", "## Non-Functional Requirements"]
+    lines += [f"- Performance: operation {i} p95 < 300ms" for i in range(requirements // 10)]
+    lines += ["", "## Non-Goals", "- Mobile support", "", "## Notes"]
+    lines += [f"* Note {i}" for i in range(20)]
+    return "\n".join(lines) + "\n"
+
+
+class LegacyParser(PRDParser):
+    """PRDParser with the original line splitting, two-regex line matching and
+    substring section classification.
+
+    Repeated headings replace earlier ones, so compare on a PRD without them.
+    """
+
+    def _parse_content(self, content: str) -> ParsedPRD:
+        result = ParsedPRD(raw_content=content)
+        title_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
+        if title_match:
+            result.title = title_match.group(1).strip()
+
+        for section_name, section_content in self._split_sections(content).items():
+            section_lower = section_name.lower()
+            if ("goal" in section_lower or "objective" in section_lower) and (
+                "non" not in section_lower
+            ):
+                result.goal = section_content.strip()
+            elif "functional" in section_lower and "non" not in section_lower:
+                result.functional_requirements = self._legacy_items(section_content)
+            elif "non-functional" in section_lower or "nfr" in section_lower:
+                result.non_functional_requirements = self._legacy_items(section_content)
+            elif "non-goal" in section_lower or "out of scope" in section_lower:
+                result.non_goals = self._legacy_items(section_content)
+            elif "note" in section_lower:
+                result.notes = self._legacy_items(section_content)
+            elif "assumption" in section_lower:
+                result.assumptions = self._legacy_items(section_content)
+            elif "requirement" in section_lower:
+                result.functional_requirements.extend(self._legacy_items(section_content))
+        return result
+
+    def _split_sections(self, content: str) -> dict[str, str]:
+        sections: dict[str, str] = {}
+        current_section = "preamble"
+        current_content: list[str] = []
+        for line in content.split("\n"):
+            header_match = re.match(r"^##\s+(.+)$", line)
+            if header_match:
+                if current_content:
+                    sections[current_section] = "\n".join(current_content)
+                current_section = header_match.group(1).strip()
+                current_content = []
+            else:
+                current_content.append(line)
+        if current_content:
+            sections[current_section] = "\n".join(current_content)
+        return sections
+
+    def _legacy_items(self, content: str) -> list[str]:
+        items = []
+        for line in content.split("\n"):
+            numbered_match = re.match(r"^\s*\d+[.)]\s*(.+)$", line)
+            bullet_match = re.match(r"^\s*[-*]\s+(.+)$", line)
+            if numbered_match:
+                items.append(numbered_match.group(1).strip())
+            elif bullet_match:
+                items.append(bullet_match.group(1).strip())
+        return items
+
+
+def bench(parser: PRDParser, content: str, repeat: int, number: int) -> float:
+    """Best time per parse, in milliseconds."""
+    times = timeit.repeat(lambda: parser._parse_content(content), repeat=repeat, number=number)
+    return min(times) / number * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--requirements", type=int, default=200)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--number", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    content = make_prd(args.requirements)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "prd.md"
+        path.write_text(content)
+
+        legacy = LegacyParser(path)
+        current = PRDParser(path)
+        expected: ParsedPRD = legacy._parse_content(content)
+        assert current._parse_content(content) == expected, "parsers disagree"
+        assert len(expected.functional_requirements) == args.requirements
+
+        legacy_ms = bench(legacy, content, args.repeat, args.number)
+        current_ms = bench(current, content, args.repeat, args.number)
+
+        file_ms = {}
+        for mode in ("streaming", "use_mmap"):
+            file_parser = PRDParser(path, **{mode: True})
+            file_ms[mode] = (
+                min(timeit.repeat(file_parser.parse_file, repeat=args.repeat, number=args.number))
+                / args.number
+                * 1000
+            )
+
+    print(f"Parser ({args.requirements} requirements, {len(content) // 1024} KB)")
+    print(f"| {'Parser':<18} | {'ms/parse':>8} | {'Speedup':>7} |")
+    print(f"|{'-' * 20}|{'-' * 10}|{'-' * 9}|")
+    for name, ms in (
+        ("legacy re.match", legacy_ms),
+        ("compiled", current_ms),
+        ("streaming (file)", file_ms["streaming"]),
+        ("mmap (file)", file_ms["use_mmap"]),
+    ):
+        print(f"| {name:<18} | {ms:>8.3f} | {legacy_ms / ms:>6.2f}x |")
+
+
+if __name__ == "__main__":
+    main()
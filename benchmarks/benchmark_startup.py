@@ -0,0 +1,74 @@
+"""CLI startup benchmark using ``python -X importtime``.
+
+Reports import time per entry point: the package alone, the CLI module
+(what ``--help`` and ``--version`` pay), the default generate command, and
+every public name for comparison with eager imports. The budget for the CLI
+module is enforced by tests/unit/test_startup.py.
+
+Usage:
+    python benchmark_startup.py [--repeat R]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+ENTRY_POINTS = {
+    "package": "import spec_test_generator",
+    "cli (--help/--version)": "import spec_test_generator.__main__",
+    "generate command": "import spec_test_generator.generator",
+    "all public names": "from spec_test_generator import *",
+}
+
+
+def import_times(statement: str) -> dict[str, tuple[int, int]]:
+    """Run a statement under ``-X importtime``.
+
+    Returns:
+        Module name -> (self, cumulative) import time in microseconds
+    """
+    env = {**os.environ, "PYTHONPATH": str(SRC)}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def package_ms(times: dict[str, tuple[int, int]]) -> float:
+    """Time spent in this package's own modules, in milliseconds."""
+    return sum(s for name, (s, _) in times.items() if name.startswith("spec_test_generator")) / 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a results table."""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    print(f"Import time (median of {args.repeat} runs)")
+    print(f"| {'Entry point':<24} | {'Total ms':>8} | {'Package ms':>10} | {'Modules':>7} |")
+    print(f"|{'-' * 26}|{'-' * 10}|{'-' * 12}|{'-' * 9}|")
+    for name, statement in ENTRY_POINTS.items():
+        runs = [import_times(statement) for _ in range(args.repeat)]
+        total = statistics.median(sum(s for s, _ in run.values()) / 1000 for run in runs)
+        own = statistics.median(package_ms(run) for run in runs)
+        print(f"| {name:<24} | {total:>8.1f} | {own:>10.1f} | {len(runs[-1]):>7} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,61 @@
 """Spec & Test Generator - Convert PRDs to requirements and test artifacts."""
 
+from typing import TYPE_CHECKING, Any
+
 __version__ = "1.0.0"
 
-from .coverage import CoverageAnalyzer, CoverageReport
-from .generator import SpecTestGenerator
-from .gherkin import GherkinGenerator
-from .id_manager import IDManager
-from .impact import ImpactAnalyzer, ImpactReport
-from .importers import JiraImporter, LinearImporter
-from .models import (
-    PolicyConfig,
-    Priority,
-    Requirement,
-    TestCase,
-    TestPlan,
-    TestType,
-    TraceabilityEntry,
-)
-from .parser import PRDParser
+# Public names and the modules defining them. They are imported on first
+# access, so importing the package (or running one CLI command) only loads
+# the modules actually used.
+_LAZY_IMPORTS = {
+    "SpecTestGenerator": ".generator",
+    "GenerationStream": ".generator",
+    "Requirement": ".models",
+    "TestCase": ".models",
+    "TestPlan": ".models",
+    "TraceabilityEntry": ".models",
+    "GeneratedRequirement": ".models",
+    "PolicyConfig": ".models",
+    "Priority": ".models",
+    "TestType": ".models",
+    "PRDParser": ".parser",
+    "HeadingTree": ".headings",
+    "ParseCache": ".parse_cache",
+    "IDManager": ".id_manager",
+    "IDStore": ".id_store",
+    "JSONStore": ".id_store",
+    "JournalStore": ".id_store",
+    "SnapshotStore": ".id_store",
+    "SQLiteStore": ".id_store",
+    "GherkinGenerator": ".gherkin",
+    "JiraImporter": ".importers",
+    "LinearImporter": ".importers",
+    "CoverageAnalyzer": ".coverage",
+    "CoverageReport": ".coverage",
+    "ImpactAnalyzer": ".impact",
+    "ImpactReport": ".impact",
+}
 
 __all__ = [
     "SpecTestGenerator",
+    "GenerationStream",
     "Requirement",
     "TestCase",
     "TestPlan",
     "TraceabilityEntry",
+    "GeneratedRequirement",
     "PolicyConfig",
     "Priority",
     "TestType",
     "PRDParser",
+    "HeadingTree",
+    "ParseCache",
     "IDManager",
+    "IDStore",
+    "JSONStore",
+    "JournalStore",
+    "SnapshotStore",
+    "SQLiteStore",
     "GherkinGenerator",
     "JiraImporter",
     "LinearImporter",
@@ -38,3 +64,43 @@ __all__ = [
     "ImpactAnalyzer",
     "ImpactReport",
 ]
+
+if TYPE_CHECKING:
+    from .coverage import CoverageAnalyzer, CoverageReport
+    from .generator import GenerationStream, SpecTestGenerator
+    from .gherkin import GherkinGenerator
+    from .headings import HeadingTree
+    from .id_manager import IDManager
+    from .id_store import IDStore, JournalStore, JSONStore, SnapshotStore, SQLiteStore
+    from .impact import ImpactAnalyzer, ImpactReport
+    from .importers import JiraImporter, LinearImporter
+    from .models import (
+        GeneratedRequirement,
+        PolicyConfig,
+        Priority,
+        Requirement,
+        TestCase,
+        TestPlan,
+        TestType,
+        TraceabilityEntry,
+    )
+    from .parse_cache import ParseCache
+    from .parser import PRDParser
+
+
+def __getattr__(name: str) -> Any:
+    """Import a public name from its module on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes, including names not imported yet."""
+    return sorted(set(globals()) | set(__all__))
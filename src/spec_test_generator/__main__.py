@@ -1,18 +1,350 @@
 """CLI entry point for Spec & Test Generator."""
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
-from . import SpecTestGenerator, __version__
+from . import __version__
 
+# Commands import the modules they use when they run, so that --help,
+# --version and each command load only what they need (see
+# benchmarks/benchmark_startup.py).
 
-def main() -> int:
+
+def _policy_dir() -> Path:
+    """Get the directory of the bundled policy files."""
+    skill_dir = Path(__file__).parent.parent.parent
+    return skill_dir / "skills" / "spec-test-generator" / "policy"
+
+
+def _strict_policy_path() -> Path:
+    """Get path to the strict regulated policy preset."""
+    return _policy_dir() / "preset.strict.yaml"
+
+
+def _default_policy_path() -> Path:
+    """Get path to the bundled default policy file, without importing the generator."""
+    return _policy_dir() / "default.internal.yaml"
+
+
+def gc_main(argv: list[str]) -> int:
+    """Retire ID map entries that recent generations have not used."""
+    parser = argparse.ArgumentParser(
+        prog="spec-test-generator gc",
+        description="Retire ID map entries unseen for several generations and compact the map",
+    )
+    parser.add_argument(
+        "--policy",
+        type=Path,
+        help="Path to policy YAML file (default: pragmatic internal)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("spec"),
+        help="Output directory holding the ID map (default: spec/)",
+    )
+    parser.add_argument(
+        "--keep-generations",
+        type=int,
+        help="Generations an entry may go unseen before it is retired "
+        "(default: ids.keep_generations from the policy, or 10)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="List entries that would be retired without changing the map",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Use strict regulated policy preset",
+    )
+
+    args = parser.parse_args(argv)
+
+    policy_path = args.policy or (_strict_policy_path() if args.strict else _default_policy_path())
+
+    from .generator import create_id_manager, load_policy
+
+    try:
+        policy = load_policy(policy_path)
+        keep_generations = args.keep_generations or policy.get("ids.keep_generations", 10)
+        id_manager = create_id_manager(policy, args.output)
+        try:
+            retired = id_manager.collect_garbage(keep_generations, dry_run=args.dry_run)
+        finally:
+            id_manager.close()
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 3
+
+    verb = "Would retire" if args.dry_run else "Retired"
+    for category, ids in retired.items():
+        print(f"{verb} {len(ids)} {category}: {', '.join(ids) or '-'}")
+    return 0
+
+
+def _expand_prd_args(args: list[str]) -> list[Path]:
+    """Expand batch inputs: files, directories (all *.md below) and glob patterns.
+
+    Patterns are expanded here too (``**`` recursively), for shells that
+    pass them through unexpanded. Duplicates are dropped, keeping order.
+    """
+    import glob
+
+    paths: dict[Path, None] = {}
+    for arg in args:
+        path = Path(arg)
+        if path.is_dir():
+            matches = sorted(path.rglob("*.md"))
+        elif not path.exists() and glob.has_magic(arg):
+            matches = sorted(Path(match) for match in glob.glob(arg, recursive=True))
+        else:
+            matches = [path]
+        for match in matches:
+            paths.setdefault(match, None)
+    return list(paths)
+
+
+def batch_main(argv: list[str]) -> int:
+    """Generate artifacts for many PRDs across worker processes."""
+    parser = argparse.ArgumentParser(
+        prog="spec-test-generator batch",
+        description="Generate artifacts for many PRDs with one policy, in parallel",
+    )
+    parser.add_argument(
+        "prds",
+        nargs="+",
+        help="PRD files, directories (all *.md below) or glob patterns such as 'prds/**/*.md'",
+    )
+    parser.add_argument(
+        "--policy",
+        type=Path,
+        help="Path to policy YAML file (default: pragmatic internal)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("spec"),
+        help="Root for per-PRD output directories, which mirror the PRD paths (default: spec/)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="Worker processes (default: CPU count; 1 runs in-process)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the batch report as JSON",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Use strict regulated policy preset",
+    )
+
+    args = parser.parse_args(argv)
+
+    policy_path = args.policy or (_strict_policy_path() if args.strict else _default_policy_path())
+
+    import json
+
+    from .batch import run_batch
+    from .generator import load_policy
+
+    try:
+        prd_paths = _expand_prd_args(args.prds)
+        if not prd_paths:
+            raise FileNotFoundError(f"No PRD files match: {' '.join(args.prds)}")
+        policy = load_policy(policy_path)
+        report = run_batch(prd_paths, policy, args.output, jobs=args.jobs)
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 3
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2))
+    else:
+        for item in report.items:
+            if item.ok:
+                print(
+                    f"ok      {item.prd_path} -> {item.output_dir} "
+                    f"({item.requirements} requirements, {item.test_cases} tests, "
+                    f"{item.written} written, {item.skipped} unchanged, {item.seconds:.2f}s)"
+                )
+            else:
+                print(f"FAILED  {item.prd_path}: {item.error}")
+        print()
+        print(
+            f"{len(report.items) - len(report.failed)}/{len(report.items)} PRDs generated "
+            f"in {report.seconds:.2f}s with {report.jobs} worker(s) "
+            f"({report.generation_seconds:.2f}s of generation)"
+        )
+
+    return 3 if report.failed else 0
+
+
+def serve_main(argv: list[str]) -> int:
+    """Serve generation requests with warm policies, ID maps and parse caches."""
+    parser = argparse.ArgumentParser(
+        prog="spec-test-generator serve",
+        description="Serve JSON-RPC generation requests over stdin/stdout or a Unix socket",
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Listen on this Unix socket instead of stdin/stdout",
+    )
+    parser.add_argument(
+        "--policy",
+        type=Path,
+        help="Default policy for requests (default: pragmatic internal)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("spec"),
+        help="Default output directory for requests (default: spec/)",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Use strict regulated policy preset as the default policy",
+    )
+
+    args = parser.parse_args(argv)
+
+    policy_path = args.policy or (_strict_policy_path() if args.strict else _default_policy_path())
+
+    from .server import GenerationServer
+
+    server = GenerationServer(policy_path, args.output)
+    try:
+        if args.socket is not None:
+            print(f"Listening on {args.socket}", file=sys.stderr)
+            server.serve_unix(args.socket)
+        else:
+            server.serve_stdio()
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 3
+    finally:
+        server.close()
+    return 0
+
+
+def watch_main(argv: list[str]) -> int:
+    """Regenerate PRDs under a directory as they change."""
+    parser = argparse.ArgumentParser(
+        prog="spec-test-generator watch",
+        description="Watch a directory and regenerate PRDs when they or the policy change",
+    )
+    parser.add_argument(
+        "directory",
+        type=Path,
+        help="Directory to watch for PRD markdown files",
+    )
+    parser.add_argument(
+        "--policy",
+        type=Path,
+        help="Path to policy YAML file (default: pragmatic internal)",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        default=Path("spec"),
+        help="Root for per-PRD output directories, which mirror the PRD paths (default: spec/)",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0.5,
+        help="Seconds between polls (default: 0.5)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        help="Seconds a changed file must be stable before rebuilding (default: 0.3)",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Use strict regulated policy preset",
+    )
+
+    args = parser.parse_args(argv)
+
+    if not args.directory.is_dir():
+        print(f"Error: Directory not found: {args.directory}", file=sys.stderr)
+        return 2
+    policy_path = args.policy or (_strict_policy_path() if args.strict else _default_policy_path())
+
+    from .batch import BatchItem
+    from .watch import Watcher
+
+    def report(items: list[BatchItem]) -> None:
+        for item in items:
+            if item.ok:
+                print(
+                    f"ok      {item.prd_path} -> {item.output_dir} "
+                    f"({item.requirements} requirements, {item.written} written, "
+                    f"{item.skipped} unchanged, {item.seconds * 1000:.1f} ms)"
+                )
+            else:
+                print(f"FAILED  {item.prd_path}: {item.error}")
+        sys.stdout.flush()
+
+    watcher = Watcher(args.directory, policy_path, args.output, debounce=args.debounce)
+    print(f"Watching {args.directory} (Ctrl-C to stop)", file=sys.stderr)
+    try:
+        watcher.run(interval=args.interval, on_rebuild=report)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+# Subcommands; any other first argument is treated as a PRD path
+COMMANDS = {
+    "batch": batch_main,
+    "gc": gc_main,
+    "serve": serve_main,
+    "watch": watch_main,
+}
+
+
+def main(argv: list[str] | None = None) -> int:
     """Main CLI entry point."""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
     parser = argparse.ArgumentParser(
         prog="spec-test-generator",
         description="Generate requirements and test artifacts from PRDs",
+        epilog="Other commands: batch (generate many PRDs in parallel), "
+        "gc (retire unused ID map entries), "
+        "serve (JSON-RPC server with warm caches), "
+        "watch (regenerate PRDs as they change). "
+        "Run 'spec-test-generator <command> --help' for details.",
     )
     parser.add_argument(
         "--version",
@@ -47,13 +379,16 @@ def main() -> int:
         help="Use strict regulated policy preset",
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Determine policy path
     policy_path = args.policy
     if args.strict and not args.policy:
-        skill_dir = Path(__file__).parent.parent.parent
-        policy_path = skill_dir / "skills" / "spec-test-generator" / "policy" / "preset.strict.yaml"
+        policy_path = _strict_policy_path()
+
+    import json
+
+    from .generator import SpecTestGenerator, result_to_dict
 
     try:
         generator = SpecTestGenerator(
@@ -62,34 +397,11 @@ def main() -> int:
             output_dir=args.output,
         )
 
-        result = generator.generate()
-
         if args.json:
-            # Convert to serializable format
-            output = {
-                "requirements": [r.to_dict() for r in result["requirements"]],
-                "test_plan": {
-                    "strategy": result["test_plan"].strategy,
-                    "test_data": result["test_plan"].test_data,
-                    "environments": result["test_plan"].environments,
-                    "non_functional": result["test_plan"].non_functional,
-                },
-                "test_cases": [t.to_dict() for t in result["test_cases"]],
-                "traceability": [
-                    {
-                        "req_id": e.req_id,
-                        "test_id": e.test_id,
-                        "type": e.test_type.value,
-                        "priority": e.priority.value,
-                    }
-                    for e in result["traceability"]
-                ],
-                "open_questions": result.get("open_questions", []),
-                "assumptions": result.get("assumptions", []),
-            }
-            print(json.dumps(output, indent=2))
+            print(json.dumps(result_to_dict(generator.generate()), indent=2))
         else:
-            artifacts = generator.write_artifacts(result)
+            stream = generator.generate_stream()
+            artifacts = generator.write_artifacts(stream)
 
             print(f"\n{'=' * 60}")
             print("Spec & Test Generation Complete")
@@ -98,16 +410,22 @@ def main() -> int:
             print()
 
             print("Summary:")
-            print(f"  Requirements: {len(result['requirements'])}")
-            print(f"  Test Cases:   {len(result['test_cases'])}")
-            print(f"  Traceability: {len(result['traceability'])} mappings")
+            print(f"  Requirements: {stream.requirements}")
+            print(f"  Test Cases:   {stream.test_cases}")
+            print(f"  Traceability: {stream.traceability} mappings")
+            if stream.cache is not None:
+                print(f"  Cached:       {stream.cache.hits} requirements reused")
             print()
 
-            if result.get("open_questions"):
-                print(f"Open Questions: {len(result['open_questions'])}")
+            if stream.result["open_questions"]:
+                print(f"Open Questions: {len(stream.result['open_questions'])}")
                 print()
 
-            print("Generated Artifacts:")
+            report = generator.write_report
+            print(
+                f"Generated Artifacts ({len(report.written)} written, "
+                f"{len(report.skipped)} unchanged):"
+            )
             for name, path in artifacts.items():
                 print(f"  {name}: {path}")
             print()
@@ -0,0 +1,66 @@
+"""Atomic file replacement."""
+
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+
+_umask_lock = threading.Lock()
+_umask: int | None = None
+
+
+def _current_umask() -> int:
+    """Get the process umask, read once and remembered.
+
+    Reading the umask means setting it, so it is read a single time, under a
+    lock, rather than on every write.
+    """
+    global _umask
+    with _umask_lock:
+        if _umask is None:
+            _umask = os.umask(0o022)
+            os.umask(_umask)
+        return _umask
+
+
+def replacement_mode(path: Path) -> int:
+    """Get the permissions a file replacing ``path`` should have.
+
+    Args:
+        path: File about to be replaced or created
+
+    Returns:
+        The existing file's mode, or what ``open()`` would give a new file
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_current_umask()
+
+
+def atomic_write(path: Path, data: str | bytes, fsync: bool = False) -> None:
+    """Write a file via a temporary file renamed over it.
+
+    Readers never observe a partial write. The temporary file is given the
+    target's permissions before the rename, since ``mkstemp`` creates it
+    owner-only.
+
+    Args:
+        path: File to write; its directory is created if needed
+        data: Full content, text (UTF-8) or bytes
+        fsync: Flush the content to disk before the rename
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data.encode() if isinstance(data, str) else data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.chmod(tmp_name, replacement_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
@@ -0,0 +1,189 @@
+"""Batch generation of many PRDs across worker processes."""
+
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .generator import SpecTestGenerator
+from .models import PolicyConfig
+
+
+@dataclass
+class BatchItem:
+    """Outcome of generating one PRD in a batch."""
+
+    prd_path: Path
+    output_dir: Path
+    seconds: float = 0.0
+    requirements: int = 0
+    test_cases: int = 0
+    # Artifacts written, and skipped because their content was unchanged
+    written: int = 0
+    skipped: int = 0
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the PRD was generated."""
+        return self.error is None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "prd": str(self.prd_path),
+            "output": str(self.output_dir),
+            "seconds": round(self.seconds, 4),
+            "requirements": self.requirements,
+            "test_cases": self.test_cases,
+            "written": self.written,
+            "skipped": self.skipped,
+            "error": self.error,
+        }
+
+
+@dataclass
+class BatchReport:
+    """Results of a batch run, in input order."""
+
+    items: list[BatchItem] = field(default_factory=list)
+    seconds: float = 0.0
+    jobs: int = 1
+
+    @property
+    def failed(self) -> list[BatchItem]:
+        """Items whose generation failed."""
+        return [item for item in self.items if not item.ok]
+
+    @property
+    def generation_seconds(self) -> float:
+        """Time spent generating, summed over all PRDs."""
+        return sum(item.seconds for item in self.items)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "total": len(self.items),
+            "failed": len(self.failed),
+            "jobs": self.jobs,
+            "seconds": round(self.seconds, 4),
+            "generation_seconds": round(self.generation_seconds, 4),
+            "items": [item.to_dict() for item in self.items],
+        }
+
+
+def batch_output_dirs(
+    prd_paths: list[Path], output_root: Path, base: Path | None = None
+) -> dict[Path, Path]:
+    """Choose an output directory for each PRD of a batch.
+
+    Each PRD gets ``output_root`` joined with its path relative to ``base``,
+    without the suffix: ``prds/a/x.md`` and ``prds/b/y.md`` go to
+    ``<root>/a/x`` and ``<root>/b/y``.
+
+    Args:
+        prd_paths: PRD files
+        output_root: Directory to create the output directories under
+        base: Directory the PRD paths are taken relative to (default: the
+            PRDs' common directory)
+
+    Returns:
+        Output directory per PRD path
+    """
+    if not prd_paths:
+        return {}
+    resolved = [path.resolve() for path in prd_paths]
+    if base is None:
+        common = Path(os.path.commonpath([path.parent for path in resolved]))
+    else:
+        common = base.resolve()
+    return {
+        path: output_root / full.relative_to(common).with_suffix("")
+        for path, full in zip(prd_paths, resolved, strict=True)
+    }
+
+
+def _generate_group(policy: PolicyConfig, jobs: list[tuple[Path, Path]]) -> list[BatchItem]:
+    """Generate PRDs that share an output directory, one after another.
+
+    Failures are recorded on their item so the rest of the group still runs.
+    """
+    items = []
+    for prd_path, output_dir in jobs:
+        item = BatchItem(prd_path, output_dir)
+        start = time.perf_counter()
+        generator = SpecTestGenerator(prd_path, output_dir=output_dir, policy=policy)
+        try:
+            stream = generator.generate_stream()
+            generator.write_artifacts(stream)
+            item.requirements = stream.requirements
+            item.test_cases = stream.test_cases
+            item.written = len(generator.write_report.written)
+            item.skipped = len(generator.write_report.skipped)
+        except Exception as e:
+            item.error = f"{type(e).__name__}: {e}"
+        finally:
+            generator.close()
+        item.seconds = time.perf_counter() - start
+        items.append(item)
+    return items
+
+
+def run_batch(
+    prd_paths: list[Path],
+    policy: PolicyConfig,
+    output_root: Path,
+    jobs: int | None = None,
+) -> BatchReport:
+    """Generate artifacts for many PRDs with one loaded policy.
+
+    PRDs are spread over a process pool. PRDs with the same output directory
+    are generated in order by a single worker, so they never contend for its
+    ID map; the ID map's file lock still guards against other processes.
+    A PRD that fails is reported in its item without stopping the batch.
+
+    Args:
+        prd_paths: PRD files
+        policy: Policy applied to every PRD
+        output_root: Directory for the per-PRD output directories
+        jobs: Worker processes (default: CPU count). With 1, PRDs are
+            generated in this process.
+
+    Returns:
+        Report with one item per PRD, in input order
+    """
+    groups: dict[Path, list[tuple[Path, Path]]] = {}
+    for prd_path, output_dir in batch_output_dirs(prd_paths, output_root).items():
+        groups.setdefault(output_dir, []).append((prd_path, output_dir))
+
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(groups)))
+    start = time.perf_counter()
+
+    by_prd: dict[Path, BatchItem] = {}
+    if jobs == 1:
+        for group in groups.values():
+            for item in _generate_group(policy, group):
+                by_prd[item.prd_path] = item
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures: list[tuple[list[tuple[Path, Path]], Future[list[BatchItem]]]] = [
+                (group, pool.submit(_generate_group, policy, group)) for group in groups.values()
+            ]
+            for group, future in futures:
+                try:
+                    for item in future.result():
+                        by_prd[item.prd_path] = item
+                except Exception as e:
+                    # The worker died (e.g. killed); fail its PRDs, keep the rest
+                    for prd_path, output_dir in group:
+                        by_prd[prd_path] = BatchItem(
+                            prd_path, output_dir, error=f"{type(e).__name__}: {e}"
+                        )
+
+    return BatchReport(
+        items=[by_prd[path] for path in prd_paths],
+        seconds=time.perf_counter() - start,
+        jobs=jobs,
+    )
@@ -0,0 +1,62 @@
+"""Content fingerprints used as stable ID map keys."""
+
+import hashlib
+from functools import lru_cache
+
+# v1: MD5 of the normalized text, truncated to 12 hex chars (original scheme)
+# v2: 6-byte BLAKE2b digest of the same normalized text (also 12 hex chars)
+LEGACY_SCHEME = "v1"
+SCHEMES = ("v1", "v2")
+
+# Statements keep their ID across edits beyond this many normalized characters
+STATEMENT_PREFIX_LENGTH = 50
+
+
+def _digest(text: str, scheme: str) -> str:
+    """Hash normalized text with the given scheme."""
+    data = text.encode()
+    if scheme == "v1":
+        return hashlib.md5(data).hexdigest()[:12]
+    if scheme == "v2":
+        return hashlib.blake2b(data, digest_size=6).hexdigest()
+    raise ValueError(f"Unknown fingerprint scheme: {scheme}")
+
+
+@lru_cache(maxsize=16384)
+def fingerprint_statement(statement: str, scheme: str = LEGACY_SCHEME) -> str:
+    """Create a fingerprint for a requirement statement.
+
+    Uses the first significant characters so minor edits keep the same ID.
+
+    Args:
+        statement: Raw requirement statement
+        scheme: Fingerprint scheme version
+
+    Returns:
+        12 hex character fingerprint
+    """
+    # Normalize: lowercase, remove extra whitespace
+    normalized = " ".join(statement.lower().split())
+
+    # Strip trailing punctuation before fingerprinting
+    normalized = normalized.rstrip(".,!?;:")
+
+    return _digest(normalized[:STATEMENT_PREFIX_LENGTH], scheme)
+
+
+@lru_cache(maxsize=16384)
+def fingerprint_test_case(title: str, req_ids: tuple[str, ...], scheme: str = LEGACY_SCHEME) -> str:
+    """Create a fingerprint for a test case.
+
+    Args:
+        title: Test case title
+        req_ids: IDs of the requirements the test covers
+        scheme: Fingerprint scheme version
+
+    Returns:
+        12 hex character fingerprint
+    """
+    # Combine title and requirements for uniqueness
+    combined = f"{title.lower()}:{','.join(sorted(req_ids))}"
+
+    return _digest(combined, scheme)
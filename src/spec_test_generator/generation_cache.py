@@ -0,0 +1,131 @@
+"""Per-requirement cache of generated requirements and test cases."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+from .atomic import atomic_write
+from .models import GeneratedRequirement, PolicyConfig, Requirement, TestCase
+
+# Sidecar cache of generated requirements, written to the output directory
+GENERATION_CACHE_FILE = ".gencache.json"
+
+# Bump when requirement or test case generation changes, to invalidate existing caches
+GENERATION_CACHE_VERSION = 1
+
+
+def policy_digest(policy: PolicyConfig) -> str:
+    """Get a digest of a policy's settings.
+
+    Args:
+        policy: Policy configuration
+
+    Returns:
+        Hex digest that changes whenever any policy setting changes
+    """
+    data = json.dumps(policy.config, sort_keys=True, default=str)
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+class GenerationCache:
+    """Generated requirements and test cases of one PRD, by statement digest.
+
+    Entries hold a requirement, its test cases and their rendered markdown.
+    The whole cache is dropped when the policy, the package version or
+    ``GENERATION_CACHE_VERSION`` changes. On ``save``, entries that were not
+    used by the current generation are removed; entries for other PRDs
+    sharing the output directory are kept.
+    """
+
+    def __init__(self, output_dir: Path, prd_path: Path, policy: PolicyConfig):
+        """Initialize cache and load the PRD's entries.
+
+        Args:
+            output_dir: Directory holding the .gencache.json sidecar
+            prd_path: PRD the entries belong to
+            policy: Policy the requirements are generated with
+        """
+        self.path = output_dir / GENERATION_CACHE_FILE
+        self.policy_digest = policy_digest(policy)
+        self.hits = 0
+        self.misses = 0
+
+        self._document = str(prd_path.resolve())
+        self._entries: dict[str, dict[str, Any]] = dict(
+            self._read_cache_file().get("documents", {}).get(self._document, {})
+        )
+        self._used: dict[str, dict[str, Any]] = {}
+
+    @staticmethod
+    def key(*parts: str) -> str:
+        """Get the cache key of a statement and what its output depends on."""
+        return hashlib.blake2b("\0".join(parts).encode(), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> GeneratedRequirement | None:
+        """Get a cached requirement with its test cases and rendered blocks.
+
+        The traceability entries are left empty for the caller to derive.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return GeneratedRequirement(
+            requirement=Requirement.from_dict(entry["requirement"]),
+            test_cases=[TestCase.from_dict(test) for test in entry["test_cases"]],
+            traceability=[],
+            markdown=entry["markdown"],
+            test_markdown=entry["test_markdown"],
+        )
+
+    def hit(self, key: str) -> None:
+        """Record that a cached entry was reused, keeping it on ``save``."""
+        self.hits += 1
+        self._used[key] = self._entries[key]
+
+    def put(self, key: str, item: GeneratedRequirement) -> None:
+        """Cache a freshly generated requirement, rendering it if needed."""
+        self.misses += 1
+        item.render()
+        self._used[key] = {
+            "requirement": item.requirement.to_dict(),
+            "test_cases": [test.to_dict() for test in item.test_cases],
+            "markdown": item.markdown,
+            "test_markdown": item.test_markdown,
+        }
+
+    def save(self) -> None:
+        """Store the entries used by this generation, if they changed."""
+        if self._used == self._entries:
+            return
+
+        data = self._read_cache_file()
+        documents = data.get("documents", {})
+        documents[self._document] = self._used
+
+        # dumps() uses the C encoder; dump() would encode in Python
+        data = {
+            "version": GENERATION_CACHE_VERSION,
+            "generator": __version__,
+            "policy": self.policy_digest,
+            "documents": documents,
+        }
+        atomic_write(self.path, json.dumps(data))
+        self._entries = self._used
+
+    def _read_cache_file(self) -> dict[str, Any]:
+        """Read the sidecar cache, treating a missing, corrupt or outdated one as empty."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if (
+            not isinstance(data, dict)
+            or data.get("version") != GENERATION_CACHE_VERSION
+            or data.get("generator") != __version__
+            or data.get("policy") != self.policy_digest
+        ):
+            return {}
+        return data
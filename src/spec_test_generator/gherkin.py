@@ -1,32 +1,75 @@
 """Gherkin/BDD output generator."""
 
+import functools
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
 from .models import Requirement, TestCase
+from .output import ArtifactManifest, WriteReport, run_writes, write_if_changed
 
 
 class GherkinGenerator:
-    """Generates Gherkin .feature files from requirements and test cases."""
+    """Generates Gherkin .feature files from requirements and test cases.
 
-    def __init__(self, result: dict[str, Any], output_dir: Path):
+    Feature files whose content is unchanged are not rewritten; ``report``
+    records which ones were written and which were skipped.
+    """
+
+    def __init__(
+        self,
+        result: dict[str, Any],
+        output_dir: Path,
+        manifest: ArtifactManifest | None = None,
+    ):
         """Initialize Gherkin generator.
 
         Args:
             result: Generation result with requirements and test_cases
             output_dir: Directory for output files
+            manifest: Artifact manifest of ``output_dir`` to share (default:
+                loaded from ``output_dir``)
         """
         self.result = result
         self.output_dir = output_dir
+        self.manifest = manifest if manifest is not None else ArtifactManifest(output_dir)
+        self.report = WriteReport()
 
-    def generate(self) -> dict[str, Path]:
+    def generate(self, workers: int = 1) -> dict[str, Path]:
         """Generate all Gherkin feature files.
 
+        Args:
+            workers: Threads to render and write the feature files on
+
         Returns:
             Dict mapping feature names to file paths
+
+        Raises:
+            ArtifactWriteError: If any feature file could not be written; the
+                others are still written
         """
+        try:
+            written = run_writes(self.write_tasks(), workers)
+        finally:
+            self.manifest.save()
+
         artifacts: dict[str, Path] = {}
+        for name, was_written in written.items():
+            path = self.output_dir / name
+            self.report.add(path, was_written)
+            artifacts[path.name] = path
+        return artifacts
+
+    def write_tasks(self) -> dict[str, Callable[[], bool]]:
+        """Get a task per feature file that renders and writes it.
+
+        Tasks neither touch ``report`` nor save the manifest, so they can run
+        concurrently with other artifact writes (see ``run_writes``).
 
+        Returns:
+            Dict mapping paths relative to ``output_dir`` to tasks that
+            return whether the file was written
+        """
         # Group requirements by feature area
         by_area: dict[str, list[Requirement]] = {}
         for req in self.result.get("requirements", []):
@@ -39,16 +82,31 @@ class GherkinGenerator:
             for req_id in test.requirement_ids:
                 test_lookup.setdefault(req_id, []).append(test)
 
-        # Generate feature file per area
+        # One feature file per area; areas that sanitize to the same
+        # filename are written by the last one, as before
+        tasks: dict[str, Callable[[], bool]] = {}
         for area, requirements in by_area.items():
-            feature_content = self._generate_feature(area, requirements, test_lookup)
             filename = self._sanitize_filename(area) + ".feature"
-            path = self.output_dir / "features" / filename
-            path.parent.mkdir(parents=True, exist_ok=True)
-            path.write_text(feature_content)
-            artifacts[filename] = path
-
-        return artifacts
+            tasks[f"features/{filename}"] = functools.partial(
+                self._write_feature,
+                self.output_dir / "features" / filename,
+                area,
+                requirements,
+                test_lookup,
+            )
+        return tasks
+
+    def _write_feature(
+        self,
+        path: Path,
+        area: str,
+        requirements: list[Requirement],
+        test_lookup: dict[str, list[TestCase]],
+    ) -> bool:
+        """Render and write a single feature file, returning whether it was written."""
+        feature_content = self._generate_feature(area, requirements, test_lookup)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return write_if_changed(path, feature_content, self.manifest)
 
     def _generate_feature(
         self,
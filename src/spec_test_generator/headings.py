@@ -0,0 +1,141 @@
+"""Markdown heading tree for PRD documents."""
+
+import mmap
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+
+# H1-H4 heading line; whitespace excludes \n so matches never span lines
+_HEADING_RE = re.compile(r"^(#{1,4})[^\S\n]+(.+)$", re.MULTILINE)
+_HEADING_BYTES_RE = re.compile(rb"^(#{1,4})[ \t\r\f\v]+(.+)$", re.MULTILINE)
+
+MAX_LEVEL = 4
+
+
+@dataclass(eq=False)
+class Heading:
+    """A heading and the span of the document it covers.
+
+    Offsets index the text the tree was built from: characters for ``str``,
+    bytes for bytes-like buffers such as a memory mapping. ``content_start``
+    to ``end`` covers everything under the heading, including its
+    subsections, without the heading line or the newline before the next
+    heading of the same or a higher level.
+    """
+
+    level: int
+    title: str
+    start: int
+    content_start: int
+    end: int
+    children: list["Heading"] = field(default_factory=list)
+    parent: "Heading | None" = field(default=None, repr=False)
+
+    @property
+    def path(self) -> list[str]:
+        """Titles from the top-level heading down to this one."""
+        titles = []
+        node: Heading | None = self
+        while node is not None and node.level > 0:
+            titles.append(node.title)
+            node = node.parent
+        return titles[::-1]
+
+    def walk(self) -> Iterator["Heading"]:
+        """Yield this heading's descendants in document order."""
+        for child in self.children:
+            yield child
+            yield from child.walk()
+
+
+def normalize_heading(title: str) -> str:
+    """Normalize a heading for lookup: lowercase, single spaces, no trailing colon.
+
+    Args:
+        title: Heading text
+
+    Returns:
+        Normalized heading name
+    """
+    return " ".join(title.lower().split()).rstrip(":").rstrip()
+
+
+class HeadingTree:
+    """H1-H4 headings of a document with an index by normalized name.
+
+    Repeated headings are all kept, in document order, under the same index
+    entry.
+    """
+
+    def __init__(self, root: Heading):
+        """Initialize tree.
+
+        Args:
+            root: Level 0 node spanning the whole document
+        """
+        self.root = root
+        self.index: dict[str, list[Heading]] = {}
+        for node in root.walk():
+            self.index.setdefault(normalize_heading(node.title), []).append(node)
+
+    def find(self, title: str) -> list[Heading]:
+        """Get the headings with a title, in document order.
+
+        Args:
+            title: Heading text, matched after normalization
+
+        Returns:
+            Matching headings (empty if none)
+        """
+        return self.index.get(normalize_heading(title), [])
+
+    def walk(self) -> Iterator[Heading]:
+        """Yield every heading in document order."""
+        return self.root.walk()
+
+    def level(self, level: int) -> list[Heading]:
+        """Get all headings of one level, in document order."""
+        return [node for node in self.walk() if node.level == level]
+
+
+def build_heading_tree(text: str | bytes | mmap.mmap) -> HeadingTree:
+    """Build the heading tree of a markdown document.
+
+    Args:
+        text: Document as ``str``, ``bytes`` or a memory mapping
+
+    Returns:
+        Heading tree with offsets into ``text``
+    """
+    matches: Iterator[re.Match[str]] | Iterator[re.Match[bytes]]
+    if isinstance(text, str):
+        matches = _HEADING_RE.finditer(text)
+        length = len(text)
+    else:
+        matches = _HEADING_BYTES_RE.finditer(text)
+        length = len(text)
+
+    root = Heading(level=0, title="", start=0, content_start=0, end=length)
+    stack = [root]
+
+    for match in matches:
+        level = len(match.group(1))
+        while stack[-1].level >= level:
+            node = stack.pop()
+            node.end = max(node.content_start, match.start() - 1)
+
+        title = match.group(2)
+        line_end = match.end()
+        node = Heading(
+            level=level,
+            title=(title if isinstance(title, str) else title.decode()).strip(),
+            start=match.start(),
+            # A heading on the last line without a newline has no content
+            content_start=line_end + 1 if line_end < length else length,
+            end=length,
+            parent=stack[-1],
+        )
+        stack[-1].children.append(node)
+        stack.append(node)
+
+    return HeadingTree(root)
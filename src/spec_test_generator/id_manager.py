@@ -1,8 +1,11 @@
 """Stable ID management for requirements and tests."""
 
-import json
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Any, cast
+
+from .fingerprint import LEGACY_SCHEME, SCHEMES, fingerprint_statement, fingerprint_test_case
+from .id_store import CATEGORIES, IDStore, JSONStore
 
 
 class IDManager:
@@ -14,6 +17,10 @@ class IDManager:
         req_prefix: str = "REQ",
         test_prefix: str = "TEST",
         pad: int = 4,
+        store: IDStore | None = None,
+        fingerprint_scheme: str | None = None,
+        read_only: bool = False,
+        track_generations: bool = False,
     ):
         """Initialize ID manager.
 
@@ -22,58 +29,300 @@ class IDManager:
             req_prefix: Prefix for requirement IDs
             test_prefix: Prefix for test IDs
             pad: Zero-padding width for ID numbers
+            store: Storage backend (default: JSONStore in output_dir)
+            fingerprint_scheme: Fingerprint scheme for new keys (default: the
+                scheme the map was written with, or v1 for a new map). Switching
+                an existing map to another scheme migrates keys as they are
+                looked up; see ``migrate_fingerprints``.
+            read_only: Never write to disk. Unknown fingerprints get
+                provisional IDs, numbered after the highest stored ID, that
+                are stable for the lifetime of this manager only.
+            track_generations: Remember which fingerprints are resolved so
+                ``record_generation`` can mark them seen, for use by
+                ``collect_garbage``.
         """
         self.output_dir = output_dir
         self.req_prefix = req_prefix
         self.test_prefix = test_prefix
         self.pad = pad
+        self.store = store if store is not None else JSONStore(output_dir)
+        self.read_only = read_only
+        self.track_generations = track_generations
 
-        self._idmap_path = output_dir / ".idmap.json"
-        self._idmap: dict[str, Any] = self._load_idmap()
-
-        self._next_req_num = self._get_next_number("requirements")
-        self._next_test_num = self._get_next_number("tests")
-
-    def _load_idmap(self) -> dict[str, Any]:
-        """Load existing ID map if present."""
-        if self._idmap_path.exists():
-            try:
-                with open(self._idmap_path) as f:
-                    return cast(dict[str, Any], json.load(f))
-            except (OSError, json.JSONDecodeError):
-                pass
-        return {
-            "requirements": {},
-            "tests": {},
-            "metadata": {
+        self.store.open(
+            {
                 "version": "1.0",
                 "req_prefix": self.req_prefix,
                 "test_prefix": self.test_prefix,
             },
-        }
-
-    def _save_idmap(self) -> None:
-        """Save ID map to disk."""
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        with open(self._idmap_path, "w") as f:
-            json.dump(self._idmap, f, indent=2)
-
-    def _get_next_number(self, category: str) -> int:
-        """Get next available number for a category."""
-        existing = self._idmap.get(category, {})
-        if not existing:
-            return 1
-
-        # Extract numbers from existing IDs
-        numbers = []
-        for id_str in existing.values():
+            read_only=read_only,
+        )
+        self._session_depth = 0
+        # Set inside a lazy session until its first allocation takes the lock
+        self._lazy_session: ExitStack | None = None
+
+        # Fingerprints resolved since the last recorded generation, per category
+        self._seen: dict[str, set[str]] = {}
+
+        # Read-only mode: (category, fingerprint) -> provisional ID, per category counters
+        self._provisional: dict[tuple[str, str], str] = {}
+        self._provisional_next: dict[str, int] = {}
+
+        stored_scheme = self.store.get_metadata("fingerprint", LEGACY_SCHEME)
+        self.fingerprint_scheme = fingerprint_scheme or stored_scheme
+        if self.fingerprint_scheme not in SCHEMES:
+            raise ValueError(f"Unknown fingerprint scheme: {self.fingerprint_scheme}")
+        self._legacy_scheme: str | None = self.store.get_metadata("legacy_fingerprint")
+        if self.fingerprint_scheme != stored_scheme:
+            self._switch_scheme(stored_scheme)
+
+        # New-scheme key -> legacy-scheme key, for keys computed while migrating
+        self._legacy_keys: dict[str, str] = {}
+
+    def _switch_scheme(self, stored_scheme: str) -> None:
+        """Record a fingerprint scheme change in the map's metadata."""
+        is_empty = not (self.store.ids("requirements") or self.store.ids("tests"))
+        if self.read_only:
+            self._legacy_scheme = None if is_empty else stored_scheme
+            return
+        with self.store.transaction():
+            self.store.set_metadata("fingerprint", self.fingerprint_scheme)
+            if not is_empty:
+                # Keys written under the old scheme keep resolving until rewritten
+                self._legacy_scheme = stored_scheme
+            self.store.set_metadata("legacy_fingerprint", self._legacy_scheme)
+
+    @contextmanager
+    def session(self, lazy: bool = False) -> Iterator["IDManager"]:
+        """Collect new allocations in memory and persist them once on exit.
+
+        The outermost session holds the store's exclusive write lock and picks
+        up allocations written by other processes before handing out new IDs,
+        so concurrent workers sharing an output directory never collide.
+
+        Sessions may be nested; only the outermost one flushes. If the block
+        raises, allocations made inside the session are rolled back so the
+        in-memory map stays consistent with what is on disk.
+
+        In read-only mode a session is a no-op scope.
+
+        Args:
+            lazy: Take the write lock only at the first allocation, holding it
+                until the session ends. Lookups of known fingerprints before
+                then are served as outside a session, so a run that allocates
+                nothing never locks, loads or writes the full map (a
+                SnapshotStore stays memory-mapped).
+
+        Yields:
+            This ID manager
+        """
+        if lazy and self._session_depth == 0 and self._lazy_session is None:
+            if self.read_only:
+                yield self
+                return
+            with ExitStack() as stack:
+                self._lazy_session = stack
+                try:
+                    yield self
+                finally:
+                    self._lazy_session = None
+            return
+
+        if self._session_depth > 0 or self.read_only:
+            self._session_depth += 1
             try:
-                num = int(id_str.split("-")[1])
-                numbers.append(num)
-            except (IndexError, ValueError):
-                pass
+                yield self
+            finally:
+                self._session_depth -= 1
+            return
+
+        with self.store.transaction():
+            self._session_depth = 1
+            try:
+                yield self
+            finally:
+                self._session_depth = 0
+
+    def flush(self) -> None:
+        """Persist pending allocations, if any, to disk."""
+        self.store.commit()
+
+    @property
+    def has_pending(self) -> bool:
+        """Whether there are allocations not yet written to disk."""
+        return self.store.has_pending
+
+    def close(self) -> None:
+        """Release resources held by the storage backend."""
+        self.store.close()
+
+    def statement_key(self, statement: str) -> str:
+        """Fingerprint a requirement statement with the map's scheme.
+
+        Args:
+            statement: Requirement statement
 
-        return max(numbers, default=0) + 1
+        Returns:
+            Key for ``get_requirement_id``
+        """
+        key = fingerprint_statement(statement, self.fingerprint_scheme)
+        if self._legacy_scheme is not None:
+            self._legacy_keys[key] = fingerprint_statement(statement, self._legacy_scheme)
+        return key
+
+    def test_key(self, title: str, req_ids: list[str]) -> str:
+        """Fingerprint a test case with the map's scheme.
+
+        Args:
+            title: Test case title
+            req_ids: IDs of the requirements the test covers
+
+        Returns:
+            Key for ``get_test_id``
+        """
+        key = fingerprint_test_case(title, tuple(req_ids), self.fingerprint_scheme)
+        if self._legacy_scheme is not None:
+            self._legacy_keys[key] = fingerprint_test_case(
+                title, tuple(req_ids), self._legacy_scheme
+            )
+        return key
+
+    def migrate_fingerprints(
+        self,
+        statements: list[str],
+        tests: list[tuple[str, list[str]]] | None = None,
+    ) -> int:
+        """Rewrite legacy-scheme keys to the current scheme in one pass.
+
+        Args:
+            statements: Requirement statements whose keys should be rewritten
+            tests: (title, requirement IDs) of test cases whose keys should be
+                rewritten
+
+        Returns:
+            Number of keys rewritten
+        """
+        if self._legacy_scheme is None:
+            return 0
+
+        if self.read_only:
+            raise RuntimeError("Cannot migrate fingerprints in read-only mode")
+
+        rewritten = 0
+        with self.session():
+            for statement in statements:
+                rewritten += self._rekey_legacy("requirements", self.statement_key(statement))
+            for title, req_ids in tests or []:
+                rewritten += self._rekey_legacy("tests", self.test_key(title, req_ids))
+        return rewritten
+
+    def _rekey_legacy(self, category: str, key: str) -> bool:
+        """Move an entry stored under its legacy key to its current key."""
+        legacy_key = self._legacy_keys.get(key)
+        if legacy_key is None or legacy_key == key:
+            return False
+        existing = self.store.lookup(category, legacy_key)
+        if existing is None or self.store.lookup(category, key) is not None:
+            return False
+        self.store.remove(category, legacy_key)
+        self.store.add(category, key, existing)
+        return True
+
+    def record_generation(self, document: str | None = None) -> int:
+        """Mark every fingerprint resolved since the last call as seen now.
+
+        Each call starts a new generation of the ID map. Call it once per
+        complete run (e.g. at the end of ``SpecTestGenerator.generate``) so
+        that entries the run did not resolve age by one generation.
+
+        Args:
+            document: Source document the run generated from. Generations
+                are then counted per document, so runs of other documents
+                sharing the map do not age this document's entries.
+
+        Returns:
+            The new generation number (of ``document``, if given)
+
+        Raises:
+            RuntimeError: If generation tracking is off or in read-only mode
+        """
+        if not self.track_generations or self.read_only:
+            raise RuntimeError("Generation tracking requires track_generations and write access")
+
+        with self.session():
+            generation = int(self.store.get_metadata("generation", 0)) + 1
+            self.store.set_metadata("generation", generation)
+            if document is not None:
+                generations = dict(self.store.get_metadata("generations", {}))
+                generations[document] = generations.get(document, 0) + 1
+                generation = generations[document]
+                self.store.set_metadata("generations", generations)
+            for category, keys in self._seen.items():
+                self.store.mark_seen(category, keys, generation, document)
+        self._seen.clear()
+        return generation
+
+    def collect_garbage(self, keep_generations: int, dry_run: bool = False) -> dict[str, list[str]]:
+        """Retire entries not seen in the last ``keep_generations`` generations.
+
+        An entry seen by a document is kept while it was seen in one of that
+        document's last ``keep_generations`` runs; runs of other documents do
+        not count.
+
+        Retired mappings are removed from the map and the store is compacted.
+        Their numbers stay below the store's high-water mark and are recorded
+        in a per-category tombstone, so a retired ID is never handed out
+        again; a retired statement that comes back gets a new ID.
+
+        Args:
+            keep_generations: Generations an entry may go unseen before it is
+                retired
+            dry_run: Report what would be retired without changing anything
+
+        Returns:
+            Retired IDs per category, sorted
+
+        Raises:
+            ValueError: If keep_generations is below 1 or the map has no
+                recorded generations
+            RuntimeError: In read-only mode
+        """
+        if keep_generations < 1:
+            raise ValueError("keep_generations must be at least 1")
+        if self.read_only:
+            raise RuntimeError("Cannot collect garbage in read-only mode")
+
+        retired: dict[str, list[str]] = {}
+        with self.session():
+            generation = self.store.get_metadata("generation")
+            if generation is None:
+                raise ValueError(
+                    "ID map has no recorded generations; enable ids.track_generations first"
+                )
+            document_before = {
+                document: count - keep_generations + 1
+                for document, count in self.store.get_metadata("generations", {}).items()
+            }
+            for category in CATEGORIES:
+                keys = self.store.stale_keys(
+                    category, generation - keep_generations + 1, document_before
+                )
+                retired[category] = sorted(self.store.lookup_many(category, keys).values())
+                if not dry_run:
+                    self.store.retire(category, keys)
+
+        if not dry_run and any(retired.values()):
+            self.store.compact()
+        return retired
+
+    def _get_or_allocate(self, category: str, prefix: str, key: str) -> str:
+        """Look up the ID for a fingerprint, allocating the next one on a miss."""
+        existing = self.store.lookup(category, key)
+        if existing is not None:
+            if self.track_generations:
+                self._seen.setdefault(category, set()).add(key)
+            return existing
+        return self._resolve_many(category, prefix, [key])[0]
 
     def get_requirement_id(self, statement_hash: str) -> str:
         """Get or create a requirement ID for a statement.
@@ -84,18 +333,7 @@ class IDManager:
         Returns:
             Stable requirement ID (e.g., REQ-0001)
         """
-        requirements = self._idmap.setdefault("requirements", {})
-
-        if statement_hash in requirements:
-            return cast(str, requirements[statement_hash])
-
-        # Allocate new ID
-        new_id = f"{self.req_prefix}-{str(self._next_req_num).zfill(self.pad)}"
-        requirements[statement_hash] = new_id
-        self._next_req_num += 1
-        self._save_idmap()
-
-        return new_id
+        return self._get_or_allocate("requirements", self.req_prefix, statement_hash)
 
     def get_test_id(self, test_hash: str) -> str:
         """Get or create a test ID for a test case.
@@ -106,52 +344,114 @@ class IDManager:
         Returns:
             Stable test ID (e.g., TEST-0001)
         """
-        tests = self._idmap.setdefault("tests", {})
+        return self._get_or_allocate("tests", self.test_prefix, test_hash)
+
+    def _resolve_many(self, category: str, prefix: str, keys: list[str]) -> list[str]:
+        """Resolve fingerprints in bulk, allocating all misses as one block."""
+        if self.track_generations:
+            self._seen.setdefault(category, set()).update(keys)
+        found = self.store.lookup_many(category, keys)
+        misses = [key for key in dict.fromkeys(keys) if key not in found]
+        if not misses:
+            return [found[key] for key in keys]
+
+        if self.read_only:
+            for key in misses:
+                found[key] = self._lookup_legacy(category, key) or self._provisional_id(
+                    category, prefix, key
+                )
+            return [found[key] for key in keys]
+
+        if self._session_depth == 0:
+            if self._lazy_session is not None:
+                # First allocation of a lazy session: lock until it ends
+                self._lazy_session.enter_context(self.session())
+                return self._resolve_many(category, prefix, keys)
+            # Allocate under the lock, against the latest map on disk
+            with self.session():
+                return self._resolve_many(category, prefix, keys)
+
+        if self._legacy_keys:
+            rekeyed = [key for key in misses if self._rekey_legacy(category, key)]
+            if rekeyed:
+                found.update(self.store.lookup_many(category, rekeyed))
+                misses = [key for key in misses if key not in found]
+
+        if misses:
+            first = self.store.reserve(category, len(misses))
+            new_items = [
+                (key, f"{prefix}-{str(first + i).zfill(self.pad)}") for i, key in enumerate(misses)
+            ]
+            self.store.add_many(category, new_items)
+            found.update(new_items)
+
+        return [found[key] for key in keys]
+
+    def _lookup_legacy(self, category: str, key: str) -> str | None:
+        """Get the ID stored under a fingerprint's legacy-scheme key, if any."""
+        legacy_key = self._legacy_keys.get(key)
+        return self.store.lookup(category, legacy_key) if legacy_key else None
+
+    def _provisional_id(self, category: str, prefix: str, key: str) -> str:
+        """Get an in-memory ID for an unknown fingerprint in read-only mode."""
+        provisional = self._provisional.get((category, key))
+        if provisional is None:
+            number = self._provisional_next.get(category) or self.store.next_number(category)
+            provisional = f"{prefix}-{str(number).zfill(self.pad)}"
+            self._provisional[(category, key)] = provisional
+            self._provisional_next[category] = number + 1
+        return provisional
+
+    def resolve_requirements(self, statement_hashes: list[str]) -> list[str]:
+        """Get or create requirement IDs for many statements at once.
+
+        Misses are allocated as one contiguous block, in input order, and
+        persisted with a single write.
 
-        if test_hash in tests:
-            return cast(str, tests[test_hash])
+        Args:
+            statement_hashes: Fingerprints of the requirement statements
 
-        # Allocate new ID
-        new_id = f"{self.test_prefix}-{str(self._next_test_num).zfill(self.pad)}"
-        tests[test_hash] = new_id
-        self._next_test_num += 1
-        self._save_idmap()
+        Returns:
+            Stable requirement IDs, in input order
+        """
+        return self._resolve_many("requirements", self.req_prefix, statement_hashes)
+
+    def resolve_tests(self, test_hashes: list[str]) -> list[str]:
+        """Get or create test IDs for many test cases at once.
+
+        Misses are allocated as one contiguous block, in input order, and
+        persisted with a single write.
 
-        return new_id
+        Args:
+            test_hashes: Fingerprints of the test cases
+
+        Returns:
+            Stable test IDs, in input order
+        """
+        return self._resolve_many("tests", self.test_prefix, test_hashes)
 
     def get_all_requirement_ids(self) -> list[str]:
         """Get all allocated requirement IDs."""
-        return list(self._idmap.get("requirements", {}).values())
+        return self.store.ids("requirements")
 
     def get_all_test_ids(self) -> list[str]:
         """Get all allocated test IDs."""
-        return list(self._idmap.get("tests", {}).values())
+        return self.store.ids("tests")
 
     @staticmethod
     def hash_statement(statement: str) -> str:
         """Create a hash/fingerprint for a statement.
 
         Uses first N significant words to allow minor edits without ID change.
+        Always uses the legacy (v1) scheme; prefer ``statement_key``, which
+        follows the scheme of the ID map.
         """
-        import hashlib
-
-        # Normalize: lowercase, remove extra whitespace
-        normalized = " ".join(statement.lower().split())
-
-        # Strip trailing punctuation before fingerprinting
-        normalized = normalized.rstrip(".,!?;:")
-
-        # Take first ~50 chars for fingerprint stability
-        fingerprint = normalized[:50]
-
-        return hashlib.md5(fingerprint.encode()).hexdigest()[:12]
+        return fingerprint_statement(statement, LEGACY_SCHEME)
 
     @staticmethod
     def hash_test(title: str, req_ids: list[str]) -> str:
-        """Create a hash/fingerprint for a test case."""
-        import hashlib
-
-        # Combine title and requirements for uniqueness
-        combined = f"{title.lower()}:{','.join(sorted(req_ids))}"
+        """Create a hash/fingerprint for a test case.
 
-        return hashlib.md5(combined.encode()).hexdigest()[:12]
+        Always uses the legacy (v1) scheme; prefer ``test_key``.
+        """
+        return fingerprint_test_case(title, tuple(req_ids), LEGACY_SCHEME)
@@ -0,0 +1,1225 @@
+"""Persistence backends for the stable ID map."""
+
+import json
+import mmap
+import os
+import struct
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from .atomic import atomic_write
+
+if TYPE_CHECKING:
+    import sqlite3
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no advisory locks
+    fcntl = None  # type: ignore[assignment]
+
+CATEGORIES = ("requirements", "tests")
+
+Stamp = tuple[int, int, int] | None
+
+
+def _stat_stamp(path: Path) -> Stamp:
+    """Identify a version of a file on disk, or None if it does not exist."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _read_snapshot(path: Path) -> dict[str, Any] | None:
+    """Read a JSON ID map snapshot.
+
+    Raises:
+        ValueError: If the snapshot exists but is not valid JSON. Starting
+            over from an empty map would silently renumber every ID.
+    """
+    if not path.exists():
+        return None
+    with open(path) as f:
+        try:
+            return cast(dict[str, Any], json.load(f))
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Corrupt ID map {path}: {e}") from e
+
+
+def _write_snapshot(path: Path, idmap: dict[str, Any]) -> None:
+    """Write a JSON ID map snapshot atomically.
+
+    The map is written to a temporary file in the same directory and renamed
+    over the target, so readers never observe a partial write.
+    """
+    atomic_write(path, json.dumps(idmap, indent=2), fsync=True)
+
+
+def _id_number(id_str: str) -> int:
+    """Get the numeric part of an ID such as REQ-0001, or 0 if it has none."""
+    try:
+        return int(id_str.split("-")[1])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _next_number(ids: Iterable[str]) -> int:
+    """Get the number following the highest of a set of IDs."""
+    return max((_id_number(id_str) for id_str in ids), default=0) + 1
+
+
+class IDStore(ABC):
+    """Storage backend for an IDManager's fingerprint → ID map.
+
+    Reads may happen at any time. Writes (``reserve`` and ``add``) happen
+    inside ``transaction()``, which excludes other writers sharing the same
+    output directory until it ends. ``commit()`` makes staged writes durable
+    and may be called repeatedly within a transaction.
+    """
+
+    def __init__(self, output_dir: Path):
+        """Initialize store.
+
+        Args:
+            output_dir: Directory holding the ID map files
+        """
+        self.output_dir = output_dir
+
+    @abstractmethod
+    def open(self, metadata: dict[str, Any], read_only: bool = False) -> None:
+        """Load or create the ID map.
+
+        Args:
+            metadata: Metadata to record if the map is new
+            read_only: Open without creating or modifying anything on disk
+        """
+
+    @abstractmethod
+    def lookup(self, category: str, key: str) -> str | None:
+        """Get the ID stored for a fingerprint, if any."""
+
+    def lookup_many(self, category: str, keys: list[str]) -> dict[str, str]:
+        """Get the IDs stored for several fingerprints; misses are omitted."""
+        found = {}
+        for key in keys:
+            value = self.lookup(category, key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    @abstractmethod
+    def ids(self, category: str) -> list[str]:
+        """Get all IDs stored in a category."""
+
+    @abstractmethod
+    def next_number(self, category: str) -> int:
+        """Get the next free ID number without reserving it."""
+
+    @abstractmethod
+    def reserve(self, category: str, count: int = 1) -> int:
+        """Reserve ``count`` consecutive ID numbers and return the first."""
+
+    @abstractmethod
+    def add(self, category: str, key: str, value: str) -> None:
+        """Stage a new fingerprint → ID mapping."""
+
+    def add_many(self, category: str, items: list[tuple[str, str]]) -> None:
+        """Stage several new (fingerprint, ID) mappings."""
+        for key, value in items:
+            self.add(category, key, value)
+
+    @abstractmethod
+    def remove(self, category: str, key: str) -> None:
+        """Stage removal of a fingerprint's mapping."""
+
+    @abstractmethod
+    def mark_seen(
+        self, category: str, keys: Iterable[str], generation: int, document: str | None = None
+    ) -> None:
+        """Stage the generation in which fingerprints were last resolved.
+
+        With ``document``, the generation counts that document's runs and is
+        kept apart from other documents' and from undocumented runs.
+        """
+
+    @abstractmethod
+    def stale_keys(
+        self, category: str, before: int, document_before: Mapping[str, int] | None = None
+    ) -> list[str]:
+        """Get fingerprints not seen recently by any document.
+
+        A fingerprint is stale if it was last seen before ``before`` in runs
+        without a document, and before ``document_before[document]`` by every
+        document that has seen it. Entries never marked seen count as last
+        seen in generation 0.
+        """
+
+    @abstractmethod
+    def retire(self, category: str, keys: list[str]) -> None:
+        """Stage removal of mappings whose IDs must never be handed out again."""
+
+    @abstractmethod
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """Get a metadata value."""
+
+    @abstractmethod
+    def set_metadata(self, key: str, value: Any) -> None:
+        """Stage a metadata value."""
+
+    @abstractmethod
+    def commit(self) -> None:
+        """Persist staged writes."""
+
+    @abstractmethod
+    def rollback(self) -> None:
+        """Discard writes staged since the last commit."""
+
+    @property
+    @abstractmethod
+    def has_pending(self) -> bool:
+        """Whether there are staged writes not yet committed."""
+
+    @abstractmethod
+    def transaction(self) -> Any:
+        """Context manager for an exclusive write scope.
+
+        Commits on success and rolls back on error. Other writers sharing the
+        output directory wait until the scope ends, and reads inside it see
+        everything they have committed.
+        """
+
+    def compact(self) -> None:
+        """Reclaim space left behind by removed mappings.
+
+        Must be called outside ``transaction()``.
+        """
+        # Optional hook: stores that never leave garbage behind keep this no-op
+        return None
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+        # Optional hook: only stores holding connections or mappings override it
+        return None
+
+
+# Last-seen generations of runs without a document, and per document
+_SEEN_SECTIONS = ("last_seen", "document_seen")
+
+
+class MemoryStore(IDStore):
+    """Base for stores that load the whole map into a dict.
+
+    Subclasses implement ``_load``, ``_persist`` and ``_is_stale`` for their
+    on-disk format. Cross-process exclusion uses an advisory ``fcntl`` lock on
+    .idmap.json.lock, after which the map is reloaded if another process has
+    changed it.
+    """
+
+    def __init__(self, output_dir: Path):
+        """Initialize store.
+
+        Args:
+            output_dir: Directory holding the ID map files
+        """
+        super().__init__(output_dir)
+        self._lock_path = output_dir / ".idmap.json.lock"
+        self._idmap: dict[str, Any] = {}
+        self._default_metadata: dict[str, Any] = {}
+        self._next: dict[str, int] = {}
+        self._checkpoint: dict[str, int] = {}
+        self._metadata_checkpoint: dict[str, Any] = {}
+        self._seen_checkpoint: dict[str, Any] = {}
+        # Staged (category, fingerprint, previous ID) changes, oldest first
+        self._pending: list[tuple[str, str, str | None]] = []
+        self._metadata_dirty = False
+
+    @abstractmethod
+    def _load(self) -> dict[str, Any] | None:
+        """Read the persisted map, or None if nothing has been saved yet."""
+
+    @abstractmethod
+    def _persist(self, pending: list[tuple[str, str, str | None]]) -> None:
+        """Write staged changes to disk.
+
+        Args:
+            pending: (category, fingerprint, previous ID) for each changed
+                mapping; the new value is read from the in-memory map
+        """
+
+    @abstractmethod
+    def _is_stale(self) -> bool:
+        """Whether another process has changed the map since our last load or save."""
+
+    def open(self, metadata: dict[str, Any], read_only: bool = False) -> None:
+        """Load the ID map into memory; loading never writes."""
+        self._default_metadata = metadata
+        idmap = self._load() or {}
+        for category in CATEGORIES:
+            idmap.setdefault(category, {})
+        idmap.setdefault("metadata", dict(metadata))
+        self._idmap = idmap
+        self._next = {c: self._stored_next_number(c) for c in CATEGORIES}
+        self._pending.clear()
+        self._metadata_dirty = False
+        self._checkpoint_state()
+
+    def _stored_next_number(self, category: str) -> int:
+        """Get the next free number for a category from the map's metadata.
+
+        The high-water mark is trusted only while the recorded entry count
+        still matches, so maps written by older versions (or edited by hand)
+        fall back to scanning every stored ID. The scan never drops below the
+        highest retired number, so retired IDs stay retired.
+        """
+        entries = self._idmap[category]
+        counter = self._idmap["metadata"].get("counters", {}).get(category)
+        if counter and counter.get("entries") == len(entries):
+            return cast(int, counter["next"])
+        retired = self._idmap["metadata"].get("retired", {}).get(category, {})
+        return max(_next_number(entries.values()), int(retired.get("through", 0)) + 1)
+
+    def _update_counters(self) -> None:
+        """Record the current high-water marks in the map's metadata."""
+        self._idmap["metadata"]["counters"] = {
+            c: {"next": self._next[c], "entries": len(self._idmap[c])} for c in CATEGORIES
+        }
+
+    def lookup(self, category: str, key: str) -> str | None:
+        """Get the ID stored for a fingerprint, if any."""
+        return cast(str | None, self._idmap[category].get(key))
+
+    def lookup_many(self, category: str, keys: list[str]) -> dict[str, str]:
+        """Get the IDs stored for several fingerprints; misses are omitted."""
+        entries = self._idmap[category]
+        return {key: entries[key] for key in keys if key in entries}
+
+    def ids(self, category: str) -> list[str]:
+        """Get all IDs stored in a category."""
+        return list(self._idmap[category].values())
+
+    def next_number(self, category: str) -> int:
+        """Get the next free ID number without reserving it."""
+        return self._next[category]
+
+    def reserve(self, category: str, count: int = 1) -> int:
+        """Reserve ``count`` consecutive ID numbers and return the first."""
+        first = self._next[category]
+        self._next[category] = first + count
+        return first
+
+    def add(self, category: str, key: str, value: str) -> None:
+        """Stage a new fingerprint → ID mapping."""
+        entries = self._idmap[category]
+        self._pending.append((category, key, entries.get(key)))
+        entries[key] = value
+
+    def remove(self, category: str, key: str) -> None:
+        """Stage removal of a fingerprint's mapping."""
+        entries = self._idmap[category]
+        if key in entries:
+            self._pending.append((category, key, entries.pop(key)))
+
+    def mark_seen(
+        self, category: str, keys: Iterable[str], generation: int, document: str | None = None
+    ) -> None:
+        """Stage the generation in which fingerprints were last resolved."""
+        seen = dict(self._last_seen(category, document))
+        seen.update(dict.fromkeys(keys, generation))
+        self._set_last_seen(category, seen, document)
+
+    def _last_seen(self, category: str, document: str | None = None) -> dict[str, int]:
+        if document is None:
+            scope = self._idmap.get("last_seen", {})
+        else:
+            scope = self._idmap.get("document_seen", {}).get(document, {})
+        return cast(dict[str, int], scope.get(category, {}))
+
+    def _set_last_seen(
+        self, category: str, seen: dict[str, int], document: str | None = None
+    ) -> None:
+        # Copy on write so the rollback checkpoint stays intact
+        if document is None:
+            self._idmap["last_seen"] = {**self._idmap.get("last_seen", {}), category: seen}
+        else:
+            documents = self._idmap.get("document_seen", {})
+            self._idmap["document_seen"] = {
+                **documents,
+                document: {**documents.get(document, {}), category: seen},
+            }
+        self._metadata_dirty = True
+
+    def stale_keys(
+        self, category: str, before: int, document_before: Mapping[str, int] | None = None
+    ) -> list[str]:
+        """Get fingerprints not seen recently by any document."""
+        seen = self._last_seen(category)
+        fresh = {
+            key
+            for document, threshold in (document_before or {}).items()
+            for key, generation in self._last_seen(category, document).items()
+            if generation >= threshold
+        }
+        return [
+            key for key in self._idmap[category] if seen.get(key, 0) < before and key not in fresh
+        ]
+
+    def retire(self, category: str, keys: list[str]) -> None:
+        """Stage removal of mappings, recording them in the category's tombstone."""
+        entries = self._idmap[category]
+        keys = [key for key in keys if key in entries]
+        if not keys:
+            return
+
+        retired = dict(self._idmap["metadata"].get("retired", {}))
+        tombstone = retired.get(category, {"count": 0, "through": 0})
+        retired[category] = {
+            "count": tombstone["count"] + len(keys),
+            "through": max(tombstone["through"], *(_id_number(entries[key]) for key in keys)),
+        }
+        self.set_metadata("retired", retired)
+
+        retired_keys = set(keys)
+        for document in [None, *self._idmap.get("document_seen", {})]:
+            seen = self._last_seen(category, document)
+            self._set_last_seen(
+                category,
+                {key: gen for key, gen in seen.items() if key not in retired_keys},
+                document,
+            )
+        for key in keys:
+            self.remove(category, key)
+
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """Get a metadata value."""
+        return self._idmap["metadata"].get(key, default)
+
+    def set_metadata(self, key: str, value: Any) -> None:
+        """Stage a metadata value."""
+        self._idmap["metadata"][key] = value
+        self._metadata_dirty = True
+
+    def commit(self) -> None:
+        """Persist pending changes, if any."""
+        if self._pending or self._metadata_dirty:
+            self._update_counters()
+            self._persist(self._pending)
+            self._pending.clear()
+            self._metadata_dirty = False
+        self._checkpoint_state()
+
+    def rollback(self) -> None:
+        """Discard changes made since the last commit."""
+        for category, key, previous in reversed(self._pending):
+            if previous is None:
+                self._idmap[category].pop(key, None)
+            else:
+                self._idmap[category][key] = previous
+        self._pending.clear()
+        self._next = dict(self._checkpoint)
+        self._idmap["metadata"] = dict(self._metadata_checkpoint)
+        for section in _SEEN_SECTIONS:
+            if section in self._seen_checkpoint:
+                self._idmap[section] = self._seen_checkpoint[section]
+            else:
+                self._idmap.pop(section, None)
+        self._metadata_dirty = False
+
+    def _checkpoint_state(self) -> None:
+        """Remember committed state for rollback."""
+        self._checkpoint = dict(self._next)
+        self._metadata_checkpoint = dict(self._idmap["metadata"])
+        self._seen_checkpoint = {
+            section: self._idmap[section] for section in _SEEN_SECTIONS if section in self._idmap
+        }
+
+    @property
+    def has_pending(self) -> bool:
+        """Whether there are changes not yet written to disk."""
+        return bool(self._pending) or self._metadata_dirty
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Hold an exclusive advisory lock on the ID map across processes."""
+        with self._file_lock():
+            self._refresh()
+            self._checkpoint_state()
+            try:
+                yield
+            except BaseException:
+                self.rollback()
+                raise
+            self.commit()
+
+    def _refresh(self) -> None:
+        """Reload the map if another process has changed it; called under the lock."""
+        if self._is_stale():
+            self.open(self._default_metadata)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+class JSONStore(MemoryStore):
+    """Stores the ID map as a single pretty-printed .idmap.json file."""
+
+    def __init__(self, output_dir: Path):
+        """Initialize store.
+
+        Args:
+            output_dir: Directory holding .idmap.json
+        """
+        super().__init__(output_dir)
+        self.path = output_dir / ".idmap.json"
+        self._stamp: Stamp = None
+
+    def _load(self) -> dict[str, Any] | None:
+        """Load .idmap.json if present."""
+        idmap = _read_snapshot(self.path)
+        self._stamp = _stat_stamp(self.path)
+        return idmap
+
+    def _persist(self, pending: list[tuple[str, str, str | None]]) -> None:
+        """Rewrite .idmap.json with the full map."""
+        _write_snapshot(self.path, self._idmap)
+        self._stamp = _stat_stamp(self.path)
+
+    def _is_stale(self) -> bool:
+        """Whether .idmap.json was replaced since our last load or save."""
+        return _stat_stamp(self.path) != self._stamp
+
+
+def _truncate_torn_record(path: Path) -> None:
+    """Cut an incomplete final line off a journal before appending to it.
+
+    Every complete record ends with a newline, so anything after the last
+    newline is a torn append that was never acknowledged. Appending after it
+    would turn it into a corrupt complete line.
+    """
+    try:
+        f = open(path, "r+b")
+    except FileNotFoundError:
+        return
+    with f:
+        end = pos = f.seek(0, os.SEEK_END)
+        while pos > 0:
+            start = max(0, pos - 4096)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline != -1:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos != end:
+            f.truncate(pos)
+
+
+class JournalStore(MemoryStore):
+    """Stores the ID map as a JSON snapshot plus an append-only JSONL journal.
+
+    Each allocation appends one line to .idmap.journal (removals append a
+    record with a null ID), so saving costs
+    O(new allocations) instead of rewriting the whole map. Loading reads the
+    .idmap.json snapshot and replays the journal over it line by line. Once
+    the journal holds more than ``compact_threshold`` records it is folded
+    into a fresh snapshot and truncated.
+
+    The snapshot uses the same format as JSONStore, so a directory can be
+    switched between the two backends after a compaction.
+    """
+
+    def __init__(self, output_dir: Path, compact_threshold: int = 1000):
+        """Initialize store.
+
+        Args:
+            output_dir: Directory holding .idmap.json and .idmap.journal
+            compact_threshold: Journal records to accumulate before compacting
+        """
+        super().__init__(output_dir)
+        self.path = output_dir / ".idmap.json"
+        self.journal_path = output_dir / ".idmap.journal"
+        self.compact_threshold = compact_threshold
+        self._journal_records = 0
+        self._stamp: tuple[Stamp, Stamp] = (None, None)
+
+    def _load(self) -> dict[str, Any] | None:
+        """Load the snapshot and replay the journal over it."""
+        idmap = _read_snapshot(self.path)
+        self._journal_records = 0
+
+        if self.journal_path.exists():
+            if idmap is None:
+                idmap = {}
+            # Keep the snapshot's high-water marks current while replaying
+            counters = idmap.get("metadata", {}).get("counters", {})
+            with open(self.journal_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        if line.endswith("\n"):
+                            raise ValueError(f"Corrupt ID journal {self.journal_path}: {e}") from e
+                        # Torn final append from an interrupted writer; never
+                        # acknowledged, and cut off by the next append
+                        break
+                    entries = idmap.setdefault(record["c"], {})
+                    counter = counters.get(record["c"])
+                    if record["v"] is None:
+                        # Removal record
+                        if counter and record["k"] in entries:
+                            counter["entries"] -= 1
+                        entries.pop(record["k"], None)
+                    else:
+                        if counter and record["k"] not in entries:
+                            counter["entries"] += 1
+                            counter["next"] = max(counter["next"], _id_number(record["v"]) + 1)
+                        entries[record["k"]] = record["v"]
+                    self._journal_records += 1
+
+        self._stamp = self._current_stamp()
+        return idmap
+
+    def _persist(self, pending: list[tuple[str, str, str | None]]) -> None:
+        """Append pending changes, compacting once the journal grows too large.
+
+        Metadata and last-seen generations live only in the snapshot, so
+        changes to them compact too.
+        """
+        if (
+            not self.path.exists()
+            or self._metadata_dirty
+            or self._journal_records + len(pending) > self.compact_threshold
+        ):
+            self._compact()
+            return
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        _truncate_torn_record(self.journal_path)
+        with open(self.journal_path, "ab") as f:
+            for category, key, _previous in pending:
+                record = {"c": category, "k": key, "v": self._idmap[category].get(key)}
+                f.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_records += len(pending)
+        self._stamp = self._current_stamp()
+
+    def compact(self) -> None:
+        """Fold the journal into a fresh snapshot and truncate it.
+
+        Takes the write lock, so it must be called outside ``transaction()``.
+        """
+        with self._file_lock():
+            self._refresh()
+            self._compact()
+
+    def _compact(self) -> None:
+        """Write the in-memory map as the snapshot and truncate the journal.
+
+        Replaying records already contained in the snapshot is harmless, so a
+        crash between writing the snapshot and truncating the journal loses
+        nothing.
+        """
+        _write_snapshot(self.path, self._idmap)
+        self.journal_path.unlink(missing_ok=True)
+        self._journal_records = 0
+        self._stamp = self._current_stamp()
+
+    def _is_stale(self) -> bool:
+        """Whether the snapshot or journal changed since our last load or save."""
+        return self._current_stamp() != self._stamp
+
+    def _current_stamp(self) -> tuple[Stamp, Stamp]:
+        return (_stat_stamp(self.path), _stat_stamp(self.journal_path))
+
+
+# .idmap.bin layout (little-endian): header (magic, version, stamp of the source
+# .idmap.json, index size), a JSON index, then per category a sorted array of
+# packed fingerprints followed by a parallel uint32 array of ID numbers
+_SNAPSHOT_MAGIC = b"IDMB"
+_SNAPSHOT_HEADER = struct.Struct("<4sHxxqqqI")
+_SNAPSHOT_VERSION = 1
+_KEY_BYTES = 6
+
+
+def _packed_key(key: str) -> bytes | None:
+    """Pack a 12 hex char fingerprint into 6 bytes, or None if it is not one."""
+    if len(key) != _KEY_BYTES * 2:
+        return None
+    try:
+        packed = bytes.fromhex(key)
+    except ValueError:
+        return None
+    # Reject uppercase, which would not round-trip
+    return packed if packed.hex() == key else None
+
+
+class _PackedKeys:
+    """Sequence view of a sorted packed fingerprint array, for bisect."""
+
+    def __init__(self, buf: mmap.mmap, offset: int, count: int):
+        self._buf = buf
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> bytes:
+        start = self._offset + index * _KEY_BYTES
+        return self._buf[start : start + _KEY_BYTES]
+
+
+class SnapshotStore(JSONStore):
+    """JSONStore with a compact, memory-mapped binary snapshot for fast opens.
+
+    Whenever .idmap.json is saved, .idmap.bin is written next to it with each
+    category's fingerprints packed into sorted 6-byte records and a parallel
+    array of ID numbers. Opening the store maps .idmap.bin instead of parsing
+    the JSON, and lookups bisect the packed keys, so opening costs the same
+    regardless of map size. The JSON is loaded only once a transaction holds the
+    write lock.
+
+    .idmap.json stays the source of truth. The snapshot records the file
+    stamp of the JSON it was built from and is ignored when the JSON has
+    changed since. Maps whose keys are not 12 hex char fingerprints, or whose
+    IDs do not share one prefix and padding per category, get no snapshot.
+    """
+
+    def __init__(self, output_dir: Path):
+        """Initialize store.
+
+        Args:
+            output_dir: Directory holding .idmap.json and .idmap.bin
+        """
+        super().__init__(output_dir)
+        self.snapshot_path = output_dir / ".idmap.bin"
+        self._file: Any = None
+        self._buf: mmap.mmap | None = None
+        self._index: dict[str, Any] = {}
+        self._base = 0
+
+    def open(self, metadata: dict[str, Any], read_only: bool = False) -> None:
+        """Map the binary snapshot if it is current, else load the JSON."""
+        self.close()
+        self._default_metadata = metadata
+        stamp = _stat_stamp(self.path)
+        if stamp is not None and self._map_snapshot(stamp):
+            self._stamp = stamp
+            return
+        super().open(metadata, read_only)
+
+    def _map_snapshot(self, stamp: Stamp) -> bool:
+        """Memory-map .idmap.bin if it was built from the current JSON."""
+        try:
+            f = open(self.snapshot_path, "rb")
+        except FileNotFoundError:
+            return False
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            f.close()
+            return False
+
+        if len(buf) >= _SNAPSHOT_HEADER.size:
+            magic, version, *source, index_size = _SNAPSHOT_HEADER.unpack_from(buf)
+            if magic == _SNAPSHOT_MAGIC and version == _SNAPSHOT_VERSION and tuple(source) == stamp:
+                start = _SNAPSHOT_HEADER.size
+                self._index = json.loads(buf[start : start + index_size])
+                self._base = start + index_size
+                self._file, self._buf = f, buf
+                return True
+        buf.close()
+        f.close()
+        return False
+
+    @property
+    def is_mapped(self) -> bool:
+        """Whether reads are currently served from the binary snapshot."""
+        return self._buf is not None
+
+    def _materialize(self) -> None:
+        """Replace the mapped snapshot with the full in-memory map."""
+        if self._buf is not None:
+            self.close()
+            MemoryStore.open(self, self._default_metadata)
+
+    def _find(self, category: str, key: str) -> str | None:
+        """Bisect the mapped snapshot for a fingerprint."""
+        assert self._buf is not None
+        packed = _packed_key(key)
+        layout = self._index["categories"][category]
+        if packed is None or not layout["count"]:
+            return None
+        keys = _PackedKeys(self._buf, self._base + layout["offset"], layout["count"])
+        i = bisect_left(keys, packed)
+        if i == len(keys) or keys[i] != packed:
+            return None
+        (number,) = struct.unpack_from("<I", self._buf, self._base + layout["numbers"] + i * 4)
+        return f"{layout['prefix']}-{str(number).zfill(layout['pad'])}"
+
+    def lookup(self, category: str, key: str) -> str | None:
+        """Get the ID stored for a fingerprint, if any."""
+        if self._buf is None:
+            return super().lookup(category, key)
+        return self._find(category, key)
+
+    def lookup_many(self, category: str, keys: list[str]) -> dict[str, str]:
+        """Get the IDs stored for several fingerprints; misses are omitted."""
+        if self._buf is None:
+            return super().lookup_many(category, keys)
+        found = {}
+        for key in keys:
+            value = self._find(category, key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def ids(self, category: str) -> list[str]:
+        """Get all IDs stored in a category, in numeric order when mapped."""
+        if self._buf is None:
+            return super().ids(category)
+        layout = self._index["categories"][category]
+        numbers = struct.unpack_from(
+            f"<{layout['count']}I", self._buf, self._base + layout["numbers"]
+        )
+        return [f"{layout['prefix']}-{str(n).zfill(layout['pad'])}" for n in sorted(numbers)]
+
+    def next_number(self, category: str) -> int:
+        """Get the next free ID number without reserving it."""
+        if self._buf is None:
+            return super().next_number(category)
+        return cast(int, self._index["categories"][category]["next"])
+
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """Get a metadata value."""
+        if self._buf is None:
+            return super().get_metadata(key, default)
+        return self._index["metadata"].get(key, default)
+
+    def commit(self) -> None:
+        """Persist pending changes, if any."""
+        if self._buf is None:
+            super().commit()
+
+    def rollback(self) -> None:
+        """Discard changes made since the last commit."""
+        if self._buf is None:
+            super().rollback()
+
+    def _refresh(self) -> None:
+        """Load the full map under the lock, reloading the JSON if it changed.
+
+        Writers need the whole map, and the snapshot is never remapped here:
+        while mapped, ``commit`` and ``rollback`` do nothing.
+        """
+        self._materialize()
+        if self._is_stale():
+            MemoryStore.open(self, self._default_metadata)
+
+    def _persist(self, pending: list[tuple[str, str, str | None]]) -> None:
+        """Rewrite .idmap.json, then rebuild .idmap.bin from it."""
+        super()._persist(pending)
+        self._write_binary()
+
+    def _write_binary(self) -> None:
+        """Write .idmap.bin for the current map, or remove it if it cannot hold it."""
+        index: dict[str, Any] = {"metadata": self._idmap["metadata"], "categories": {}}
+        arrays: list[bytes] = []
+        # Array offsets are relative to the end of the index
+        data_size = 0
+        for category in CATEGORIES:
+            records = []
+            prefix, pad = None, 0
+            for key, value in self._idmap[category].items():
+                packed = _packed_key(key)
+                id_prefix, _, digits = value.rpartition("-")
+                if prefix is None:
+                    prefix, pad = id_prefix, len(digits)
+                if (
+                    packed is None
+                    or id_prefix != prefix
+                    or not digits.isdigit()
+                    or str(int(digits)).zfill(pad) != digits
+                ):
+                    self.snapshot_path.unlink(missing_ok=True)
+                    return
+                records.append((packed, int(digits)))
+            records.sort()
+            keys = b"".join(packed for packed, _ in records)
+            numbers = struct.pack(f"<{len(records)}I", *(n for _, n in records))
+            index["categories"][category] = {
+                "count": len(records),
+                "prefix": prefix or "",
+                "pad": pad,
+                "next": self._next[category],
+                "offset": data_size,
+                "numbers": data_size + len(keys),
+            }
+            arrays += [keys, numbers]
+            data_size += len(keys) + len(numbers)
+
+        assert self._stamp is not None
+        index_bytes = json.dumps(index, separators=(",", ":")).encode()
+        header = _SNAPSHOT_HEADER.pack(
+            _SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, *self._stamp, len(index_bytes)
+        )
+
+        atomic_write(self.snapshot_path, b"".join([header, index_bytes, *arrays]), fsync=True)
+
+    def close(self) -> None:
+        """Unmap the binary snapshot."""
+        if self._buf is not None:
+            self._buf.close()
+            self._file.close()
+            self._buf = self._file = None
+
+
+class SQLiteStore(IDStore):
+    """Stores the ID map in an indexed SQLite database.
+
+    Lookups are single-row primary key queries, so opening the store costs
+    the same regardless of how many mappings it holds. Number allocation
+    updates a per-category counter row inside a ``BEGIN IMMEDIATE``
+    transaction, and SQLite's own locking serializes concurrent writers.
+
+    On first use, an existing .idmap.json in the same directory is imported.
+    """
+
+    def __init__(self, output_dir: Path, timeout: float = 30.0):
+        """Initialize store.
+
+        Args:
+            output_dir: Directory holding .idmap.sqlite3
+            timeout: Seconds to wait for another writer's transaction
+        """
+        super().__init__(output_dir)
+        self.path = output_dir / ".idmap.sqlite3"
+        self.timeout = timeout
+        self._conn: sqlite3.Connection | None = None
+        self._in_transaction = False
+        self._staged = 0
+
+    @property
+    def conn(self) -> "sqlite3.Connection":
+        """Open database connection."""
+        if self._conn is None:
+            raise RuntimeError("SQLiteStore used before open()")
+        return self._conn
+
+    def open(self, metadata: dict[str, Any], read_only: bool = False) -> None:
+        """Open the database, creating and seeding it if needed.
+
+        In read-only mode an existing database is opened with ``mode=ro``;
+        a missing one is built in memory (seeded from .idmap.json if present)
+        so nothing is created on disk.
+        """
+        import sqlite3
+
+        if read_only and self.path.exists():
+            self._conn = sqlite3.connect(
+                f"{self.path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                timeout=self.timeout,
+                isolation_level=None,
+            )
+            return
+
+        if read_only:
+            self._conn = sqlite3.connect(":memory:", isolation_level=None)
+        else:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.transaction():
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS ids (
+                    category TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    id TEXT NOT NULL,
+                    last_seen INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (category, fingerprint)
+                ) WITHOUT ROWID
+                """
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS sequence (category TEXT PRIMARY KEY, next INTEGER NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS document_seen (
+                    category TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    document TEXT NOT NULL,
+                    generation INTEGER NOT NULL,
+                    PRIMARY KEY (category, fingerprint, document)
+                ) WITHOUT ROWID
+                """
+            )
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(ids)")}
+            if "last_seen" not in columns:
+                # Databases created before generation tracking
+                self.conn.execute("ALTER TABLE ids ADD COLUMN last_seen INTEGER NOT NULL DEFAULT 0")
+            if self.conn.execute("SELECT 1 FROM sequence LIMIT 1").fetchone() is None:
+                self._seed(metadata)
+
+    def _seed(self, metadata: dict[str, Any]) -> None:
+        """Initialize a new database, importing .idmap.json if present."""
+        idmap = _read_snapshot(self.output_dir / ".idmap.json") or {}
+        metadata = idmap.get("metadata", metadata)
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+            [(k, json.dumps(v)) for k, v in metadata.items()],
+        )
+        for category in CATEGORIES:
+            entries = idmap.get(category, {})
+            seen = idmap.get("last_seen", {}).get(category, {})
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ids (category, fingerprint, id, last_seen) "
+                "VALUES (?, ?, ?, ?)",
+                [(category, k, v, seen.get(k, 0)) for k, v in entries.items()],
+            )
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO document_seen (category, fingerprint, document, generation) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (category, key, document, generation)
+                    for document, scopes in idmap.get("document_seen", {}).items()
+                    for key, generation in scopes.get(category, {}).items()
+                    if key in entries
+                ],
+            )
+            # Never drop below a high-water mark or retired number from the JSON map
+            counter = metadata.get("counters", {}).get(category, {})
+            retired = metadata.get("retired", {}).get(category, {})
+            self.conn.execute(
+                "INSERT INTO sequence (category, next) VALUES (?, ?)",
+                (
+                    category,
+                    max(
+                        _next_number(entries.values()),
+                        counter.get("next", 0),
+                        retired.get("through", 0) + 1,
+                    ),
+                ),
+            )
+
+    def lookup(self, category: str, key: str) -> str | None:
+        """Get the ID stored for a fingerprint, if any."""
+        row = self.conn.execute(
+            "SELECT id FROM ids WHERE category = ? AND fingerprint = ?", (category, key)
+        ).fetchone()
+        return cast(str, row[0]) if row else None
+
+    def lookup_many(self, category: str, keys: list[str]) -> dict[str, str]:
+        """Get the IDs stored for several fingerprints; misses are omitted."""
+        found: dict[str, str] = {}
+        unique = list(dict.fromkeys(keys))
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            chunk = unique[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT fingerprint, id FROM ids WHERE category = ? AND fingerprint IN ({placeholders})",
+                (category, *chunk),
+            )
+            found.update(rows)
+        return found
+
+    def ids(self, category: str) -> list[str]:
+        """Get all IDs stored in a category, in numeric order."""
+        rows = self.conn.execute("SELECT id FROM ids WHERE category = ?", (category,))
+        # Text order would put REQ-10000 before REQ-9999
+        return sorted((cast(str, row[0]) for row in rows), key=_id_number)
+
+    def next_number(self, category: str) -> int:
+        """Get the next free ID number without reserving it."""
+        row = self.conn.execute("SELECT next FROM sequence WHERE category = ?", (category,))
+        return cast(int, row.fetchone()[0])
+
+    def reserve(self, category: str, count: int = 1) -> int:
+        """Reserve ``count`` consecutive ID numbers and return the first."""
+        first = self.next_number(category)
+        self.conn.execute(
+            "UPDATE sequence SET next = ? WHERE category = ?", (first + count, category)
+        )
+        self._staged += 1
+        return first
+
+    def add(self, category: str, key: str, value: str) -> None:
+        """Stage a new fingerprint → ID mapping."""
+        self.conn.execute(
+            "INSERT INTO ids (category, fingerprint, id) VALUES (?, ?, ?)",
+            (category, key, value),
+        )
+        self._staged += 1
+
+    def add_many(self, category: str, items: list[tuple[str, str]]) -> None:
+        """Stage several new (fingerprint, ID) mappings."""
+        self.conn.executemany(
+            "INSERT INTO ids (category, fingerprint, id) VALUES (?, ?, ?)",
+            [(category, key, value) for key, value in items],
+        )
+        self._staged += len(items)
+
+    def remove(self, category: str, key: str) -> None:
+        """Stage removal of a fingerprint's mapping."""
+        self.conn.execute("DELETE FROM ids WHERE category = ? AND fingerprint = ?", (category, key))
+        self._staged += 1
+
+    def mark_seen(
+        self, category: str, keys: Iterable[str], generation: int, document: str | None = None
+    ) -> None:
+        """Stage the generation in which fingerprints were last resolved."""
+        if document is None:
+            cursor = self.conn.executemany(
+                "UPDATE ids SET last_seen = ? WHERE category = ? AND fingerprint = ?",
+                [(generation, category, key) for key in keys],
+            )
+        else:
+            cursor = self.conn.executemany(
+                "INSERT OR REPLACE INTO document_seen (category, fingerprint, document, generation) "
+                "SELECT category, fingerprint, ?, ? FROM ids WHERE category = ? AND fingerprint = ?",
+                [(document, generation, category, key) for key in keys],
+            )
+        self._staged += cursor.rowcount
+
+    def stale_keys(
+        self, category: str, before: int, document_before: Mapping[str, int] | None = None
+    ) -> list[str]:
+        """Get fingerprints not seen recently by any document."""
+        thresholds = document_before or {}
+        fresh = {
+            fingerprint
+            for fingerprint, document, generation in self.conn.execute(
+                "SELECT fingerprint, document, generation FROM document_seen WHERE category = ?",
+                (category,),
+            )
+            if document in thresholds and generation >= thresholds[document]
+        }
+        rows = self.conn.execute(
+            "SELECT fingerprint FROM ids WHERE category = ? AND last_seen < ?", (category, before)
+        )
+        return [cast(str, row[0]) for row in rows if row[0] not in fresh]
+
+    def retire(self, category: str, keys: list[str]) -> None:
+        """Stage removal of mappings; the sequence row keeps their numbers used."""
+        retired = dict(self.get_metadata("retired", {}))
+        tombstone = retired.get(category, {"count": 0, "through": 0})
+        found = self.lookup_many(category, keys)
+        if not found:
+            return
+        retired[category] = {
+            "count": tombstone["count"] + len(found),
+            "through": max(tombstone["through"], *(_id_number(v) for v in found.values())),
+        }
+        self.set_metadata("retired", retired)
+        self.conn.executemany(
+            "DELETE FROM ids WHERE category = ? AND fingerprint = ?",
+            [(category, key) for key in found],
+        )
+        self.conn.executemany(
+            "DELETE FROM document_seen WHERE category = ? AND fingerprint = ?",
+            [(category, key) for key in found],
+        )
+        self._staged += len(found)
+
+    def get_metadata(self, key: str, default: Any = None) -> Any:
+        """Get a metadata value."""
+        row = self.conn.execute("SELECT value FROM metadata WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_metadata(self, key: str, value: Any) -> None:
+        """Stage a metadata value."""
+        self.conn.execute(
+            "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, json.dumps(value))
+        )
+        self._staged += 1
+
+    def commit(self) -> None:
+        """Commit writes so far, keeping the write lock if inside a transaction."""
+        if self._in_transaction:
+            self.conn.execute("COMMIT")
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._staged = 0
+
+    def rollback(self) -> None:
+        """Roll back writes since the last commit."""
+        if self._in_transaction:
+            self.conn.execute("ROLLBACK")
+            self.conn.execute("BEGIN IMMEDIATE")
+        self._staged = 0
+
+    @property
+    def has_pending(self) -> bool:
+        """Whether there are uncommitted writes."""
+        return self._staged > 0
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Hold SQLite's write lock for the duration of the block."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        self._in_transaction = True
+        try:
+            yield
+        except BaseException:
+            self._in_transaction = False
+            self.conn.execute("ROLLBACK")
+            self._staged = 0
+            raise
+        self._in_transaction = False
+        self.conn.execute("COMMIT")
+        self._staged = 0
+
+    def compact(self) -> None:
+        """Rebuild the database file to release pages freed by removals."""
+        self.conn.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def create_store(kind: str, output_dir: Path) -> IDStore:
+    """Create an ID store by backend name.
+
+    Args:
+        kind: Backend name ("json", "journal", "snapshot" or "sqlite")
+        output_dir: Directory holding the ID map files
+
+    Returns:
+        Configured ID store
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if kind == "json":
+        return JSONStore(output_dir)
+    if kind == "journal":
+        return JournalStore(output_dir)
+    if kind == "snapshot":
+        return SnapshotStore(output_dir)
+    if kind == "sqlite":
+        return SQLiteStore(output_dir)
+    raise ValueError(f"Unknown ID storage backend: {kind}")
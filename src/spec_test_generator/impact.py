@@ -4,7 +4,10 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from .generator import create_id_manager
 from .id_manager import IDManager
+from .models import PolicyConfig
+from .parse_cache import get_parse_cache
 from .parser import PRDParser
 
 
@@ -122,14 +125,36 @@ class ImpactReport:
 class ImpactAnalyzer:
     """Analyzes changes between PRD versions."""
 
-    def __init__(self, output_dir: Path):
+    def __init__(
+        self,
+        output_dir: Path,
+        policy: PolicyConfig | None = None,
+        id_manager: IDManager | None = None,
+    ):
         """Initialize analyzer.
 
         Args:
-            output_dir: Output directory for ID management
+            output_dir: Output directory for ID management. The ID map is
+                only read; requirements without a stored ID get provisional
+                IDs that are not persisted.
+            policy: Policy whose ``ids`` section (storage backend, prefixes,
+                fingerprint scheme) the ID map was written with
+            id_manager: Already open ID manager for ``output_dir`` to use
+                instead of creating one; the caller keeps ownership of it
         """
         self.output_dir = output_dir
-        self.id_manager = IDManager(output_dir)
+        self._owns_id_manager = id_manager is None
+        if id_manager is not None:
+            self.id_manager = id_manager
+        elif policy is not None:
+            self.id_manager = create_id_manager(policy, output_dir, read_only=True)
+        else:
+            self.id_manager = IDManager(output_dir, read_only=True)
+
+    def close(self) -> None:
+        """Release the ID manager's store, if this analyzer opened it."""
+        if self._owns_id_manager:
+            self.id_manager.close()
 
     def compare(
         self,
@@ -148,8 +173,9 @@ class ImpactAnalyzer:
             Impact analysis report
         """
         # Parse both PRDs
-        baseline_parser = PRDParser(baseline_path)
-        current_parser = PRDParser(current_path)
+        parse_cache = get_parse_cache()
+        baseline_parser = PRDParser(baseline_path, parse_cache=parse_cache)
+        current_parser = PRDParser(current_path, parse_cache=parse_cache)
 
         baseline_prd = baseline_parser.parse()
         current_prd = current_parser.parse()
@@ -230,18 +256,16 @@ class ImpactAnalyzer:
 
     def _extract_requirements(self, req_texts: list[str]) -> list[dict[str, Any]]:
         """Extract requirement info from PRD requirement texts."""
-        requirements = []
-        for text in req_texts:
-            hash_key = self.id_manager.hash_statement(text)
-            req_id = self.id_manager.get_requirement_id(hash_key)
-            requirements.append(
-                {
-                    "hash": hash_key,
-                    "id": req_id,
-                    "statement": text,
-                }
-            )
-        return requirements
+        hash_keys = [self.id_manager.statement_key(text) for text in req_texts]
+        req_ids = self.id_manager.resolve_requirements(hash_keys)
+        return [
+            {
+                "hash": hash_key,
+                "id": req_id,
+                "statement": text,
+            }
+            for hash_key, req_id, text in zip(hash_keys, req_ids, req_texts, strict=True)
+        ]
 
     def _calculate_risk(self, changes: list[Change]) -> str:
         """Calculate overall risk level from changes."""
@@ -46,26 +46,36 @@ class JiraImporter:
         Returns:
             List of imported requirements
         """
-        requirements = []
-
         # Handle Jira JSON export format
         issues = data.get("issues", [data] if "key" in data else [])
 
+        # Skip issues without a summary
+        statements: list[tuple[dict[str, Any], str]] = []
         for issue in issues:
-            req = self._parse_issue(issue)
-            if req:
-                requirements.append(req)
+            statement = self._statement(issue)
+            if statement:
+                statements.append((issue, statement))
 
-        return requirements
+        # Get stable IDs for all issues at once
+        req_ids = self.id_manager.resolve_requirements(
+            [self.id_manager.statement_key(statement) for _, statement in statements]
+        )
 
-    def _parse_issue(self, issue: dict[str, Any]) -> Requirement | None:
-        """Parse a single Jira issue into a requirement."""
-        fields = issue.get("fields", issue)
+        return [
+            self._parse_issue(issue, statement, req_id)
+            for (issue, statement), req_id in zip(statements, req_ids, strict=True)
+        ]
 
-        # Extract summary/title
-        summary = fields.get("summary", "")
+    def _statement(self, issue: dict[str, Any]) -> str | None:
+        """Generate a requirement statement from a Jira issue's summary."""
+        summary = issue.get("fields", issue).get("summary", "")
         if not summary:
             return None
+        return f"The system SHALL {summary.lower()}"
+
+    def _parse_issue(self, issue: dict[str, Any], statement: str, req_id: str) -> Requirement:
+        """Parse a single Jira issue into a requirement."""
+        fields = issue.get("fields", issue)
 
         # Extract description
         description = fields.get("description", "")
@@ -73,13 +83,6 @@ class JiraImporter:
             # Handle Atlassian Document Format
             description = self._parse_adf(description)
 
-        # Generate statement
-        statement = f"The system SHALL {summary.lower()}"
-
-        # Get stable ID
-        statement_hash = self.id_manager.hash_statement(statement)
-        req_id = self.id_manager.get_requirement_id(statement_hash)
-
         # Map priority
         priority = self._map_priority(fields.get("priority", {}))
 
@@ -198,37 +201,40 @@ class LinearImporter:
         Returns:
             List of imported requirements
         """
-        requirements = []
-
         # Handle Linear JSON export format
         issues = data.get("issues", data.get("data", {}).get("issues", {}).get("nodes", []))
         if isinstance(issues, dict):
             issues = issues.get("nodes", [])
 
+        # Skip issues without a title
+        statements: list[tuple[dict[str, Any], str]] = []
         for issue in issues:
-            req = self._parse_issue(issue)
-            if req:
-                requirements.append(req)
+            statement = self._statement(issue)
+            if statement:
+                statements.append((issue, statement))
 
-        return requirements
+        # Get stable IDs for all issues at once
+        req_ids = self.id_manager.resolve_requirements(
+            [self.id_manager.statement_key(statement) for _, statement in statements]
+        )
 
-    def _parse_issue(self, issue: dict[str, Any]) -> Requirement | None:
-        """Parse a single Linear issue into a requirement."""
-        # Extract title
+        return [
+            self._parse_issue(issue, statement, req_id)
+            for (issue, statement), req_id in zip(statements, req_ids, strict=True)
+        ]
+
+    def _statement(self, issue: dict[str, Any]) -> str | None:
+        """Generate a requirement statement from a Linear issue's title."""
         title = issue.get("title", "")
         if not title:
             return None
+        return f"The system SHALL {title.lower()}"
 
+    def _parse_issue(self, issue: dict[str, Any], statement: str, req_id: str) -> Requirement:
+        """Parse a single Linear issue into a requirement."""
         # Extract description
         description = issue.get("description", "") or ""
 
-        # Generate statement
-        statement = f"The system SHALL {title.lower()}"
-
-        # Get stable ID
-        statement_hash = self.id_manager.hash_statement(statement)
-        req_id = self.id_manager.get_requirement_id(statement_hash)
-
         # Map priority
         priority = self._map_priority(issue.get("priority", 0))
 
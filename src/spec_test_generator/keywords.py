@@ -0,0 +1,121 @@
+"""Keyword rules matched against requirement text."""
+
+import functools
+import re
+from collections.abc import Iterable, Mapping
+
+from .models import PolicyConfig
+
+# Rule name -> keywords, matched case-insensitively as substrings. Policies
+# override or add rules under ``keywords``.
+DEFAULT_KEYWORD_RULES: dict[str, tuple[str, ...]] = {
+    # Requirements that get an invalid-input acceptance criterion
+    "validation": ("must", "required", "authenticated"),
+    # Edge cases
+    "listing": ("list", "pagination"),
+    "auth": ("auth",),
+    "error": ("error",),
+    # Test typing
+    "integration": ("integration", "database"),
+    "user": ("user",),
+}
+
+
+class KeywordMatcher:
+    """All keyword rules compiled into one pattern.
+
+    ``scan`` lowercases a text once and finds every keyword in a single
+    regex pass, returning a bitset of the rules that matched (bit ``i`` is
+    ``rules[i]``), so later stages test rules with a bit mask instead of
+    searching the text again.
+    """
+
+    def __init__(self, rules: Mapping[str, Iterable[str]]):
+        """Initialize matcher.
+
+        Args:
+            rules: Rule name -> keywords
+        """
+        self.rules = tuple(rules)
+        self._masks = {name: 1 << i for i, name in enumerate(self.rules)}
+
+        keyword_rules: dict[str, int] = {}
+        for name, keywords in rules.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    keyword_rules[keyword] = keyword_rules.get(keyword, 0) | self._masks[name]
+
+        # The pattern reports only the longest keyword starting at each
+        # position, so a keyword also sets the rules of keywords inside it
+        # ("authenticated" implies "auth")
+        self._keyword_masks: dict[str, int] = {}
+        for keyword in keyword_rules:
+            mask = 0
+            for other, other_mask in keyword_rules.items():
+                if other in keyword:
+                    mask |= other_mask
+            self._keyword_masks[keyword] = mask
+
+        alternatives = sorted(keyword_rules, key=len, reverse=True)
+        self._pattern = (
+            re.compile("(?=(" + "|".join(map(re.escape, alternatives)) + "))")
+            if alternatives
+            else None
+        )
+
+    def scan(self, text: str) -> int:
+        """Match all rules against a text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Bitset of the rules with at least one keyword in the text
+        """
+        if self._pattern is None:
+            return 0
+        keyword_masks = self._keyword_masks
+        mask = 0
+        for keyword in set(self._pattern.findall(text.lower())):
+            mask |= keyword_masks[keyword]
+        return mask
+
+    def mask(self, *names: str) -> int:
+        """Get the bit mask of one or more rules.
+
+        Raises:
+            KeyError: If a rule is not defined
+        """
+        mask = 0
+        for name in names:
+            mask |= self._masks[name]
+        return mask
+
+    def has(self, keywords: int, name: str) -> bool:
+        """Whether a bitset from ``scan`` includes a rule."""
+        return bool(keywords & self._masks[name])
+
+
+@functools.lru_cache(maxsize=32)
+def _compiled(rules: tuple[tuple[str, tuple[str, ...]], ...]) -> KeywordMatcher:
+    return KeywordMatcher(dict(rules))
+
+
+def keyword_matcher(policy: PolicyConfig) -> KeywordMatcher:
+    """Get the compiled matcher for a policy's keyword rules.
+
+    The policy's ``keywords`` mapping replaces the keywords of the rules it
+    names and adds new rules; the rest keep their defaults. Matchers are
+    compiled once per distinct rule table.
+
+    Args:
+        policy: Policy configuration
+
+    Returns:
+        Shared compiled matcher
+    """
+    rules = dict(DEFAULT_KEYWORD_RULES)
+    for name, keywords in (policy.get("keywords") or {}).items():
+        rules[name] = tuple(keywords)
+    return _compiled(tuple(rules.items()))
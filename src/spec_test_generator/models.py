@@ -47,6 +47,20 @@ class Requirement:
             "feature_area": self.feature_area,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Requirement":
+        """Create from a dictionary made by ``to_dict``."""
+        return cls(
+            id=data["id"],
+            statement=data["statement"],
+            priority=Priority(data["priority"]),
+            acceptance_criteria=data["acceptance_criteria"],
+            edge_cases=data["edge_cases"],
+            rationale=data["rationale"],
+            notes=data["notes"],
+            feature_area=data["feature_area"],
+        )
+
     def to_markdown(self) -> str:
         """Convert to markdown format."""
         lines = [
@@ -108,6 +122,20 @@ class TestCase:
             "expected": self.expected,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TestCase":
+        """Create from a dictionary made by ``to_dict``."""
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            test_type=TestType(data["test_type"]),
+            priority=Priority(data["priority"]),
+            requirement_ids=data["requirement_ids"],
+            preconditions=data["preconditions"],
+            steps=data["steps"],
+            expected=data["expected"],
+        )
+
     def to_markdown(self) -> str:
         """Convert to markdown format."""
         lines = [
@@ -175,6 +203,41 @@ class TraceabilityEntry:
         return f"{self.req_id},{self.test_id},{self.test_type.value},{self.priority.value}"
 
 
+@dataclass
+class GeneratedRequirement:
+    """A requirement with the test cases and traceability generated for it.
+
+    ``markdown`` and ``test_markdown`` hold the rendered blocks of the
+    requirement and its test cases when they are already known (e.g. from
+    the generation cache), so writers do not render them again.
+    """
+
+    requirement: Requirement
+    test_cases: list[TestCase]
+    traceability: list[TraceabilityEntry]
+    markdown: str | None = None
+    test_markdown: list[str] | None = None
+
+    def render(self) -> None:
+        """Render any blocks not rendered yet."""
+        if self.markdown is None:
+            self.markdown = self.requirement.to_markdown()
+        if self.test_markdown is None:
+            self.test_markdown = [test.to_markdown() for test in self.test_cases]
+
+    def requirement_markdown(self) -> str:
+        """Get the requirement's markdown block."""
+        if self.markdown is not None:
+            return self.markdown
+        return self.requirement.to_markdown()
+
+    def test_case_markdown(self) -> list[str]:
+        """Get the markdown block of each test case."""
+        if self.test_markdown is not None:
+            return self.test_markdown
+        return [test.to_markdown() for test in self.test_cases]
+
+
 @dataclass
 class PolicyConfig:
     """Policy configuration."""
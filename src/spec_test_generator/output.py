@@ -1,108 +1,544 @@
 """Output artifact generators."""
 
+import hashlib
+import json
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
-from .models import PolicyConfig, Requirement, TestCase, TestPlan, TraceabilityEntry
+from .atomic import atomic_write, replacement_mode
+from .models import (
+    GeneratedRequirement,
+    PolicyConfig,
+    Requirement,
+    TestCase,
+    TestPlan,
+    TraceabilityEntry,
+)
+
+TRACEABILITY_HEADER = "REQ_ID,TEST_ID,TYPE,PRIORITY"
+
+# Digests of written artifacts, kept in the output directory
+ARTIFACT_MANIFEST_FILE = ".artifacts.json"
+ARTIFACT_MANIFEST_VERSION = 1
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(path: Path) -> str | None:
+    """Get the content digest of a file, reading it in chunks.
+
+    Returns:
+        Hex digest, or None if the file does not exist
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                hasher.update(chunk)
+    except FileNotFoundError:
+        return None
+    return hasher.hexdigest()
+
+
+@dataclass
+class WriteReport:
+    """Artifacts written, and skipped because their content was unchanged."""
+
+    written: list[Path] = field(default_factory=list)
+    skipped: list[Path] = field(default_factory=list)
+
+    def add(self, path: Path, written: bool) -> None:
+        """Record the outcome of one artifact write."""
+        (self.written if written else self.skipped).append(path)
+
+    def extend(self, other: "WriteReport") -> None:
+        """Add the outcomes of another report."""
+        self.written.extend(other.written)
+        self.skipped.extend(other.skipped)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "written": [str(path) for path in self.written],
+            "skipped": [str(path) for path in self.skipped],
+        }
+
+
+class ArtifactManifest:
+    """Content digests of the artifacts last written to a directory.
+
+    Each artifact's digest is stored in .artifacts.json with the size and
+    mtime the file had after it was written. While a file still has that
+    size and mtime, its content is compared by digest alone, without reading
+    it; a file changed or created by anything else is hashed instead.
+    Concurrent writers may record different artifacts at the same time.
+    """
+
+    def __init__(self, directory: Path):
+        """Initialize manifest and load the stored digests.
+
+        Args:
+            directory: Output directory the artifacts are written under
+        """
+        self.directory = directory
+        self.path = directory / ARTIFACT_MANIFEST_FILE
+        self._entries: dict[str, list[Any]] = {}
+        self._dirty = False
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if isinstance(data, dict) and data.get("version") == ARTIFACT_MANIFEST_VERSION:
+            self._entries = data.get("artifacts", {})
+
+    def _name(self, path: Path) -> str:
+        return path.relative_to(self.directory).as_posix()
+
+    def unchanged(self, path: Path, digest: str) -> bool:
+        """Whether a file already has the content with this digest."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return False
+        entry = self._entries.get(self._name(path))
+        if entry is not None and entry[:2] == [st.st_size, st.st_mtime_ns]:
+            return bool(entry[2] == digest)
+        if file_digest(path) != digest:
+            return False
+        # Unknown to the manifest but identical; remember it
+        self.record(path, digest)
+        return True
+
+    def record(self, path: Path, digest: str) -> None:
+        """Store the digest of a file just written."""
+        st = path.stat()
+        self._entries[self._name(path)] = [st.st_size, st.st_mtime_ns, digest]
+        self._dirty = True
+
+    def save(self) -> None:
+        """Write the manifest, if any digest changed."""
+        if not self._dirty:
+            return
+        # Sorted, so parallel writes in any order store the same manifest
+        data = {"version": ARTIFACT_MANIFEST_VERSION, "artifacts": self._entries}
+        atomic_write(self.path, json.dumps(data, sort_keys=True))
+        self._dirty = False
+
+
+def write_if_changed(path: Path, content: str, manifest: ArtifactManifest | None = None) -> bool:
+    """Write a text file unless it already has exactly this content.
+
+    Leaving unchanged files untouched keeps their mtime, so file watchers and
+    build tools are not retriggered. Contents are compared by digest, taken
+    from ``manifest`` for files it knows.
+
+    Args:
+        path: File to write
+        content: New content
+        manifest: Manifest of the directory the file is in (optional)
+
+    Returns:
+        True if the file was written
+    """
+    digest = _digest(content.encode())
+    if manifest is not None:
+        if manifest.unchanged(path, digest):
+            return False
+    elif file_digest(path) == digest:
+        return False
+    path.write_text(content)
+    if manifest is not None:
+        manifest.record(path, digest)
+    return True
+
+
+class ArtifactWriter:
+    """Write an artifact line by line through a temporary file.
+
+    Lines are joined with newlines as they arrive, so an artifact never has
+    to be built as one string. On a clean exit the temporary file replaces
+    the artifact, unless the artifact already has content with the same
+    digest (its mtime is then kept, as with ``write_if_changed``). If the
+    block raises, the temporary file is removed and the artifact is left as
+    it was.
+    """
+
+    def __init__(self, path: Path, manifest: ArtifactManifest | None = None):
+        """Initialize writer.
+
+        Args:
+            path: Artifact to write
+            manifest: Manifest of the artifact's directory (optional)
+        """
+        self.path = path
+        self.manifest = manifest
+        self.written = False
+        self._tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{id(self):x}.tmp")
+        self._file: TextIO | None = None
+        self._first = True
+
+    def __enter__(self) -> "ArtifactWriter":
+        self._file = open(self._tmp_path, "w")
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def write(self, line: str) -> None:
+        """Append a line."""
+        if self._file is None:
+            raise RuntimeError("ArtifactWriter used outside a with block")
+        if self._first:
+            self._first = False
+        else:
+            self._file.write("\n")
+        self._file.write(line)
+
+    def write_lines(self, lines: Iterable[str]) -> None:
+        """Append lines."""
+        for line in lines:
+            self.write(line)
+
+    def commit(self) -> bool:
+        """Move the written content into place.
+
+        Returns:
+            True if the artifact was written, False if it already had this
+            content
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        try:
+            # Hashing the finished file in one pass is cheaper than per line
+            digest = file_digest(self._tmp_path)
+            assert digest is not None
+            if self.manifest is not None:
+                unchanged = self.manifest.unchanged(self.path, digest)
+            else:
+                unchanged = file_digest(self.path) == digest
+            if unchanged:
+                self._tmp_path.unlink()
+                return False
+            os.chmod(self._tmp_path, replacement_mode(self.path))
+            os.replace(self._tmp_path, self.path)
+        except BaseException:
+            self._tmp_path.unlink(missing_ok=True)
+            raise
+        if self.manifest is not None:
+            self.manifest.record(self.path, digest)
+        self.written = True
+        return True
+
+    def discard(self) -> None:
+        """Drop the written content."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class ArtifactWriteError(Exception):
+    """Writing one or more artifacts failed.
+
+    Attributes:
+        errors: Artifact name -> exception, in artifact order
+    """
+
+    def __init__(self, errors: dict[str, Exception]):
+        """Initialize error.
+
+        Args:
+            errors: Artifact name -> exception, in artifact order
+        """
+        self.errors = errors
+        details = "; ".join(f"{name}: {type(e).__name__}: {e}" for name, e in errors.items())
+        super().__init__(f"Failed to write {len(errors)} artifact(s): {details}")
+
+
+def run_writes(tasks: dict[str, Callable[[], bool]], workers: int = 1) -> dict[str, bool]:
+    """Render and write artifacts, optionally on a thread pool.
+
+    Every task runs even if others fail. Results are returned in task order
+    whatever order the tasks finish in, so reports and returned mappings do
+    not depend on ``workers``.
+
+    Args:
+        tasks: Artifact name -> function that writes it and returns whether
+            the file was written (False if its content was unchanged)
+        workers: Threads to use; with 1, tasks run one after another
+
+    Returns:
+        Artifact name -> whether it was written, in task order
+
+    Raises:
+        ArtifactWriteError: If any task failed, listing every failure
+    """
+    errors: dict[str, Exception] = {}
+    written: dict[str, bool] = {}
+
+    if workers > 1 and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            futures = {name: pool.submit(task) for name, task in tasks.items()}
+        for name, future in futures.items():
+            error = future.exception()
+            if error is None:
+                written[name] = future.result()
+            elif isinstance(error, Exception):
+                errors[name] = error
+            else:
+                raise error
+    else:
+        for name, task in tasks.items():
+            try:
+                written[name] = task()
+            except Exception as e:
+                errors[name] = e
+
+    if errors:
+        raise ArtifactWriteError(errors) from next(iter(errors.values()))
+    return written
 
 
 class OutputGenerator:
-    """Generates spec and test output artifacts."""
+    """Generates spec and test output artifacts.
+
+    Artifacts whose content is unchanged are not rewritten; ``report``
+    records which ones were written and which were skipped.
+    """
 
     def __init__(
         self,
         result: dict[str, Any],
         policy: PolicyConfig,
         output_dir: Path,
+        manifest: ArtifactManifest | None = None,
+        workers: int | None = None,
     ):
-        """Initialize output generator."""
+        """Initialize output generator.
+
+        Args:
+            result: Generation result
+            policy: Policy configuration
+            output_dir: Directory for output files
+            manifest: Artifact manifest of ``output_dir`` to share (default:
+                loaded from ``output_dir``)
+            workers: Threads ``generate_all`` renders and writes artifacts on
+                (default: the policy's ``output.workers``, 1 if unset)
+        """
         self.result = result
         self.policy = policy
         self.output_dir = output_dir
+        self.manifest = manifest if manifest is not None else ArtifactManifest(output_dir)
+        self.workers = workers if workers is not None else policy.get("output.workers", 1)
+        self.report = WriteReport()
+
+    def generate_all(self, gherkin: bool = False) -> dict[str, Path]:
+        """Generate all artifacts.
+
+        With more than one worker, the artifacts are rendered and written
+        concurrently. The files, the returned mapping and ``report`` are the
+        same either way.
+
+        Args:
+            gherkin: Also write a Gherkin .feature file per feature area,
+                under ``features/``
+
+        Returns:
+            Dict mapping artifact names to file paths
+
+        Raises:
+            ArtifactWriteError: If any artifact could not be written; the
+                others are still written
+        """
+        tasks: dict[str, Callable[[], bool]] = {
+            "REQUIREMENTS.md": self._generate_requirements,
+            "TEST_PLAN.md": self._generate_test_plan,
+            "TEST_CASES.md": self._generate_test_cases,
+            "TRACEABILITY.csv": self._generate_traceability,
+        }
+        if gherkin:
+            from .gherkin import GherkinGenerator
+
+            features = GherkinGenerator(self.result, self.output_dir, self.manifest)
+            tasks.update(features.write_tasks())
+
+        try:
+            written = run_writes(tasks, self.workers)
+        finally:
+            # Keep the digests of the artifacts that were written
+            self.manifest.save()
 
-    def generate_all(self) -> dict[str, Path]:
-        """Generate all artifacts."""
         artifacts = {}
+        for name, was_written in written.items():
+            artifacts[name] = self.output_dir / name
+            self.report.add(artifacts[name], was_written)
+        return artifacts
 
-        artifacts["REQUIREMENTS.md"] = self._generate_requirements()
-        artifacts["TEST_PLAN.md"] = self._generate_test_plan()
-        artifacts["TEST_CASES.md"] = self._generate_test_cases()
-        artifacts["TRACEABILITY.csv"] = self._generate_traceability()
+    def generate_stream(self, items: Iterable[GeneratedRequirement]) -> dict[str, Path]:
+        """Generate all artifacts from a requirement stream in one pass.
 
+        Each requirement, test case and traceability row is written as it
+        arrives, so memory use does not grow with the spec. Requirements of
+        one feature area must arrive together. Blocks an item already has
+        rendered are written as they are. The test plan, open questions and
+        assumptions are taken from the result this generator was created
+        with.
+
+        Args:
+            items: Requirements with their test cases and traceability
+                entries, e.g. a ``GenerationStream``
+
+        Returns:
+            Dict mapping artifact names to file paths
+        """
+        artifacts = {
+            name: self.output_dir / name
+            for name in ("REQUIREMENTS.md", "TEST_PLAN.md", "TEST_CASES.md", "TRACEABILITY.csv")
+        }
+
+        with (
+            ArtifactWriter(artifacts["REQUIREMENTS.md"], self.manifest) as requirements,
+            ArtifactWriter(artifacts["TEST_CASES.md"], self.manifest) as test_cases,
+            ArtifactWriter(artifacts["TRACEABILITY.csv"], self.manifest) as traceability,
+        ):
+            self._write_requirements_header(requirements)
+            test_cases.write_lines(["# Test Cases", ""])
+            traceability.write(TRACEABILITY_HEADER)
+
+            area = None
+            for item in items:
+                area = self._write_requirement(
+                    requirements, item.requirement, area, item.requirement_markdown()
+                )
+                for block in item.test_case_markdown():
+                    test_cases.write_lines([block, ""])
+                for entry in item.traceability:
+                    traceability.write(entry.to_csv_row())
+
+        for writer in (requirements, test_cases, traceability):
+            self.report.add(writer.path, writer.written)
+        self.report.add(artifacts["TEST_PLAN.md"], self._generate_test_plan())
+        self.manifest.save()
         return artifacts
 
-    def _generate_requirements(self) -> Path:
-        """Generate REQUIREMENTS.md."""
-        requirements: list[Requirement] = self.result["requirements"]
+    def _write_requirements_header(self, writer: ArtifactWriter) -> None:
+        """Write the title, assumptions and open questions of REQUIREMENTS.md."""
         open_questions: list[str] = self.result.get("open_questions", [])
         assumptions: list[str] = self.result.get("assumptions", [])
 
-        lines = ["# Requirements", ""]
+        writer.write_lines(["# Requirements", ""])
 
         # Assumptions section
         if assumptions:
-            lines.extend(["## Assumptions"])
+            writer.write("## Assumptions")
             for assumption in assumptions:
-                lines.append(f"- {assumption}")
-            lines.append("")
+                writer.write(f"- {assumption}")
+            writer.write("")
 
         # Open questions section
         if open_questions:
-            lines.extend(["## Open Questions"])
+            writer.write("## Open Questions")
             for question in open_questions:
-                lines.append(f"- {question}")
-            lines.append("")
+                writer.write(f"- {question}")
+            writer.write("")
+
+    def _write_requirement(
+        self,
+        writer: ArtifactWriter,
+        req: Requirement,
+        area: str | None,
+        markdown: str | None = None,
+    ) -> str:
+        """Write a requirement, starting a feature section when its area changes.
+
+        Args:
+            writer: REQUIREMENTS.md writer
+            req: Requirement to write
+            area: Feature area of the previous requirement
+            markdown: The requirement's rendered block, if already rendered
+
+        Returns:
+            The requirement's feature area
+        """
+        req_area = req.feature_area or "General"
+        if req_area != area:
+            writer.write_lines([f"## Feature: {req_area}", ""])
+        writer.write_lines([markdown if markdown is not None else req.to_markdown(), ""])
+        return req_area
+
+    def _generate_requirements(self) -> bool:
+        """Generate REQUIREMENTS.md.
+
+        Returns:
+            True if the file was written
+        """
+        requirements: list[Requirement] = self.result["requirements"]
 
         # Group requirements by feature area
+        area: str | None
         by_area: dict[str, list[Requirement]] = {}
         for req in requirements:
             area = req.feature_area or "General"
             by_area.setdefault(area, []).append(req)
 
-        for area, reqs in by_area.items():
-            lines.extend([f"## Feature: {area}", ""])
-            for req in reqs:
-                lines.append(req.to_markdown())
-                lines.append("")
-
-        content = "\n".join(lines)
         path = self.output_dir / "REQUIREMENTS.md"
-        path.write_text(content)
-        return path
+        with ArtifactWriter(path, self.manifest) as writer:
+            self._write_requirements_header(writer)
+            for reqs in by_area.values():
+                area = None
+                for req in reqs:
+                    area = self._write_requirement(writer, req, area)
+        return writer.written
+
+    def _generate_test_plan(self) -> bool:
+        """Generate TEST_PLAN.md.
 
-    def _generate_test_plan(self) -> Path:
-        """Generate TEST_PLAN.md."""
+        Returns:
+            True if the file was written
+        """
         test_plan: TestPlan = self.result["test_plan"]
 
         content = test_plan.to_markdown()
         path = self.output_dir / "TEST_PLAN.md"
-        path.write_text(content)
-        return path
+        return write_if_changed(path, content, self.manifest)
 
-    def _generate_test_cases(self) -> Path:
-        """Generate TEST_CASES.md."""
-        test_cases: list[TestCase] = self.result["test_cases"]
-
-        lines = ["# Test Cases", ""]
+    def _generate_test_cases(self) -> bool:
+        """Generate TEST_CASES.md.
 
-        for test in test_cases:
-            lines.append(test.to_markdown())
-            lines.append("")
+        Returns:
+            True if the file was written
+        """
+        test_cases: list[TestCase] = self.result["test_cases"]
 
-        content = "\n".join(lines)
         path = self.output_dir / "TEST_CASES.md"
-        path.write_text(content)
-        return path
+        with ArtifactWriter(path, self.manifest) as writer:
+            writer.write_lines(["# Test Cases", ""])
+            for test in test_cases:
+                writer.write_lines([test.to_markdown(), ""])
+        return writer.written
 
-    def _generate_traceability(self) -> Path:
-        """Generate TRACEABILITY.csv."""
-        entries: list[TraceabilityEntry] = self.result["traceability"]
+    def _generate_traceability(self) -> bool:
+        """Generate TRACEABILITY.csv.
 
-        lines = ["REQ_ID,TEST_ID,TYPE,PRIORITY"]
-        for entry in entries:
-            lines.append(entry.to_csv_row())
+        Returns:
+            True if the file was written
+        """
+        entries: list[TraceabilityEntry] = self.result["traceability"]
 
-        content = "\n".join(lines)
         path = self.output_dir / "TRACEABILITY.csv"
-        path.write_text(content)
-        return path
+        with ArtifactWriter(path, self.manifest) as writer:
+            writer.write(TRACEABILITY_HEADER)
+            for entry in entries:
+                writer.write(entry.to_csv_row())
+        return writer.written
@@ -0,0 +1,192 @@
+"""Shared cache of parsed PRDs, keyed by file version."""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+from .atomic import atomic_write
+from .headings import HeadingTree
+from .parser import ParsedPRD, PRDParser
+
+# Bump when parsing rules change, to invalidate on-disk entries
+PARSE_CACHE_VERSION = 2
+
+# Resolved path, then the parser options that affect the result
+CacheKey = tuple[str, bool, bool, bool]
+
+
+@dataclass
+class _Entry:
+    """A cached parse of one file version, with the parser's section layout."""
+
+    stamp: tuple[int, int, int]
+    digest: str
+    parsed: ParsedPRD
+    headings: HeadingTree | None
+    section_offsets: dict[str, tuple[int, int]]
+
+
+def _copy(parsed: ParsedPRD) -> ParsedPRD:
+    """Copy a ParsedPRD so callers cannot mutate the cached one."""
+    return replace(
+        parsed,
+        functional_requirements=list(parsed.functional_requirements),
+        non_functional_requirements=list(parsed.non_functional_requirements),
+        non_goals=list(parsed.non_goals),
+        notes=list(parsed.notes),
+        assumptions=list(parsed.assumptions),
+        section_hashes=dict(parsed.section_hashes),
+    )
+
+
+class ParseCache:
+    """LRU cache of ParsedPRD results shared by every PRDParser that uses it.
+
+    Entries are keyed by resolved path and parser options. A cached parse is
+    reused while the file's (inode, size, mtime) stamp is unchanged; if the
+    stamp changed but the BLAKE2b digest of the content did not (e.g. after a
+    touch or checkout), the entry is revalidated without parsing.
+
+    A hit also sets the parser's ``headings`` and ``section_offsets``, as a
+    parse would; the heading tree is shared between parsers.
+
+    With a ``directory``, parses are also stored on disk keyed by content
+    digest, so separate processes (CI steps, batch workers) share them too.
+    """
+
+    def __init__(self, maxsize: int = 32, directory: str | Path | None = None):
+        """Initialize cache.
+
+        Args:
+            maxsize: Parses to keep in memory, and files to keep on disk
+            directory: Directory for on-disk entries (default: memory only)
+        """
+        self.maxsize = maxsize
+        self.directory = Path(directory) if directory is not None else None
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def parse(self, parser: PRDParser) -> ParsedPRD:
+        """Get the parse of a parser's file, parsing it only on a miss.
+
+        Args:
+            parser: Parser whose file and options to use
+
+        Returns:
+            A copy of the cached parse
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        path = parser.prd_path
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"PRD file not found: {path}") from None
+        stamp = (st.st_ino, st.st_size, st.st_mtime_ns)
+        key = (str(path.resolve()), parser.streaming, parser.keep_raw_content, parser.use_mmap)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stamp == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._restore(parser, entry)
+
+        digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+        if entry is not None and entry.digest == digest:
+            entry = replace(entry, stamp=stamp)
+            self.hits += 1
+        else:
+            cached = self._load(digest, key)
+            if cached is not None:
+                parsed = cached
+                # On-disk entries hold no layout
+                parser.locate_sections()
+                self.hits += 1
+            else:
+                parsed = parser.parse_file()
+                self.misses += 1
+                self._store(digest, key, parsed)
+            entry = _Entry(stamp, digest, parsed, parser.headings, dict(parser.section_offsets))
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return self._restore(parser, entry)
+
+    @staticmethod
+    def _restore(parser: PRDParser, entry: _Entry) -> ParsedPRD:
+        """Give a parser the entry's section layout and a copy of its parse."""
+        parser.headings = entry.headings
+        parser.section_offsets = dict(entry.section_offsets)
+        return _copy(entry.parsed)
+
+    def clear(self) -> None:
+        """Drop all in-memory entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def _disk_path(self, digest: str, key: CacheKey) -> Path:
+        assert self.directory is not None
+        options = "".join(str(int(option)) for option in key[1:])
+        return self.directory / f"{digest}-{options}.json"
+
+    def _load(self, digest: str, key: CacheKey) -> ParsedPRD | None:
+        """Read an on-disk entry, marking it recently used."""
+        if self.directory is None:
+            return None
+        path = self._disk_path(digest, key)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if data.get("version") != PARSE_CACHE_VERSION:
+            return None
+        os.utime(path)
+        return ParsedPRD(**data["parsed"])
+
+    def _store(self, digest: str, key: CacheKey, parsed: ParsedPRD) -> None:
+        """Write an on-disk entry atomically and evict the least recently used."""
+        if self.directory is None:
+            return
+        atomic_write(
+            self._disk_path(digest, key),
+            json.dumps({"version": PARSE_CACHE_VERSION, "parsed": asdict(parsed)}),
+        )
+
+        files = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime_ns)
+        for stale in files[: max(0, len(files) - self.maxsize)]:
+            stale.unlink(missing_ok=True)
+
+
+# Process-wide in-memory cache, plus one per on-disk directory
+_default_cache = ParseCache()
+_directory_caches: dict[Path, ParseCache] = {}
+
+
+def get_parse_cache(directory: str | Path | None = None) -> ParseCache:
+    """Get the process-wide parse cache.
+
+    Args:
+        directory: Also persist parses in this directory
+
+    Returns:
+        The shared cache for the directory (or the in-memory one)
+    """
+    if directory is None:
+        return _default_cache
+    resolved = Path(directory).resolve()
+    cache = _directory_caches.get(resolved)
+    if cache is None:
+        cache = _directory_caches.setdefault(resolved, ParseCache(directory=resolved))
+    return cache
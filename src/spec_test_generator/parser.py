@@ -1,8 +1,20 @@
 """PRD and input document parser."""
 
+import functools
+import hashlib
+import json
+import mmap
 import re
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .atomic import atomic_write
+from .headings import Heading, HeadingTree, build_heading_tree, normalize_heading
+
+if TYPE_CHECKING:
+    from .parse_cache import ParseCache
 
 
 @dataclass
@@ -17,111 +29,462 @@ class ParsedPRD:
     notes: list[str] = field(default_factory=list)
     assumptions: list[str] = field(default_factory=list)
     raw_content: str = ""
+    # Section name -> content digest, when parsed with a section cache.
+    # Repeated headings are keyed "Name (2)", "Name (3)", ...
+    section_hashes: dict[str, str] = field(default_factory=dict)
+
+
+# Heading line read in streaming mode: # Title, ## Section, ### or #### subsection
+_HEADING_LINE_RE = re.compile(r"(#{1,4})\s+(.+)")
+
+# Numbered (1) item, 1. item) or bullet (- item, * item) list item
+_LIST_ITEM_RE = re.compile(r"\s*(?:\d+[.)]\s*|[-*]\s+)(.+)")
+
+# ASCII characters a list item line can start with; other characters only
+# if they are whitespace or digits
+_LIST_ITEM_FIRST_CHARS = frozenset("-*0123456789 \t")
+
+# The same list items, found across a whole section at once. Whitespace
+# excludes \n so matches never span lines.
+_LIST_ITEM_LINE_RE = re.compile(r"^[^\S\n]*(?:\d+[.)][^\S\n]*|[-*][^\S\n]+)(.+)$", re.MULTILINE)
+
+# The bytes form, applied directly to a memory mapping. Bytes patterns only
+# know ASCII digits and whitespace, so group 1 captures items with an ASCII
+# marker, and lines whose marker has a non-ASCII or control byte (such as
+# "١. item") are matched whole, to be decoded and checked with
+# _LIST_ITEM_LINE_RE.
+_LIST_ITEM_BYTES_RE = re.compile(
+    rb"^(?:[ \t\r\f\v]*(?:[0-9]+[.)][ \t\r\f\v]*|[-*][ \t\r\f\v]+)(.+)"
+    rb"|[-*0-9 \t\r\f\v]*[\x1c-\x1f\x80-\xff].*)$",
+    re.MULTILINE,
+)
+
+# Sidecar cache of extracted section items, written to the parser's cache_dir
+SECTION_CACHE_FILE = ".prdcache.json"
+
+# Bump when list item extraction changes, to invalidate existing caches
+SECTION_CACHE_VERSION = 2
+
+# ParsedPRD list fields filled from list items, by section kind
+LIST_FIELDS = (
+    "functional_requirements",
+    "non_functional_requirements",
+    "non_goals",
+    "notes",
+    "assumptions",
+)
+
+
+# Section kind of common headings, by normalized name. Other headings are
+# classified by keyword (see _classify_by_keywords).
+_SECTION_KINDS: dict[str, str | None] = {
+    "goal": "goal",
+    "goals": "goal",
+    "objective": "goal",
+    "objectives": "goal",
+    "functional requirements": "functional_requirements",
+    "non-functional requirements": "non_functional_requirements",
+    "nfr": "non_functional_requirements",
+    "nfrs": "non_functional_requirements",
+    "non-goals": "non_goals",
+    "non-goal": "non_goals",
+    "out of scope": "non_goals",
+    "notes": "notes",
+    "note": "notes",
+    "assumptions": "assumptions",
+    "requirements": "requirements",
+    "overview": None,
+    "background": None,
+    "context": None,
+    "summary": None,
+}
+
+
+def classify_section(name: str) -> str | None:
+    """Get the ParsedPRD field a section feeds, from its heading.
+
+    Common headings are a dictionary lookup on the normalized name; others
+    fall back to keyword matching, memoized per name.
+
+    Args:
+        name: Section heading text
+
+    Returns:
+        "goal", one of LIST_FIELDS, "requirements" for a generic requirements
+        section whose items extend functional_requirements, or None
+    """
+    normalized = normalize_heading(name)
+    if normalized in _SECTION_KINDS:
+        return _SECTION_KINDS[normalized]
+    return _classify_by_keywords(normalized)
+
+
+@functools.lru_cache(maxsize=1024)
+def _classify_by_keywords(section_lower: str) -> str | None:
+    """Classify a lowercased heading by the keywords it contains."""
+    if ("goal" in section_lower or "objective" in section_lower) and "non" not in section_lower:
+        return "goal"
+    if "functional" in section_lower and "non" not in section_lower:
+        return "functional_requirements"
+    if "non-functional" in section_lower or "nfr" in section_lower:
+        return "non_functional_requirements"
+    if "non-goal" in section_lower or "out of scope" in section_lower:
+        return "non_goals"
+    if "note" in section_lower:
+        return "notes"
+    if "assumption" in section_lower:
+        return "assumptions"
+    if "requirement" in section_lower:
+        return "requirements"
+    return None
 
 
 class PRDParser:
     """Parser for PRD markdown documents."""
 
-    def __init__(self, prd_path: str | Path):
-        """Initialize parser with PRD path."""
+    def __init__(
+        self,
+        prd_path: str | Path,
+        streaming: bool = False,
+        keep_raw_content: bool | None = None,
+        cache_dir: str | Path | None = None,
+        parse_cache: "ParseCache | None" = None,
+        use_mmap: bool = False,
+    ):
+        """Initialize parser with PRD path.
+
+        Args:
+            prd_path: Path to PRD markdown file
+            streaming: Read the file line by line and classify headers and list
+                items in a single pass instead of loading it whole. Only the
+                text of goal sections is buffered, so memory stays flat for
+                very large documents.
+            keep_raw_content: Fill ``ParsedPRD.raw_content`` (default: only
+                when not streaming)
+            cache_dir: Directory for a .prdcache.json sidecar holding each
+                ``##`` section's extracted items keyed by a digest of its
+                content. On the next parse only sections whose content
+                changed are re-extracted. Not used in streaming mode.
+            parse_cache: Shared cache to reuse a parse of the same file
+                version (see ``get_parse_cache``)
+            use_mmap: Memory-map the file (UTF-8) and locate sections as
+                (start, end) byte offsets instead of decoding it whole. Only
+                headings, list items and the goal are decoded;
+                ``section_text`` decodes other sections on demand.
+                ``raw_content`` is kept only if requested.
+        """
         self.prd_path = Path(prd_path)
+        self.streaming = streaming
+        self.use_mmap = use_mmap
+        if keep_raw_content is None:
+            keep_raw_content = not (streaming or use_mmap)
+        self.keep_raw_content = keep_raw_content
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.parse_cache = parse_cache
         self._parsed: ParsedPRD | None = None
 
+        # Section cache for this document: digest -> items, loaded and used ones
+        self._cached_items: dict[str, list[str]] | None = None
+        self._used_items: dict[str, list[str]] = {}
+        self.reparsed_sections: list[str] = []
+
+        # Heading tree and ## section name -> (start, end) content offsets,
+        # from the last parse (bytes when memory-mapped, else characters)
+        self.headings: HeadingTree | None = None
+        self.section_offsets: dict[str, tuple[int, int]] = {}
+
     def parse(self) -> ParsedPRD:
         """Parse the PRD file."""
         if self._parsed is not None:
             return self._parsed
 
+        if self.parse_cache is not None:
+            self._parsed = self.parse_cache.parse(self)
+        else:
+            self._parsed = self.parse_file()
+        return self._parsed
+
+    def parse_file(self) -> ParsedPRD:
+        """Parse the PRD file, bypassing any parse cache."""
         if not self.prd_path.exists():
             raise FileNotFoundError(f"PRD file not found: {self.prd_path}")
 
-        content = self.prd_path.read_text()
-        self._parsed = self._parse_content(content)
-        return self._parsed
+        if self.streaming:
+            with open(self.prd_path) as f:
+                return self._parse_stream(f)
+
+        if self.cache_dir is not None:
+            self._cached_items = self._load_section_cache()
+
+        parsed = self._parse_mapped_file() if self.use_mmap else None
+        if parsed is None:
+            parsed = self._parse_content(self.prd_path.read_text())
+        if self._cached_items is not None and self._used_items != self._cached_items:
+            self._save_section_cache()
+        if not self.keep_raw_content:
+            parsed.raw_content = ""
+        return parsed
+
+    def _parse_stream(self, lines: Iterable[str]) -> ParsedPRD:
+        """Parse PRD markdown line by line.
+
+        A small state machine tracks the current ``##`` section and its kind;
+        list items are extracted as their lines are read and applied when the
+        section ends, so no section text is kept except for goal sections.
+        ``###`` and ``####`` subsections stay part of their section, and an
+        H1 ends it, as in the heading tree.
+        """
+        result = ParsedPRD()
+        raw: list[str] | None = [] if self.keep_raw_content else None
+
+        kind: str | None = None
+        items: list[str] = []
+        goal_lines: list[str] = []
+
+        for line in lines:
+            if raw is not None:
+                raw.append(line)
+            line = line.rstrip("\n")
+
+            heading_match = _HEADING_LINE_RE.match(line) if line.startswith("#") else None
+            if heading_match and len(heading_match.group(1)) <= 2:
+                self._apply_section(result, kind, items, "\n".join(goal_lines))
+                heading = heading_match.group(2).strip()
+                if len(heading_match.group(1)) == 1:
+                    result.title = result.title or heading
+                    kind = None
+                else:
+                    kind = classify_section(heading)
+                items = []
+                goal_lines = []
+                continue
+
+            if kind == "goal":
+                goal_lines.append(line)
+            elif kind is not None:
+                item = self._list_item(line)
+                if item is not None:
+                    items.append(item)
+
+        self._apply_section(result, kind, items, "\n".join(goal_lines))
+        if raw is not None:
+            result.raw_content = "".join(raw)
+        return result
+
+    @staticmethod
+    def _apply_section(result: ParsedPRD, kind: str | None, items: list[str], goal: str) -> None:
+        """Add a section's content to the ParsedPRD field it feeds.
+
+        Repeated sections of a kind accumulate in document order: items are
+        appended and goal paragraphs joined.
+        """
+        if kind == "goal":
+            goal = goal.strip()
+            if goal:
+                result.goal = f"{result.goal}\n\n{goal}" if result.goal else goal
+        elif kind == "requirements":
+            result.functional_requirements.extend(items)
+        elif kind is not None:
+            getattr(result, kind).extend(items)
 
     def _parse_content(self, content: str) -> ParsedPRD:
         """Parse PRD markdown content."""
         result = ParsedPRD(raw_content=content)
-
-        # Extract title from first H1
-        title_match = re.search(r"^#\s+(.+)$", content, re.MULTILINE)
-        if title_match:
-            result.title = title_match.group(1).strip()
-
-        # Split into sections
-        sections = self._split_sections(content)
-
-        for section_name, section_content in sections.items():
-            section_lower = section_name.lower()
-
-            if (
-                "goal" in section_lower or "objective" in section_lower
-            ) and "non" not in section_lower:
-                result.goal = section_content.strip()
-
-            elif "functional" in section_lower and "non" not in section_lower:
-                result.functional_requirements = self._extract_list_items(section_content)
-
-            elif "non-functional" in section_lower or "nfr" in section_lower:
-                result.non_functional_requirements = self._extract_list_items(section_content)
-
-            elif "non-goal" in section_lower or "out of scope" in section_lower:
-                result.non_goals = self._extract_list_items(section_content)
-
-            elif "note" in section_lower:
-                result.notes = self._extract_list_items(section_content)
-
-            elif "assumption" in section_lower:
-                result.assumptions = self._extract_list_items(section_content)
-
-            elif "requirement" in section_lower:
-                # Generic requirements section
-                items = self._extract_list_items(section_content)
-                result.functional_requirements.extend(items)
-
+        self._parse_sections(result, content, build_heading_tree(content))
         return result
 
-    def _split_sections(self, content: str) -> dict[str, str]:
-        """Split content into sections by headers."""
-        sections: dict[str, str] = {}
-        current_section = "preamble"
-        current_content: list[str] = []
-
-        for line in content.split("\n"):
-            header_match = re.match(r"^##\s+(.+)$", line)
-            if header_match:
-                if current_content:
-                    sections[current_section] = "\n".join(current_content)
-                current_section = header_match.group(1).strip()
-                current_content = []
-            else:
-                current_content.append(line)
-
-        if current_content:
-            sections[current_section] = "\n".join(current_content)
-
+    def _parse_sections(self, result: ParsedPRD, text: str | mmap.mmap, tree: HeadingTree) -> None:
+        """Fill a ParsedPRD from the ``##`` sections of a heading tree.
+
+        Each section covers its ``###``/``####`` subsections. List items are
+        found across the section's span of ``text`` without splitting it
+        into lines.
+        """
+        sections = self._locate_sections(tree)
+
+        h1 = tree.level(1)
+        if h1:
+            result.title = h1[0].title
+
+        def extract(start: int, end: int) -> list[str]:
+            if isinstance(text, str):
+                return self._extract_list_items(text, start, end)
+            items = []
+            for m in _LIST_ITEM_BYTES_RE.finditer(text, start, end):
+                if m.group(1) is not None:
+                    items.append(m.group(1).decode().strip())
+                elif item_match := _LIST_ITEM_LINE_RE.match(m.group().decode()):
+                    items.append(item_match.group(1).strip())
+            return items
+
+        for name, node in sections:
+            start, end = node.content_start, node.end
+            kind = classify_section(node.title)
+            digest = None
+            if self._cached_items is not None:
+                if isinstance(text, str):
+                    digest = hashlib.blake2b(text[start:end].encode(), digest_size=16).hexdigest()
+                else:
+                    with memoryview(text) as view:
+                        digest = hashlib.blake2b(view[start:end], digest_size=16).hexdigest()
+                result.section_hashes[name] = digest
+
+            if kind == "goal":
+                goal = text[start:end]
+                if isinstance(goal, bytes):
+                    goal = goal.decode().replace("\r\n", "\n")
+                self._apply_section(result, kind, [], goal)
+            elif kind is not None:
+                items = self._section_items(name, digest, functools.partial(extract, start, end))
+                self._apply_section(result, kind, items, "")
+
+    def _locate_sections(self, tree: HeadingTree) -> list[tuple[str, Heading]]:
+        """Set ``headings`` and ``section_offsets`` from a heading tree.
+
+        Returns:
+            (name, heading) of each ``##`` section; repeated headings are
+            named "Name (2)", ...
+        """
+        self.headings = tree
+        self.section_offsets = {}
+        sections = []
+        occurrences: dict[str, int] = {}
+        for node in tree.level(2):
+            occurrences[node.title] = occurrences.get(node.title, 0) + 1
+            count = occurrences[node.title]
+            name = node.title if count == 1 else f"{node.title} ({count})"
+            self.section_offsets[name] = (node.content_start, node.end)
+            sections.append((name, node))
         return sections
 
-    def _extract_list_items(self, content: str) -> list[str]:
-        """Extract list items from content."""
-        items = []
-
-        # Match numbered lists: 1) item or 1. item
-        numbered_pattern = r"^\s*\d+[.)]\s*(.+)$"
-
-        # Match bullet lists: - item or * item
-        bullet_pattern = r"^\s*[-*]\s+(.+)$"
-
-        for line in content.split("\n"):
-            numbered_match = re.match(numbered_pattern, line)
-            bullet_match = re.match(bullet_pattern, line)
+    def locate_sections(self) -> None:
+        """Set ``headings`` and ``section_offsets`` without extracting any items.
+
+        For a parse reused from a cache that does not hold them. Streaming
+        parses locate no sections, so this is a no-op in streaming mode.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        if self.streaming:
+            return
+        # Byte offsets when memory-mapped, else character offsets, as in a parse
+        text: str | bytes = (
+            self.prd_path.read_bytes() if self.use_mmap else self.prd_path.read_text()
+        )
+        self._locate_sections(build_heading_tree(text))
+
+    def _parse_mapped_file(self) -> ParsedPRD | None:
+        """Parse the file through a read-only memory mapping.
+
+        Returns:
+            The parse, or None for an empty file, which cannot be mapped
+        """
+        with open(self.prd_path, "rb") as f:
+            try:
+                buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return None
+            try:
+                return self._parse_mapped(buf)
+            finally:
+                buf.close()
+
+    def _parse_mapped(self, buf: mmap.mmap) -> ParsedPRD:
+        """Parse PRD markdown from a mapped buffer, section by byte offsets."""
+        result = ParsedPRD()
+        if self.keep_raw_content:
+            result.raw_content = buf[:].decode().replace("\r\n", "\n")
+        self._parse_sections(result, buf, build_heading_tree(buf))
+        return result
 
-            if numbered_match:
-                items.append(numbered_match.group(1).strip())
-            elif bullet_match:
-                items.append(bullet_match.group(1).strip())
+    def section_text(self, name: str) -> str:
+        """Read one section's content from a memory-mapped parse.
+
+        Args:
+            name: Section heading text, as keyed in ``section_offsets``
+
+        Returns:
+            The section's content, decoded on demand
+
+        Raises:
+            KeyError: If the parse located no such section
+        """
+        start, end = self.section_offsets[name]
+        with open(self.prd_path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start).decode().replace("\r\n", "\n")
+
+    def _section_items(
+        self, name: str, digest: str | None, extract: Callable[[], list[str]]
+    ) -> list[str]:
+        """Extract a section's list items, reusing cached items for unchanged content."""
+        if self._cached_items is None or digest is None:
+            return extract()
+
+        items = self._cached_items.get(digest)
+        if items is None:
+            items = extract()
+            self.reparsed_sections.append(name)
+        self._used_items[digest] = items
+        return list(items)
 
-        return items
+    @property
+    def _cache_path(self) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / SECTION_CACHE_FILE
+
+    def _cache_document_key(self) -> str:
+        return str(self.prd_path.resolve())
+
+    def _read_cache_file(self) -> dict[str, Any]:
+        """Read the sidecar cache, treating a missing, corrupt or outdated one as empty."""
+        try:
+            with open(self._cache_path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != SECTION_CACHE_VERSION:
+            return {}
+        return data
+
+    def _load_section_cache(self) -> dict[str, list[str]]:
+        """Load this document's cached section items."""
+        documents = self._read_cache_file().get("documents", {})
+        return dict(documents.get(self._cache_document_key(), {}))
+
+    def _save_section_cache(self) -> None:
+        """Store the sections of this parse, dropping ones no longer present.
+
+        Entries for other documents sharing the cache directory are kept.
+        """
+        data = self._read_cache_file()
+        documents = data.get("documents", {})
+        documents[self._cache_document_key()] = self._used_items
+
+        atomic_write(
+            self._cache_path, json.dumps({"version": SECTION_CACHE_VERSION, "documents": documents})
+        )
+
+    @staticmethod
+    def _extract_list_items(content: str, start: int = 0, end: int | None = None) -> list[str]:
+        """Extract list items from content, or from its ``start:end`` span."""
+        if end is None:
+            end = len(content)
+        return [m.group(1).strip() for m in _LIST_ITEM_LINE_RE.finditer(content, start, end)]
+
+    @staticmethod
+    def _list_item(line: str) -> str | None:
+        """Get the text of a numbered or bullet list item line, if it is one."""
+        # Reject prose lines on their first character, without any regex work
+        if not line:
+            return None
+        first = line[0]
+        if first not in _LIST_ITEM_FIRST_CHARS and not (first.isspace() or first.isdecimal()):
+            return None
+
+        item_match = _LIST_ITEM_RE.match(line)
+        return item_match.group(1).strip() if item_match else None
 
     @property
     def parsed(self) -> ParsedPRD:
@@ -0,0 +1,357 @@
+"""Long-running generation server with warm policies, ID maps and parse caches."""
+
+import json
+import os
+import socketserver
+import sys
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TextIO
+
+from . import __version__
+from .generator import SpecTestGenerator, create_id_manager, load_policy, result_to_dict
+from .id_manager import IDManager
+from .models import PolicyConfig
+from .parse_cache import get_parse_cache
+
+# JSON-RPC 2.0 error codes; the server errors mirror the CLI exit codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+FILE_NOT_FOUND = -32002
+GENERATION_ERROR = -32003
+
+
+class RPCError(Exception):
+    """Error reported to the client as a JSON-RPC error object."""
+
+    def __init__(self, code: int, message: str):
+        """Initialize error.
+
+        Args:
+            code: JSON-RPC error code
+            message: Error message
+        """
+        super().__init__(message)
+        self.code = code
+
+
+class WarmState:
+    """Policies and ID managers kept open between generation runs.
+
+    A policy is reloaded when its file's mtime or size changes, and an ID
+    manager is recreated when the policy it was configured from is. ID
+    managers pick up allocations made by other processes when they start a
+    session, so keeping them open is safe while the CLI runs alongside.
+    """
+
+    def __init__(self, max_id_managers: int = 64):
+        """Initialize state.
+
+        Args:
+            max_id_managers: Output directories to keep an open ID manager
+                for; the least recently used one is closed beyond that
+        """
+        self.max_id_managers = max_id_managers
+        self._policies: dict[Path, tuple[tuple[int, int], PolicyConfig]] = {}
+        self._id_managers: OrderedDict[Path, tuple[PolicyConfig, IDManager]] = OrderedDict()
+
+    def policy(self, policy_path: Path) -> PolicyConfig:
+        """Get a policy, loading it only if its file changed.
+
+        Args:
+            policy_path: Path to policy YAML file
+
+        Returns:
+            Parsed policy configuration
+
+        Raises:
+            FileNotFoundError: If the policy file does not exist
+        """
+        key = policy_path.resolve()
+        try:
+            st = key.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Policy file not found: {policy_path}") from None
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        cached = self._policies.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        policy = load_policy(key)
+        self._policies[key] = (stamp, policy)
+        return policy
+
+    def id_manager(self, policy: PolicyConfig, output_dir: Path) -> IDManager:
+        """Get the open ID manager for an output directory.
+
+        Args:
+            policy: Policy whose ``ids`` section configures the manager
+            output_dir: Directory holding the ID map
+
+        Returns:
+            ID manager, created on first use or after the policy changed
+        """
+        key = output_dir.resolve()
+        cached = self._id_managers.get(key)
+        if cached is not None and cached[0] is policy:
+            self._id_managers.move_to_end(key)
+            return cached[1]
+        if cached is not None:
+            cached[1].close()
+
+        id_manager = create_id_manager(policy, output_dir)
+        self._id_managers[key] = (policy, id_manager)
+        self._id_managers.move_to_end(key)
+        while len(self._id_managers) > self.max_id_managers:
+            _, (_, evicted) = self._id_managers.popitem(last=False)
+            evicted.close()
+        return id_manager
+
+    def generator(self, prd_path: Path, policy_path: Path, output_dir: Path) -> SpecTestGenerator:
+        """Create a generator that uses the warm policy and ID manager.
+
+        Args:
+            prd_path: Path to PRD markdown file
+            policy_path: Path to policy YAML file
+            output_dir: Directory for output artifacts
+
+        Returns:
+            Generator sharing this state's policy and ID manager
+        """
+        policy = self.policy(policy_path)
+        return SpecTestGenerator(
+            prd_path,
+            policy_path=policy_path,
+            output_dir=output_dir,
+            policy=policy,
+            id_manager=self.id_manager(policy, output_dir),
+        )
+
+    @property
+    def id_manager_count(self) -> int:
+        """Number of open ID managers."""
+        return len(self._id_managers)
+
+    def close(self) -> None:
+        """Close all ID managers."""
+        for _, id_manager in self._id_managers.values():
+            id_manager.close()
+        self._id_managers.clear()
+
+
+class GenerationServer:
+    """JSON-RPC 2.0 server for generation requests.
+
+    Requests are JSON objects, one per line, over stdin/stdout or a Unix
+    socket. Requests are handled one at a time.
+
+    Methods:
+        ping: Returns the package version
+        generate: Params ``prd`` (required), ``output``, ``policy``,
+            ``write`` (default true) and ``result`` (include the full
+            result, default false). Returns counts, artifact paths and the
+            time taken
+        stats: Returns request, parse cache and ID manager counts
+        shutdown: Stops the server after responding
+    """
+
+    def __init__(
+        self,
+        policy_path: Path,
+        output_dir: Path = Path("spec"),
+        state: WarmState | None = None,
+    ):
+        """Initialize server.
+
+        Args:
+            policy_path: Policy used by requests that do not name one
+            output_dir: Output directory used by requests that do not name one
+            state: Warm state to use (default: a new one)
+        """
+        self.policy_path = policy_path
+        self.output_dir = output_dir
+        self.state = state if state is not None else WarmState()
+        self.requests = 0
+        self.shutting_down = False
+        self._lock = threading.Lock()
+        self._methods: dict[str, Callable[[dict[str, Any]], Any]] = {
+            "ping": self._ping,
+            "generate": self._generate,
+            "stats": self._stats,
+            "shutdown": self._shutdown,
+        }
+
+    def handle_line(self, line: str) -> str | None:
+        """Handle one request line.
+
+        Args:
+            line: JSON-encoded request
+
+        Returns:
+            JSON-encoded response, or None for a notification
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return json.dumps(_error_response(None, PARSE_ERROR, f"Parse error: {e}"))
+        response = self.handle(request)
+        return json.dumps(response) if response is not None else None
+
+    def handle(self, request: Any) -> dict[str, Any] | None:
+        """Handle one decoded request.
+
+        Args:
+            request: JSON-RPC request object
+
+        Returns:
+            Response object, or None for a notification (no ``id``)
+        """
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        params = request.get("params", {})
+
+        try:
+            method = self._methods.get(request["method"])
+            if method is None:
+                raise RPCError(METHOD_NOT_FOUND, f"Method not found: {request['method']}")
+            if not isinstance(params, dict):
+                raise RPCError(INVALID_PARAMS, "Params must be an object")
+            with self._lock:
+                self.requests += 1
+                result = method(params)
+        except RPCError as e:
+            response = _error_response(request_id, e.code, str(e))
+        except FileNotFoundError as e:
+            response = _error_response(request_id, FILE_NOT_FOUND, str(e))
+        except Exception as e:
+            response = _error_response(request_id, GENERATION_ERROR, f"{type(e).__name__}: {e}")
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+        return response if "id" in request else None
+
+    def serve_stdio(self, stdin: TextIO = sys.stdin, stdout: TextIO = sys.stdout) -> None:
+        """Serve requests read from ``stdin`` until EOF or shutdown."""
+        for line in stdin:
+            if not line.strip():
+                continue
+            response = self.handle_line(line)
+            if response is not None:
+                stdout.write(response + "\n")
+                stdout.flush()
+            if self.shutting_down:
+                break
+
+    def serve_unix(self, socket_path: Path, ready: threading.Event | None = None) -> None:
+        """Serve requests on a Unix socket until shutdown.
+
+        The socket is created readable and writable by the owner only, and
+        removed when the server stops.
+
+        Args:
+            socket_path: Path of the socket to create (an existing one is replaced)
+            ready: Set once the socket accepts connections
+        """
+        socket_path.unlink(missing_ok=True)
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(str(socket_path), _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        server.generation_server = self
+        try:
+            if ready is not None:
+                ready.set()
+            server.serve_forever()
+        finally:
+            server.server_close()
+            socket_path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Release the warm state."""
+        self.state.close()
+
+    def _ping(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {"version": __version__}
+
+    def _generate(self, params: dict[str, Any]) -> dict[str, Any]:
+        prd = params.get("prd")
+        if not isinstance(prd, str):
+            raise RPCError(INVALID_PARAMS, "'prd' must be a path string")
+        policy_path = Path(params["policy"]) if params.get("policy") else self.policy_path
+        output_dir = Path(params["output"]) if params.get("output") else self.output_dir
+
+        start = time.perf_counter()
+        generator = self.state.generator(Path(prd), policy_path, output_dir)
+        response: dict[str, Any] = {}
+        if params.get("result", False):
+            result = generator.generate()
+            response["requirements"] = len(result["requirements"])
+            response["test_cases"] = len(result["test_cases"])
+            if params.get("write", True):
+                artifacts = generator.write_artifacts(result)
+                response["artifacts"] = {name: str(path) for name, path in artifacts.items()}
+                response["written"] = len(generator.write_report.written)
+                response["skipped"] = len(generator.write_report.skipped)
+            response["result"] = result_to_dict(result)
+        else:
+            # Nothing is returned per requirement, so stream straight to the artifacts
+            stream = generator.generate_stream()
+            if params.get("write", True):
+                artifacts = generator.write_artifacts(stream)
+                response["artifacts"] = {name: str(path) for name, path in artifacts.items()}
+                response["written"] = len(generator.write_report.written)
+                response["skipped"] = len(generator.write_report.skipped)
+            else:
+                for _ in stream:
+                    pass
+            response["requirements"] = stream.requirements
+            response["test_cases"] = stream.test_cases
+        response["seconds"] = round(time.perf_counter() - start, 6)
+        return response
+
+    def _stats(self, params: dict[str, Any]) -> dict[str, Any]:
+        cache = get_parse_cache()
+        return {
+            "requests": self.requests,
+            "parse_cache": {"hits": cache.hits, "misses": cache.misses},
+            "id_managers": self.state.id_manager_count,
+        }
+
+    def _shutdown(self, params: dict[str, Any]) -> None:
+        self.shutting_down = True
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    generation_server: GenerationServer
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle newline-delimited requests on one connection."""
+
+    server: _UnixServer
+
+    def handle(self) -> None:
+        generation_server = self.server.generation_server
+        for raw in self.rfile:
+            if not raw.strip():
+                continue
+            response = generation_server.handle_line(raw.decode())
+            if response is not None:
+                self.wfile.write(response.encode() + b"\n")
+                self.wfile.flush()
+            if generation_server.shutting_down:
+                # shutdown() waits for serve_forever, so call it from another thread
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                break
@@ -0,0 +1,176 @@
+"""Watch a directory of PRDs and regenerate the ones that change."""
+
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from .batch import BatchItem, batch_output_dirs
+from .server import WarmState
+
+# (mtime_ns, size) of a watched file
+FileStamp = tuple[int, int]
+
+
+def _file_stamp(path: Path) -> FileStamp | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class Watcher:
+    """Regenerate PRDs under a directory when they or the policy change.
+
+    The directory is polled for ``*.md`` files. A changed file is rebuilt
+    once it has been stable for the debounce delay, so a burst of saves
+    triggers one rebuild. An edit to the policy file rebuilds every PRD.
+    Policies and ID managers stay warm between rebuilds, and artifacts are
+    only rewritten when their content changes.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        policy_path: Path,
+        output_root: Path,
+        debounce: float = 0.3,
+        state: WarmState | None = None,
+    ):
+        """Initialize watcher.
+
+        Args:
+            directory: Directory to watch for PRD markdown files
+            policy_path: Policy applied to every PRD
+            output_root: Root for per-PRD output directories, mirroring the
+                PRD paths below ``directory``; files under it are not watched
+            debounce: Seconds a changed file must stay unchanged before it
+                is rebuilt
+            state: Warm state to use (default: a new one)
+        """
+        self.directory = directory
+        self.policy_path = policy_path
+        self.output_root = output_root
+        self.debounce = debounce
+        self.state = state if state is not None else WarmState()
+
+        self._stamps: dict[Path, FileStamp] = {}
+        self._policy_stamp: FileStamp | None = None
+        # Changed files waiting to be rebuilt -> when the last change was seen
+        self._pending: dict[Path, float] = {}
+
+    def scan(self) -> dict[Path, FileStamp]:
+        """Get the current stamp of every watched PRD."""
+        output_root = self.output_root.resolve()
+        stamps = {}
+        for path in sorted(self.directory.rglob("*.md")):
+            if path.resolve().is_relative_to(output_root):
+                continue
+            stamp = _file_stamp(path)
+            if stamp is not None:
+                stamps[path] = stamp
+        return stamps
+
+    def start(self) -> list[BatchItem]:
+        """Record the current files and generate all of them.
+
+        Returns:
+            One item per PRD
+        """
+        self._stamps = self.scan()
+        self._policy_stamp = _file_stamp(self.policy_path)
+        self._pending.clear()
+        return self.rebuild(list(self._stamps))
+
+    def poll(self, now: float | None = None) -> list[Path]:
+        """Check for changes and get the PRDs due for a rebuild.
+
+        Args:
+            now: Current ``time.monotonic()`` value (for tests)
+
+        Returns:
+            Changed PRDs that have been stable for the debounce delay
+        """
+        if now is None:
+            now = time.monotonic()
+
+        current = self.scan()
+        for path, stamp in current.items():
+            if self._stamps.get(path) != stamp:
+                self._pending[path] = now
+        for path in self._stamps.keys() - current.keys():
+            self._pending.pop(path, None)
+        self._stamps = current
+
+        policy_stamp = _file_stamp(self.policy_path)
+        if policy_stamp != self._policy_stamp:
+            self._policy_stamp = policy_stamp
+            for path in current:
+                self._pending[path] = now
+
+        ready = sorted(path for path, seen in self._pending.items() if now - seen >= self.debounce)
+        for path in ready:
+            del self._pending[path]
+        return ready
+
+    def rebuild(self, prd_paths: list[Path]) -> list[BatchItem]:
+        """Regenerate PRDs with the warm policy and ID managers.
+
+        A PRD that fails (e.g. a half-saved file) is reported in its item
+        and retried on its next change.
+
+        Args:
+            prd_paths: PRDs to regenerate
+
+        Returns:
+            One item per PRD
+        """
+        items = []
+        output_dirs = batch_output_dirs(prd_paths, self.output_root, base=self.directory)
+        for prd_path in prd_paths:
+            item = BatchItem(prd_path, output_dirs[prd_path])
+            start = time.perf_counter()
+            try:
+                generator = self.state.generator(prd_path, self.policy_path, item.output_dir)
+                stream = generator.generate_stream()
+                generator.write_artifacts(stream)
+                item.requirements = stream.requirements
+                item.test_cases = stream.test_cases
+                item.written = len(generator.write_report.written)
+                item.skipped = len(generator.write_report.skipped)
+            except Exception as e:
+                item.error = f"{type(e).__name__}: {e}"
+            item.seconds = time.perf_counter() - start
+            items.append(item)
+        return items
+
+    def run(
+        self,
+        interval: float = 0.5,
+        on_rebuild: Callable[[list[BatchItem]], None] | None = None,
+        stop: threading.Event | None = None,
+    ) -> None:
+        """Generate everything, then poll and rebuild until stopped.
+
+        Args:
+            interval: Seconds between polls
+            on_rebuild: Called with the items of each (re)build
+            stop: Event that ends the loop when set (default: run until
+                interrupted)
+        """
+        if stop is None:
+            stop = threading.Event()
+        items = self.start()
+        if on_rebuild is not None:
+            on_rebuild(items)
+        while not stop.wait(interval):
+            changed = self.poll()
+            if changed:
+                items = self.rebuild(changed)
+                if on_rebuild is not None:
+                    on_rebuild(items)
+
+    def close(self) -> None:
+        """Release the warm state."""
+        self.state.close()
@@ -0,0 +1,67 @@
+"""Integration tests for batch generation."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from spec_test_generator.__main__ import main
+from spec_test_generator.batch import run_batch
+from spec_test_generator.generator import default_policy_path, load_policy
+
+PRD = "# PRD: {name}\n\n## Functional Requirements\n1) Users can {name}\n2) Admins can audit\n"
+
+
+def _write_prds(root: Path) -> list[Path]:
+    paths = []
+    for name in ("search", "export", "share"):
+        path = root / "prds" / ("team-a" if name != "share" else "team-b") / f"{name}.md"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(PRD.format(name=name))
+        paths.append(path)
+    return paths
+
+
+class TestBatch:
+    """Tests for generating many PRDs in one run."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_batch_generates_each_prd(self, tmp_path: Path, jobs: int) -> None:
+        """Test that each PRD gets its own output directory and ID map."""
+        prd_paths = _write_prds(tmp_path)
+        policy = load_policy(default_policy_path())
+
+        report = run_batch(prd_paths, policy, tmp_path / "spec", jobs=jobs)
+
+        assert [item.prd_path for item in report.items] == prd_paths
+        assert not report.failed
+        assert report.items[2].output_dir == tmp_path / "spec" / "team-b" / "share"
+        for item in report.items:
+            assert item.requirements == 2
+            assert (item.output_dir / "REQUIREMENTS.md").exists()
+            ids = json.loads((item.output_dir / ".idmap.json").read_text())
+            assert sorted(ids["requirements"].values()) == ["REQ-0001", "REQ-0002"]
+
+    def test_failures_do_not_abort_batch(self, tmp_path: Path) -> None:
+        """Test that a failing PRD is reported while the others are generated."""
+        prd_paths = _write_prds(tmp_path)
+        prd_paths.insert(1, tmp_path / "prds" / "missing.md")
+        policy = load_policy(default_policy_path())
+
+        report = run_batch(prd_paths, policy, tmp_path / "spec", jobs=2)
+
+        assert [item.ok for item in report.items] == [True, False, True, True]
+        assert "FileNotFoundError" in (report.items[1].error or "")
+
+    def test_batch_command(self, tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """Test the batch subcommand with a recursive glob pattern."""
+        _write_prds(tmp_path)
+
+        code = main(
+            ["batch", str(tmp_path / "prds" / "**" / "*.md"), "-o", str(tmp_path / "out"), "--json"]
+        )
+
+        report = json.loads(capsys.readouterr().out)
+        assert code == 0
+        assert (report["total"], report["failed"]) == (3, 0)
+        assert (tmp_path / "out" / "team-a" / "export" / "TEST_PLAN.md").exists()
@@ -0,0 +1,27 @@
+"""Integration tests for ID allocation across processes."""
+
+import multiprocessing
+from pathlib import Path
+
+from spec_test_generator.id_manager import IDManager
+
+
+def _allocate(output_dir: Path, worker: int) -> list[str]:
+    manager = IDManager(output_dir)
+    return [manager.get_requirement_id(f"worker{worker}-{i}") for i in range(20)]
+
+
+class TestConcurrentAllocation:
+    """Tests for parallel workers sharing one output directory."""
+
+    def test_parallel_workers_allocate_unique_ids(self, tmp_path: Path) -> None:
+        """Test that parallel workers never hand out the same ID twice."""
+        with multiprocessing.get_context("spawn").Pool(4) as pool:
+            results = pool.starmap(_allocate, [(tmp_path, w) for w in range(4)])
+
+        allocated = [req_id for ids in results for req_id in ids]
+        assert len(set(allocated)) == 80
+
+        manager = IDManager(tmp_path)
+        assert len(manager.get_all_requirement_ids()) == 80
+        assert manager.get_requirement_id("worker0-0") == results[0][0]
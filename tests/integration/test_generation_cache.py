@@ -0,0 +1,109 @@
+"""Integration tests for the incremental generation cache."""
+
+from pathlib import Path
+
+import yaml
+
+from spec_test_generator import SpecTestGenerator
+from spec_test_generator.generation_cache import GENERATION_CACHE_FILE
+from spec_test_generator.generator import GenerationStream, default_policy_path
+
+PRD = """# PRD: Reports
+
+## Functional Requirements
+1) Users can list reports with pagination
+2) Users must be authenticated to export reports
+3) Admins can delete reports
+4) Reports are stored in the database
+
+## Non-Functional Requirements
+- Exports should finish within 5 seconds
+"""
+
+ARTIFACTS = ["REQUIREMENTS.md", "TEST_CASES.md", "TEST_PLAN.md", "TRACEABILITY.csv"]
+
+
+def _policy(tmp_path: Path, **overrides: object) -> Path:
+    data = yaml.safe_load(default_policy_path().read_text())
+    data["generation"] = {"incremental": True}
+    data.update(overrides)
+    path = tmp_path / "policy.yaml"
+    path.write_text(yaml.safe_dump(data))
+    return path
+
+
+def _run(prd: Path, policy: Path | None, output_dir: Path) -> GenerationStream:
+    generator = SpecTestGenerator(prd, policy_path=policy, output_dir=output_dir)
+    stream = generator.generate_stream()
+    generator.write_artifacts(stream)
+    generator.close()
+    return stream
+
+
+class TestGenerationCache:
+    """Tests for reusing cached requirements across generations."""
+
+    def test_reuses_unchanged_requirements(self, tmp_path: Path) -> None:
+        """Test that only edited requirements are regenerated, with the same output."""
+        prd = tmp_path / "prd.md"
+        prd.write_text(PRD)
+        policy = _policy(tmp_path)
+        output_dir = tmp_path / "spec"
+
+        first = _run(prd, policy, output_dir)
+        assert first.cache is not None
+        assert (first.cache.hits, first.cache.misses) == (0, 5)
+        assert (output_dir / GENERATION_CACHE_FILE).exists()
+
+        second = _run(prd, policy, output_dir)
+        assert second.cache is not None
+        assert (second.cache.hits, second.cache.misses) == (5, 0)
+
+        prd.write_text(PRD.replace("Admins can delete", "Admins can archive"))
+        third = _run(prd, policy, output_dir)
+        assert third.cache is not None
+        assert (third.cache.hits, third.cache.misses) == (4, 1)
+
+        # Same artifacts as a generation without the cache, from the same ID map
+        uncached = tmp_path / "uncached"
+        uncached.mkdir()
+        (uncached / ".idmap.json").write_bytes((output_dir / ".idmap.json").read_bytes())
+        _run(prd, None, uncached)
+        for name in ARTIFACTS:
+            assert (output_dir / name).read_text() == (uncached / name).read_text()
+
+    def test_position_and_policy_are_part_of_the_key(self, tmp_path: Path) -> None:
+        """Test that moving a requirement out of the top three or editing the policy misses."""
+        prd = tmp_path / "prd.md"
+        prd.write_text(PRD)
+        output_dir = tmp_path / "spec"
+        _run(prd, _policy(tmp_path), output_dir)
+
+        # A new first requirement; "Admins can delete reports" drops from P0 to P1
+        prd.write_text(PRD.replace("1) Users can list", "0) Users can view\n1) Users can list"))
+        moved = _run(prd, _policy(tmp_path), output_dir)
+        assert moved.cache is not None
+        assert (moved.cache.hits, moved.cache.misses) == (4, 2)
+
+        edited = _run(prd, _policy(tmp_path, keywords={"auth": ["sso"]}), output_dir)
+        assert edited.cache is not None
+        assert edited.cache.hits == 0
+
+    def test_stale_ids_are_not_reused(self, tmp_path: Path) -> None:
+        """Test that entries whose IDs no longer match the ID map are regenerated."""
+        prd = tmp_path / "prd.md"
+        prd.write_text(PRD)
+        policy = _policy(tmp_path)
+        output_dir = tmp_path / "spec"
+        _run(prd, policy, output_dir)
+
+        # A fresh ID map numbers the requirements in a different order
+        (output_dir / ".idmap.json").unlink()
+        prd.write_text(PRD.replace("1) Users can list", "1) Users can view\n2) Users can list"))
+        stream = _run(prd, policy, output_dir)
+
+        assert stream.cache is not None
+        assert stream.cache.hits == 0
+        assert "REQ-0002 (P0) — The system SHALL users can list" in (
+            (output_dir / "REQUIREMENTS.md").read_text()
+        )
@@ -2,7 +2,10 @@
 
 from pathlib import Path
 
+import pytest
+
 from spec_test_generator import SpecTestGenerator
+from spec_test_generator.generator import create_id_manager, load_policy
 
 
 class TestIDStability:
@@ -69,3 +72,40 @@ Test ID stability
         assert result1["requirements"][0].id == result2["requirements"][0].id
         # Second requirement should have new ID
         assert result2["requirements"][1].id == "REQ-0002"
+
+    @pytest.mark.parametrize("storage", ["json", "sqlite"])
+    def test_prds_sharing_output_do_not_age_each_other(self, tmp_path: Path, storage: str) -> None:
+        """Test that GC counts each PRD's own runs when PRDs share an output directory."""
+        billing = tmp_path / "billing.md"
+        billing.write_text("# PRD: Billing\n\n## Functional Requirements\n1) Users can pay\n")
+        reports = tmp_path / "reports.md"
+        reports.write_text("# PRD: Reports\n\n## Functional Requirements\n1) Users can export\n")
+        policy_path = tmp_path / "policy.yaml"
+        policy_path.write_text(f"ids:\n  storage: {storage}\n  track_generations: true\n")
+        output_dir = tmp_path / "spec"
+
+        def generate(prd: Path) -> list[str]:
+            generator = SpecTestGenerator(prd, policy_path=policy_path, output_dir=output_dir)
+            try:
+                return [req.id for req in generator.generate()["requirements"]]
+            finally:
+                generator.close()
+
+        def collect_garbage() -> list[str]:
+            manager = create_id_manager(load_policy(policy_path), output_dir)
+            try:
+                return manager.collect_garbage(1)["requirements"]
+            finally:
+                manager.close()
+
+        assert generate(billing) == ["REQ-0001"]
+        for _ in range(3):
+            assert generate(reports) == ["REQ-0002"]
+
+        assert collect_garbage() == []
+        assert generate(billing) == ["REQ-0001"]
+
+        # Once billing itself stops using its requirement, it is retired
+        billing.write_text("# PRD: Billing\n\n## Functional Requirements\n1) Users can refund\n")
+        assert generate(billing) == ["REQ-0003"]
+        assert collect_garbage() == ["REQ-0001"]
@@ -0,0 +1,89 @@
+"""Integration tests for the generation server."""
+
+import io
+import json
+import socket
+import threading
+from pathlib import Path
+
+from spec_test_generator.generator import default_policy_path
+from spec_test_generator.server import FILE_NOT_FOUND, METHOD_NOT_FOUND, GenerationServer
+
+PRD = "# PRD: Test\n\n## Functional Requirements\n1) Users can search\n2) Admins can audit\n"
+
+
+def _request(request_id: int, method: str, **params: object) -> str:
+    return json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+
+
+class TestGenerationServer:
+    """Tests for GenerationServer class."""
+
+    def test_stdio_requests_reuse_warm_state(self, tmp_path: Path) -> None:
+        """Test that repeated requests share the policy, ID manager and parse."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(PRD)
+        server = GenerationServer(default_policy_path(), tmp_path / "spec")
+        stdin = io.StringIO(
+            "\n".join(
+                [
+                    _request(1, "generate", prd=str(prd_file)),
+                    _request(2, "generate", prd=str(prd_file), write=False, result=True),
+                    json.dumps({"jsonrpc": "2.0", "method": "ping"}),
+                    _request(3, "stats"),
+                    _request(4, "shutdown"),
+                    _request(5, "ping"),
+                ]
+            )
+        )
+        stdout = io.StringIO()
+
+        server.serve_stdio(stdin, stdout)
+        server.close()
+
+        responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        assert [r["id"] for r in responses] == [1, 2, 3, 4]
+        first, second, stats, _ = (r["result"] for r in responses)
+        assert first["requirements"] == 2
+        assert Path(first["artifacts"]["REQUIREMENTS.md"]).exists()
+        assert "artifacts" not in second
+        assert [r["id"] for r in second["result"]["requirements"]] == ["REQ-0001", "REQ-0002"]
+        assert stats["requests"] == 4
+        assert stats["id_managers"] == 1
+
+    def test_errors(self, tmp_path: Path) -> None:
+        """Test that failures are returned as JSON-RPC errors."""
+        server = GenerationServer(default_policy_path(), tmp_path / "spec")
+
+        missing = json.loads(server.handle_line(_request(1, "generate", prd="missing.md")) or "")
+        unknown = json.loads(server.handle_line(_request(2, "explode")) or "")
+        garbled = json.loads(server.handle_line("{not json") or "")
+
+        assert missing["error"]["code"] == FILE_NOT_FOUND
+        assert unknown["error"]["code"] == METHOD_NOT_FOUND
+        assert garbled["error"]["code"] == -32700
+
+    def test_unix_socket(self, tmp_path: Path) -> None:
+        """Test serving requests over a Unix socket until shutdown."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(PRD)
+        socket_path = tmp_path / "gen.sock"
+        server = GenerationServer(default_policy_path(), tmp_path / "spec")
+        ready = threading.Event()
+        thread = threading.Thread(target=server.serve_unix, args=(socket_path, ready))
+        thread.start()
+        assert ready.wait(5)
+
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(str(socket_path))
+            stream = client.makefile("rw")
+            stream.write(_request(1, "generate", prd=str(prd_file)) + "\n")
+            stream.write(_request(2, "shutdown") + "\n")
+            stream.flush()
+            responses = [json.loads(stream.readline()) for _ in range(2)]
+
+        thread.join(5)
+        server.close()
+        assert responses[0]["result"]["test_cases"] > 0
+        assert not thread.is_alive()
+        assert not socket_path.exists()
@@ -0,0 +1,134 @@
+"""Integration tests for streaming generation."""
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from spec_test_generator import SpecTestGenerator, generator, output
+from spec_test_generator.__main__ import main
+from spec_test_generator.models import GeneratedRequirement
+from spec_test_generator.output import ArtifactWriter, OutputGenerator
+
+PRD = """# PRD: Reports
+
+## Functional Requirements
+1) Users can list reports with pagination
+2) Users must be authenticated to export reports
+3) Admins can delete reports
+4) Reports are stored in the database
+5) Users can list reports with pagination
+
+## Non-Functional Requirements
+- Exports should finish within 5 seconds
+- Should handle 100 concurrent users
+
+## Notes
+- Which auth provider?
+"""
+
+ARTIFACTS = ["REQUIREMENTS.md", "TEST_CASES.md", "TEST_PLAN.md", "TRACEABILITY.csv"]
+
+
+class TestGenerationStream:
+    """Tests for generate_stream and streamed artifact writes."""
+
+    def test_stream_matches_result(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that streamed artifacts and IDs match the list-based path."""
+        # Small chunks so IDs are resolved across several chunks
+        monkeypatch.setattr(generator, "STREAM_CHUNK_SIZE", 2)
+        prd = tmp_path / "prd.md"
+        prd.write_text(PRD)
+
+        listed = SpecTestGenerator(prd, output_dir=tmp_path / "listed")
+        result = listed.generate()
+        listed.write_artifacts(result)
+
+        streamed = SpecTestGenerator(prd, output_dir=tmp_path / "streamed")
+        stream = streamed.generate_stream()
+        items = list(stream)
+
+        assert [item.requirement for item in items] == result["requirements"]
+        assert [test for item in items for test in item.test_cases] == result["test_cases"]
+        assert [e for item in items for e in item.traceability] == result["traceability"]
+        assert (stream.requirements, stream.test_cases, stream.traceability) == (7, 14, 14)
+
+        streamed.write_artifacts()
+        for name in ARTIFACTS:
+            listed_text = (tmp_path / "listed" / name).read_text()
+            assert (tmp_path / "streamed" / name).read_text() == listed_text
+
+    def test_parallel_workers_apply_to_streams(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """Test that output.workers writes a stream's artifacts on the thread pool."""
+        prd = tmp_path / "prd.md"
+        prd.write_text(PRD)
+        policy = tmp_path / "policy.yaml"
+        policy.write_text("output:\n  workers: 4\n")
+        SpecTestGenerator(prd, output_dir=tmp_path / "sequential").write_artifacts()
+
+        pools = []
+        run_writes = output.run_writes
+
+        def spy(tasks: dict, workers: int = 1) -> dict:
+            pools.append((list(tasks), workers))
+            return run_writes(tasks, workers)
+
+        monkeypatch.setattr(output, "run_writes", spy)
+        code = main([str(prd), "--policy", str(policy), "-o", str(tmp_path / "parallel")])
+
+        assert code == 0
+        assert pools == [
+            (["REQUIREMENTS.md", "TEST_PLAN.md", "TEST_CASES.md", "TRACEABILITY.csv"], 4)
+        ]
+        assert "Requirements: 7" in capsys.readouterr().out
+        for name in ARTIFACTS:
+            sequential_text = (tmp_path / "sequential" / name).read_text()
+            assert (tmp_path / "parallel" / name).read_text() == sequential_text
+
+    def test_failed_stream_keeps_artifacts(self, tmp_path: Path) -> None:
+        """Test that an error mid-stream leaves existing artifacts as they were."""
+        prd = tmp_path / "prd.md"
+        prd.write_text(PRD)
+        output_dir = tmp_path / "spec"
+        gen = SpecTestGenerator(prd, output_dir=output_dir)
+        gen.write_artifacts()
+        before = {name: (output_dir / name).read_text() for name in ARTIFACTS}
+
+        prd.write_text(PRD.replace("Admins", "Owners"))
+        stream = gen.generate_stream()
+
+        def failing_items() -> Iterator[GeneratedRequirement]:
+            for i, item in enumerate(stream):
+                if i == 3:
+                    raise RuntimeError("boom")
+                yield item
+
+        output = OutputGenerator(stream.result, gen._load_policy(), output_dir)
+        with pytest.raises(RuntimeError, match="boom"):
+            output.generate_stream(failing_items())
+        stream.close()
+
+        assert {name: (output_dir / name).read_text() for name in ARTIFACTS} == before
+        assert sorted(path.name for path in output_dir.iterdir() if path.suffix == ".tmp") == []
+
+    def test_writer_skips_identical_content(self, tmp_path: Path) -> None:
+        """Test that ArtifactWriter keeps a file whose content is unchanged."""
+        path = tmp_path / "out.md"
+        path.write_text("a\nb")
+        before = path.stat().st_mtime_ns
+
+        with ArtifactWriter(path) as writer:
+            writer.write_lines(["a", "b"])
+        assert not writer.written
+        assert path.stat().st_mtime_ns == before
+
+        with ArtifactWriter(path) as writer:
+            writer.write_lines(["a", "c"])
+        assert writer.written
+        assert path.read_text() == "a\nc"
+        assert [p.name for p in tmp_path.iterdir()] == ["out.md"]
@@ -0,0 +1,67 @@
+"""Integration tests for watch mode."""
+
+import shutil
+from pathlib import Path
+
+from spec_test_generator.generator import default_policy_path
+from spec_test_generator.watch import Watcher
+
+PRD = "# PRD: {name}\n\n## Functional Requirements\n1) Users can {name}\n"
+
+
+def _setup(tmp_path: Path) -> tuple[Watcher, Path, Path]:
+    prds = tmp_path / "prds"
+    (prds / "team").mkdir(parents=True)
+    (prds / "team" / "search.md").write_text(PRD.format(name="search"))
+    (prds / "export.md").write_text(PRD.format(name="export"))
+    policy = tmp_path / "policy.yaml"
+    shutil.copy(default_policy_path(), policy)
+    # Output inside the watched directory must not trigger rebuilds
+    return Watcher(prds, policy, prds / "spec", debounce=0.5), prds, policy
+
+
+class TestWatcher:
+    """Tests for Watcher class."""
+
+    def test_rebuilds_changed_prds_after_debounce(self, tmp_path: Path) -> None:
+        """Test that only edited PRDs are rebuilt, once stable."""
+        watcher, prds, _ = _setup(tmp_path)
+        items = watcher.start()
+        assert [item.prd_path.name for item in items] == ["export.md", "search.md"]
+        assert all(item.ok for item in items)
+        assert (prds / "spec" / "team" / "search" / "REQUIREMENTS.md").exists()
+
+        search = prds / "team" / "search.md"
+        search.write_text(PRD.format(name="search") + "2) Users can filter\n")
+        assert watcher.poll(now=100.0) == []
+        assert watcher.poll(now=100.2) == []
+        assert watcher.poll(now=100.6) == [search]
+        assert watcher.poll(now=110.0) == []
+
+        (item,) = watcher.rebuild([search])
+        assert item.requirements == 2
+        watcher.close()
+
+    def test_policy_edit_rebuilds_all(self, tmp_path: Path) -> None:
+        """Test that editing the policy queues every PRD."""
+        watcher, prds, policy = _setup(tmp_path)
+        watcher.start()
+
+        policy.write_text(policy.read_text() + "\n# tweak\n")
+        watcher.poll(now=0.0)
+
+        assert len(watcher.poll(now=1.0)) == 2
+        watcher.close()
+
+    def test_unchanged_artifacts_not_rewritten(self, tmp_path: Path) -> None:
+        """Test that a rebuild with the same output leaves artifact mtimes alone."""
+        watcher, prds, _ = _setup(tmp_path)
+        watcher.start()
+        artifact = prds / "spec" / "export" / "REQUIREMENTS.md"
+        before = artifact.stat().st_mtime_ns
+
+        (item,) = watcher.rebuild([prds / "export.md"])
+
+        assert item.ok
+        assert artifact.stat().st_mtime_ns == before
+        watcher.close()
@@ -0,0 +1,49 @@
+"""Tests for atomic file replacement."""
+
+import os
+import stat
+from pathlib import Path
+
+from spec_test_generator.atomic import atomic_write
+from spec_test_generator.id_manager import IDManager
+
+
+def _mode(path: Path) -> int:
+    return stat.S_IMODE(path.stat().st_mode)
+
+
+class TestAtomicWrite:
+    """Tests for atomic_write function."""
+
+    def test_keeps_existing_mode(self, tmp_path: Path) -> None:
+        """Test that replacing a file keeps its permissions."""
+        path = tmp_path / "shared.json"
+        path.write_text("old")
+        path.chmod(0o644)
+
+        atomic_write(path, "new", fsync=True)
+
+        assert path.read_text() == "new"
+        assert _mode(path) == 0o644
+        assert [p.name for p in tmp_path.iterdir()] == ["shared.json"]
+
+    def test_new_file_follows_umask(self, tmp_path: Path) -> None:
+        """Test that a new file gets the mode open() would give it, not owner-only."""
+        path = tmp_path / "sub" / "new.bin"
+        umask = os.umask(0o022)
+        os.umask(umask)
+
+        atomic_write(path, b"\x00\x01")
+
+        assert path.read_bytes() == b"\x00\x01"
+        assert _mode(path) == 0o666 & ~umask
+
+    def test_id_map_save_keeps_mode(self, tmp_path: Path) -> None:
+        """Test that saving the ID map leaves a group-readable map readable."""
+        IDManager(tmp_path).get_requirement_id("hash1")
+        idmap = tmp_path / ".idmap.json"
+        idmap.chmod(0o664)
+
+        IDManager(tmp_path).get_requirement_id("hash2")
+
+        assert _mode(idmap) == 0o664
@@ -0,0 +1,44 @@
+"""Tests for fingerprinting."""
+
+import hashlib
+
+import pytest
+
+from spec_test_generator.fingerprint import fingerprint_statement, fingerprint_test_case
+
+
+class TestFingerprint:
+    """Tests for fingerprint functions."""
+
+    def test_v1_matches_original_md5_keys(self) -> None:
+        """Test that v1 reproduces keys written by earlier releases."""
+        expected = hashlib.md5(b"the system shall do something").hexdigest()[:12]
+
+        assert fingerprint_statement("The  system shall do something.") == expected
+
+    def test_v2_differs_from_v1(self) -> None:
+        """Test that the v2 scheme produces distinct 12-char keys."""
+        v1 = fingerprint_statement("Users can log in", "v1")
+        v2 = fingerprint_statement("Users can log in", "v2")
+
+        assert v1 != v2
+        assert len(v2) == 12
+
+    def test_test_case_fingerprint_ignores_requirement_order(self) -> None:
+        """Test that requirement ID order does not change the key."""
+        assert fingerprint_test_case("Title", ("REQ-0002", "REQ-0001"), "v2") == (
+            fingerprint_test_case("Title", ("REQ-0001", "REQ-0002"), "v2")
+        )
+
+    def test_memoized(self) -> None:
+        """Test that repeated statements are served from the cache."""
+        fingerprint_statement.cache_clear()
+        fingerprint_statement("Repeated statement", "v2")
+        fingerprint_statement("Repeated statement", "v2")
+
+        assert fingerprint_statement.cache_info().hits == 1
+
+    def test_unknown_scheme(self) -> None:
+        """Test that unknown schemes are rejected."""
+        with pytest.raises(ValueError, match="Unknown fingerprint scheme"):
+            fingerprint_statement("Anything", "v9")
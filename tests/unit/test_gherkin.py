@@ -84,3 +84,61 @@ class TestGherkinGenerator:
         assert generator._sanitize_filename("My Feature") == "my_feature"
         assert generator._sanitize_filename("Feature-Name") == "feature_name"
         assert generator._sanitize_filename("A/B Test") == "a_b_test"
+
+    def test_unchanged_features_not_rewritten(self, tmp_path: Path) -> None:
+        """Test that regenerating identical features skips the writes."""
+        result = {
+            "requirements": [
+                Requirement(
+                    id="REQ-0001",
+                    statement="The system SHALL export reports",
+                    priority=Priority.P1,
+                    acceptance_criteria=["Reports are exported"],
+                    feature_area="Reports",
+                )
+            ],
+            "test_cases": [],
+        }
+        GherkinGenerator(result, tmp_path).generate()
+        feature_path = tmp_path / "features" / "reports.feature"
+        before = feature_path.stat().st_mtime_ns
+
+        generator = GherkinGenerator(result, tmp_path)
+        generator.generate()
+
+        assert generator.report.written == []
+        assert generator.report.skipped == [feature_path]
+        assert feature_path.stat().st_mtime_ns == before
+
+    def test_parallel_generate(self, tmp_path: Path) -> None:
+        """Test that feature files written on a thread pool match a sequential run."""
+        result = {
+            "requirements": [
+                Requirement(
+                    id=f"REQ-{i:04d}",
+                    statement=f"The system SHALL handle case {i}",
+                    priority=Priority.P1,
+                    acceptance_criteria=[f"Case {i} is handled"],
+                    feature_area=f"Area {i % 3}",
+                )
+                for i in range(1, 10)
+            ],
+            "test_cases": [],
+        }
+
+        sequential = GherkinGenerator(result, tmp_path / "seq").generate()
+        generator = GherkinGenerator(result, tmp_path / "par")
+        parallel = generator.generate(workers=4)
+
+        assert (
+            list(parallel)
+            == list(sequential)
+            == [
+                "area_1.feature",
+                "area_2.feature",
+                "area_0.feature",
+            ]
+        )
+        assert generator.report.written == list(parallel.values())
+        for name, path in parallel.items():
+            assert path.read_text() == sequential[name].read_text()
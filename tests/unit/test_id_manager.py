@@ -1,7 +1,10 @@
 """Tests for ID manager."""
 
+import json
 from pathlib import Path
 
+import pytest
+
 from spec_test_generator.id_manager import IDManager
 
 
@@ -83,3 +86,276 @@ class TestIDManager:
 
         # First 50 chars should be same, so hashes match
         assert hash1 == hash2
+
+    def test_session_defers_save(self, tmp_path: Path) -> None:
+        """Test that allocations in a session are written once on exit."""
+        manager = IDManager(tmp_path)
+        idmap_path = tmp_path / ".idmap.json"
+
+        with manager.session():
+            manager.get_requirement_id("hash1")
+            manager.get_test_id("testhash1")
+            assert not idmap_path.exists()
+            assert manager.has_pending
+
+        assert idmap_path.exists()
+        assert not manager.has_pending
+
+        reloaded = IDManager(tmp_path)
+        assert reloaded.get_requirement_id("hash1") == "REQ-0001"
+        assert reloaded.get_test_id("testhash1") == "TEST-0001"
+
+    def test_session_rollback_on_error(self, tmp_path: Path) -> None:
+        """Test that a failing session discards its allocations."""
+        manager = IDManager(tmp_path)
+        manager.get_requirement_id("kept")
+
+        with pytest.raises(RuntimeError):
+            with manager.session():
+                manager.get_requirement_id("discarded")
+                raise RuntimeError("boom")
+
+        assert not manager.has_pending
+        assert manager.get_all_requirement_ids() == ["REQ-0001"]
+        assert manager.get_requirement_id("other") == "REQ-0002"
+
+    def test_lazy_session_locks_on_first_allocation(self, tmp_path: Path) -> None:
+        """Test that a lazy session writes once, and only if it allocates."""
+        IDManager(tmp_path).get_requirement_id("known")
+        idmap_path = tmp_path / ".idmap.json"
+        before = idmap_path.stat().st_mtime_ns
+
+        manager = IDManager(tmp_path)
+        with manager.session(lazy=True):
+            assert manager.get_requirement_id("known") == "REQ-0001"
+            assert not manager.has_pending
+        assert idmap_path.stat().st_mtime_ns == before
+
+        with manager.session(lazy=True):
+            manager.get_requirement_id("new1")
+            manager.get_requirement_id("new2")
+            assert manager.has_pending
+            assert idmap_path.stat().st_mtime_ns == before
+        assert IDManager(tmp_path).get_all_requirement_ids() == ["REQ-0001", "REQ-0002", "REQ-0003"]
+
+        with pytest.raises(RuntimeError):
+            with manager.session(lazy=True):
+                manager.get_requirement_id("discarded")
+                raise RuntimeError("boom")
+        assert manager.get_all_requirement_ids() == ["REQ-0001", "REQ-0002", "REQ-0003"]
+
+    def test_explicit_flush(self, tmp_path: Path) -> None:
+        """Test flushing pending allocations from inside a session."""
+        manager = IDManager(tmp_path)
+
+        with manager.session():
+            manager.get_requirement_id("hash1")
+            manager.flush()
+            assert IDManager(tmp_path).get_all_requirement_ids() == ["REQ-0001"]
+
+    def test_corrupt_idmap_raises(self, tmp_path: Path) -> None:
+        """Test that a corrupt ID map is reported instead of silently reset."""
+        (tmp_path / ".idmap.json").write_text('{"requirements": {"abc": "REQ-')
+
+        with pytest.raises(ValueError, match="Corrupt ID map"):
+            IDManager(tmp_path)
+
+    def test_save_leaves_no_temp_files(self, tmp_path: Path) -> None:
+        """Test that atomic saves clean up after themselves."""
+        manager = IDManager(tmp_path)
+        manager.get_requirement_id("hash1")
+        manager.get_test_id("testhash1")
+
+        leftovers = [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")]
+        assert leftovers == []
+
+    def test_concurrent_managers_do_not_collide(self, tmp_path: Path) -> None:
+        """Test that managers sharing a directory see each other's allocations."""
+        manager1 = IDManager(tmp_path)
+        manager2 = IDManager(tmp_path)
+
+        assert manager1.get_requirement_id("from_first") == "REQ-0001"
+        assert manager2.get_requirement_id("from_second") == "REQ-0002"
+        assert manager2.get_requirement_id("from_first") == "REQ-0001"
+
+        with manager1.session():
+            assert manager1.get_requirement_id("from_second") == "REQ-0002"
+            assert manager1.get_requirement_id("third") == "REQ-0003"
+
+        assert sorted(IDManager(tmp_path).get_all_requirement_ids()) == [
+            "REQ-0001",
+            "REQ-0002",
+            "REQ-0003",
+        ]
+
+    def test_counters_persisted_in_metadata(self, tmp_path: Path) -> None:
+        """Test that high-water marks are stored alongside the map."""
+        manager = IDManager(tmp_path)
+        manager.get_requirement_id("hash1")
+        manager.get_requirement_id("hash2")
+        manager.get_test_id("testhash1")
+
+        idmap = json.loads((tmp_path / ".idmap.json").read_text())
+        assert idmap["metadata"]["counters"] == {
+            "requirements": {"next": 3, "entries": 2},
+            "tests": {"next": 2, "entries": 1},
+        }
+
+    def test_stored_counter_used_without_scan(self, tmp_path: Path) -> None:
+        """Test that a valid stored counter decides the next number."""
+        idmap = {
+            "requirements": {"hash1": "REQ-0001"},
+            "tests": {},
+            "metadata": {"counters": {"requirements": {"next": 10, "entries": 1}}},
+        }
+        (tmp_path / ".idmap.json").write_text(json.dumps(idmap))
+
+        assert IDManager(tmp_path).get_requirement_id("hash2") == "REQ-0010"
+
+    def test_legacy_map_without_counters(self, tmp_path: Path) -> None:
+        """Test that maps without counters, or with stale ones, are scanned."""
+        idmap = {
+            "requirements": {"hash1": "REQ-0004", "hash2": "REQ-0007"},
+            "tests": {"testhash1": "TEST-0002"},
+            "metadata": {"counters": {"tests": {"next": 2, "entries": 0}}},
+        }
+        (tmp_path / ".idmap.json").write_text(json.dumps(idmap))
+
+        manager = IDManager(tmp_path)
+        assert manager.get_requirement_id("hash3") == "REQ-0008"
+        assert manager.get_test_id("testhash2") == "TEST-0003"
+
+    def test_new_map_records_fingerprint_scheme(self, tmp_path: Path) -> None:
+        """Test that a new map uses and remembers the requested scheme."""
+        manager = IDManager(tmp_path, fingerprint_scheme="v2")
+        manager.get_requirement_id(manager.statement_key("Users can log in"))
+
+        reopened = IDManager(tmp_path)
+        assert reopened.fingerprint_scheme == "v2"
+        assert reopened.get_requirement_id(reopened.statement_key("Users can log in")) == (
+            "REQ-0001"
+        )
+
+    def test_legacy_keys_resolve_after_scheme_switch(self, tmp_path: Path) -> None:
+        """Test that switching schemes keeps existing IDs and rewrites keys."""
+        legacy = IDManager(tmp_path)
+        legacy.get_requirement_id(legacy.statement_key("Users can log in"))
+        legacy.get_requirement_id(legacy.statement_key("Users can log out"))
+        legacy_key = IDManager.hash_statement("Users can log out")
+
+        manager = IDManager(tmp_path, fingerprint_scheme="v2")
+        key = manager.statement_key("Users can log out")
+        assert key != legacy_key
+        assert manager.get_requirement_id(key) == "REQ-0002"
+
+        idmap = json.loads((tmp_path / ".idmap.json").read_text())
+        assert key in idmap["requirements"]
+        assert legacy_key not in idmap["requirements"]
+        assert idmap["metadata"]["legacy_fingerprint"] == "v1"
+
+    def test_migrate_fingerprints_bulk(self, tmp_path: Path) -> None:
+        """Test rewriting every known key in a single pass."""
+        legacy = IDManager(tmp_path)
+        req_id = legacy.get_requirement_id(legacy.statement_key("Users can log in"))
+        legacy.get_test_id(legacy.test_key("Happy path", [req_id]))
+
+        manager = IDManager(tmp_path, fingerprint_scheme="v2")
+        rewritten = manager.migrate_fingerprints(
+            ["Users can log in"], tests=[("Happy path", [req_id])]
+        )
+
+        assert rewritten == 2
+        assert manager.get_test_id(manager.test_key("Happy path", [req_id])) == "TEST-0001"
+        assert manager.get_all_requirement_ids() == ["REQ-0001"]
+
+    def test_resolve_requirements_bulk(self, tmp_path: Path) -> None:
+        """Test resolving many fingerprints in input order with one save."""
+        manager = IDManager(tmp_path)
+        manager.get_requirement_id("existing")
+
+        ids = manager.resolve_requirements(["new1", "existing", "new2", "new1"])
+
+        assert ids == ["REQ-0002", "REQ-0001", "REQ-0003", "REQ-0002"]
+        assert not manager.has_pending
+        assert IDManager(tmp_path).resolve_requirements(["new2"]) == ["REQ-0003"]
+
+    def test_resolve_tests_contiguous_block(self, tmp_path: Path) -> None:
+        """Test that test misses are allocated as one contiguous block."""
+        manager = IDManager(tmp_path)
+
+        assert manager.resolve_tests(["t1", "t2", "t3"]) == ["TEST-0001", "TEST-0002", "TEST-0003"]
+        assert manager.resolve_tests([]) == []
+
+    def test_read_only_never_writes(self, tmp_path: Path) -> None:
+        """Test that read-only mode hands out provisional IDs without saving."""
+        IDManager(tmp_path).get_requirement_id("stored")
+        before = (tmp_path / ".idmap.json").read_text()
+
+        manager = IDManager(tmp_path, read_only=True)
+        assert manager.get_requirement_id("stored") == "REQ-0001"
+        assert manager.get_requirement_id("unknown1") == "REQ-0002"
+        assert manager.resolve_requirements(["unknown2", "unknown1"]) == ["REQ-0003", "REQ-0002"]
+
+        assert (tmp_path / ".idmap.json").read_text() == before
+        assert IDManager(tmp_path).get_requirement_id("unknown2") == "REQ-0002"
+
+    def test_read_only_missing_map(self, tmp_path: Path) -> None:
+        """Test that read-only mode does not create the output directory."""
+        output_dir = tmp_path / "spec"
+
+        manager = IDManager(output_dir, read_only=True)
+        with manager.session():
+            assert manager.get_test_id("testhash") == "TEST-0001"
+
+        assert not output_dir.exists()
+
+    def test_collect_garbage_retires_unseen_entries(self, tmp_path: Path) -> None:
+        """Test that entries unseen for K generations are retired, not reused."""
+        manager = IDManager(tmp_path, track_generations=True)
+        manager.resolve_requirements(["live", "dropped"])
+        manager.record_generation()
+        manager.resolve_requirements(["live"])
+        manager.record_generation()
+
+        assert manager.collect_garbage(2) == {"requirements": [], "tests": []}
+        assert manager.collect_garbage(1, dry_run=True)["requirements"] == ["REQ-0002"]
+        assert manager.get_all_requirement_ids() == ["REQ-0001", "REQ-0002"]
+
+        assert manager.collect_garbage(1)["requirements"] == ["REQ-0002"]
+        assert manager.get_all_requirement_ids() == ["REQ-0001"]
+
+        # Neither the stored counter nor a full rescan may hand REQ-0002 out again
+        reloaded = IDManager(tmp_path)
+        assert reloaded.get_requirement_id("dropped") == "REQ-0003"
+        data = json.loads((tmp_path / ".idmap.json").read_text())
+        del data["metadata"]["counters"]
+        del data["requirements"]["dropped"]
+        (tmp_path / ".idmap.json").write_text(json.dumps(data))
+        assert IDManager(tmp_path).get_requirement_id("new") == "REQ-0003"
+
+    def test_collect_garbage_counts_generations_per_document(self, tmp_path: Path) -> None:
+        """Test that runs of one document do not age another document's entries."""
+        manager = IDManager(tmp_path, track_generations=True)
+        manager.resolve_requirements(["billing"])
+        assert manager.record_generation("billing.md") == 1
+        for _ in range(3):
+            manager.resolve_requirements(["reports"])
+            manager.record_generation("reports.md")
+
+        assert manager.collect_garbage(1)["requirements"] == []
+
+        manager.resolve_requirements(["reports"])
+        manager.record_generation("billing.md")
+        assert manager.collect_garbage(1)["requirements"] == ["REQ-0001"]
+        assert manager.get_all_requirement_ids() == ["REQ-0002"]
+
+    def test_collect_garbage_requires_generations(self, tmp_path: Path) -> None:
+        """Test that GC refuses to run on a map without generation history."""
+        manager = IDManager(tmp_path)
+        manager.get_requirement_id("hash1")
+
+        with pytest.raises(ValueError, match="no recorded generations"):
+            manager.collect_garbage(3)
+        with pytest.raises(RuntimeError):
+            manager.record_generation()
+        assert manager.get_all_requirement_ids() == ["REQ-0001"]
@@ -0,0 +1,329 @@
+"""Tests for ID map storage backends."""
+
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+from spec_test_generator import SpecTestGenerator
+from spec_test_generator.id_manager import IDManager
+from spec_test_generator.id_store import (
+    JournalStore,
+    JSONStore,
+    SnapshotStore,
+    SQLiteStore,
+    create_store,
+)
+
+
+class TestJournalStore:
+    """Tests for JournalStore class."""
+
+    def test_allocations_append_to_journal(self, tmp_path: Path) -> None:
+        """Test that saves after the first snapshot only append records."""
+        manager = IDManager(tmp_path, store=JournalStore(tmp_path))
+        manager.get_requirement_id("hash1")
+        snapshot = (tmp_path / ".idmap.json").read_text()
+
+        manager.get_requirement_id("hash2")
+        manager.get_test_id("testhash1")
+
+        assert (tmp_path / ".idmap.json").read_text() == snapshot
+        records = [json.loads(line) for line in (tmp_path / ".idmap.journal").open()]
+        assert records == [
+            {"c": "requirements", "k": "hash2", "v": "REQ-0002"},
+            {"c": "tests", "k": "testhash1", "v": "TEST-0001"},
+        ]
+
+    def test_journal_replayed_on_load(self, tmp_path: Path) -> None:
+        """Test that a new manager sees journaled allocations."""
+        manager1 = IDManager(tmp_path, store=JournalStore(tmp_path))
+        for i in range(5):
+            manager1.get_requirement_id(f"hash{i}")
+
+        manager2 = IDManager(tmp_path, store=JournalStore(tmp_path))
+        assert manager2.get_requirement_id("hash4") == "REQ-0005"
+        assert manager2.get_requirement_id("new") == "REQ-0006"
+
+    def test_compaction_past_threshold(self, tmp_path: Path) -> None:
+        """Test that the journal is folded into the snapshot when it grows."""
+        store = JournalStore(tmp_path, compact_threshold=3)
+        manager = IDManager(tmp_path, store=store)
+        for i in range(6):
+            manager.get_requirement_id(f"hash{i}")
+
+        snapshot = json.loads((tmp_path / ".idmap.json").read_text())
+        assert len(snapshot["requirements"]) >= 4
+        assert len(IDManager(tmp_path, store=JournalStore(tmp_path)).get_all_requirement_ids()) == 6
+
+    def test_counters_maintained_during_replay(self, tmp_path: Path) -> None:
+        """Test that journaled allocations advance the snapshot's counters."""
+        manager1 = IDManager(tmp_path, store=JournalStore(tmp_path))
+        manager1.get_requirement_id("hash1")
+        manager1.get_requirement_id("hash2")
+
+        store = JournalStore(tmp_path)
+        manager2 = IDManager(tmp_path, store=store)
+        assert store._idmap["metadata"]["counters"]["requirements"] == {"next": 3, "entries": 2}
+        assert manager2.get_requirement_id("hash3") == "REQ-0003"
+
+    def test_torn_final_record_ignored(self, tmp_path: Path) -> None:
+        """Test that an interrupted append does not poison the journal."""
+        manager = IDManager(tmp_path, store=JournalStore(tmp_path))
+        manager.get_requirement_id("hash1")
+        manager.get_requirement_id("hash2")
+        with open(tmp_path / ".idmap.journal", "a") as f:
+            f.write('{"c":"requirements","k":"hash3","v":"REQ-')
+
+        reloaded = IDManager(tmp_path, store=JournalStore(tmp_path))
+        assert reloaded.get_all_requirement_ids() == ["REQ-0001", "REQ-0002"]
+
+        # The next append replaces the torn bytes instead of completing them
+        assert reloaded.get_requirement_id("hash4") == "REQ-0003"
+        lines = (tmp_path / ".idmap.journal").read_text().splitlines()
+        assert [json.loads(line)["k"] for line in lines] == ["hash2", "hash4"]
+        again = IDManager(tmp_path, store=JournalStore(tmp_path))
+        assert again.get_all_requirement_ids() == ["REQ-0001", "REQ-0002", "REQ-0003"]
+        assert again.get_requirement_id("hash4") == "REQ-0003"
+
+    def test_snapshot_readable_by_json_store(self, tmp_path: Path) -> None:
+        """Test that a compacted journal directory can be read as plain JSON."""
+        store = JournalStore(tmp_path)
+        manager = IDManager(tmp_path, store=store)
+        manager.get_requirement_id("hash1")
+        manager.get_requirement_id("hash2")
+        store.compact()
+
+        assert IDManager(tmp_path, store=JSONStore(tmp_path)).get_requirement_id("hash2") == (
+            "REQ-0002"
+        )
+
+    def test_collect_garbage_compacts(self, tmp_path: Path) -> None:
+        """Test that GC folds the journal and its removals into the snapshot."""
+        manager = IDManager(tmp_path, store=JournalStore(tmp_path), track_generations=True)
+        manager.resolve_requirements(["keep", "drop"])
+        manager.record_generation()
+        manager.get_requirement_id("keep")
+        manager.record_generation()
+        manager.collect_garbage(1)
+
+        assert not (tmp_path / ".idmap.journal").exists()
+        reloaded = IDManager(tmp_path, store=JournalStore(tmp_path))
+        assert reloaded.get_all_requirement_ids() == ["REQ-0001"]
+        assert reloaded.get_requirement_id("drop") == "REQ-0003"
+
+
+class TestSQLiteStore:
+    """Tests for SQLiteStore class."""
+
+    def test_allocate_and_persist(self, tmp_path: Path) -> None:
+        """Test allocating IDs and reading them back from the database."""
+        manager1 = IDManager(tmp_path, store=SQLiteStore(tmp_path))
+        assert manager1.get_requirement_id("hash1") == "REQ-0001"
+        assert manager1.get_test_id("testhash1") == "TEST-0001"
+        manager1.close()
+
+        manager2 = IDManager(tmp_path, store=SQLiteStore(tmp_path))
+        assert manager2.get_requirement_id("hash1") == "REQ-0001"
+        assert manager2.get_requirement_id("hash2") == "REQ-0002"
+        assert manager2.get_all_test_ids() == ["TEST-0001"]
+        manager2.close()
+
+    def test_resolve_in_bulk(self, tmp_path: Path) -> None:
+        """Test bulk resolution against the database."""
+        manager = IDManager(tmp_path, store=SQLiteStore(tmp_path))
+        manager.get_requirement_id("existing")
+
+        ids = manager.resolve_requirements(["new1", "existing", "new2"])
+
+        assert ids == ["REQ-0002", "REQ-0001", "REQ-0003"]
+        manager.close()
+
+    def test_session_rollback(self, tmp_path: Path) -> None:
+        """Test that a failing session leaves the database untouched."""
+        manager = IDManager(tmp_path, store=SQLiteStore(tmp_path))
+
+        with pytest.raises(RuntimeError):
+            with manager.session():
+                manager.get_requirement_id("discarded")
+                raise RuntimeError("boom")
+
+        assert manager.get_all_requirement_ids() == []
+        assert manager.get_requirement_id("kept") == "REQ-0001"
+        manager.close()
+
+    def test_imports_existing_json_map(self, tmp_path: Path) -> None:
+        """Test that a new database is seeded from .idmap.json."""
+        json_manager = IDManager(tmp_path)
+        json_manager.get_requirement_id("hash1")
+        json_manager.get_requirement_id("hash2")
+
+        manager = IDManager(tmp_path, store=SQLiteStore(tmp_path))
+        assert manager.get_requirement_id("hash2") == "REQ-0002"
+        assert manager.get_requirement_id("hash3") == "REQ-0003"
+        manager.close()
+
+    def test_ids_in_numeric_order(self, tmp_path: Path) -> None:
+        """Test that IDs past the padding width are listed after shorter ones."""
+        IDManager(tmp_path).get_requirement_id("hash1")
+        idmap = tmp_path / ".idmap.json"
+        idmap.write_text(idmap.read_text().replace("REQ-0001", "REQ-9999"))
+
+        manager = IDManager(tmp_path, store=SQLiteStore(tmp_path))
+        assert manager.get_requirement_id("hash2") == "REQ-10000"
+        assert manager.get_all_requirement_ids() == ["REQ-9999", "REQ-10000"]
+        manager.close()
+
+    def test_concurrent_connections_do_not_collide(self, tmp_path: Path) -> None:
+        """Test that two connections to one database allocate distinct IDs."""
+        manager1 = IDManager(tmp_path, store=SQLiteStore(tmp_path))
+        manager2 = IDManager(tmp_path, store=SQLiteStore(tmp_path))
+
+        assert manager1.get_requirement_id("first") == "REQ-0001"
+        assert manager2.get_requirement_id("second") == "REQ-0002"
+        assert manager2.get_requirement_id("first") == "REQ-0001"
+        manager1.close()
+        manager2.close()
+
+    def test_collect_garbage(self, tmp_path: Path) -> None:
+        """Test retiring entries from the database without reusing their numbers."""
+        manager = IDManager(tmp_path, store=SQLiteStore(tmp_path), track_generations=True)
+        manager.resolve_tests(["t1", "t2", "t3"])
+        manager.record_generation()
+        manager.resolve_tests(["t1"])
+        manager.record_generation()
+
+        assert manager.collect_garbage(1)["tests"] == ["TEST-0002", "TEST-0003"]
+        assert manager.get_all_test_ids() == ["TEST-0001"]
+        assert manager.get_test_id("t2") == "TEST-0004"
+        assert manager.store.get_metadata("retired") == {"tests": {"count": 2, "through": 3}}
+        manager.close()
+
+
+class TestSnapshotStore:
+    """Tests for SnapshotStore class."""
+
+    def _keys(self, count: int) -> list[str]:
+        return [f"{i:012x}" for i in range(count, 0, -1)]
+
+    def test_open_maps_binary_snapshot(self, tmp_path: Path) -> None:
+        """Test that a fresh snapshot serves lookups without loading the JSON."""
+        keys = self._keys(50)
+        IDManager(tmp_path, store=SnapshotStore(tmp_path)).resolve_requirements(keys)
+        IDManager(tmp_path, store=SnapshotStore(tmp_path)).resolve_tests(keys[:3])
+
+        store = SnapshotStore(tmp_path)
+        manager = IDManager(tmp_path, store=store)
+        assert store.is_mapped
+        assert manager.resolve_requirements([keys[0], keys[49], "ffffffffffff"]) == [
+            "REQ-0001",
+            "REQ-0050",
+            "REQ-0051",
+        ]
+        assert not store.is_mapped
+        manager.close()
+
+        store = SnapshotStore(tmp_path)
+        manager = IDManager(tmp_path, store=store, read_only=True)
+        assert manager.get_test_id(keys[2]) == "TEST-0003"
+        assert manager.get_test_id("000000000fff") == "TEST-0004"
+        assert manager.get_all_requirement_ids()[-1] == "REQ-0051"
+        assert store.get_metadata("req_prefix") == "REQ"
+        assert store.is_mapped
+
+    def test_generation_with_known_ids_stays_mapped(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that regenerating a PRD whose IDs are all mapped never loads the JSON."""
+        prd = tmp_path / "prd.md"
+        prd.write_text("# PRD: Reports\n\n## Functional Requirements\n1) Users can list reports\n")
+        policy = tmp_path / "policy.yaml"
+        policy.write_text("ids:\n  storage: snapshot\n")
+        output_dir = tmp_path / "spec"
+        SpecTestGenerator(prd, policy_path=policy, output_dir=output_dir).generate()
+        assert (output_dir / ".idmap.bin").exists()
+
+        def fail(self: SnapshotStore) -> None:
+            raise AssertionError("full ID map loaded")
+
+        monkeypatch.setattr(SnapshotStore, "_materialize", fail)
+        generator = SpecTestGenerator(prd, policy_path=policy, output_dir=output_dir)
+        result = generator.generate()
+
+        assert [req.id for req in result["requirements"]] == ["REQ-0001"]
+        store = generator._get_id_manager().store
+        assert isinstance(store, SnapshotStore) and store.is_mapped
+
+    def test_stale_snapshot_falls_back_to_json(self, tmp_path: Path) -> None:
+        """Test that the snapshot is ignored once .idmap.json changes."""
+        IDManager(tmp_path, store=SnapshotStore(tmp_path)).get_requirement_id("aaaaaaaaaaaa")
+        IDManager(tmp_path).get_requirement_id("bbbbbbbbbbbb")
+
+        store = SnapshotStore(tmp_path)
+        manager = IDManager(tmp_path, store=store)
+        assert not store.is_mapped
+        assert manager.get_requirement_id("bbbbbbbbbbbb") == "REQ-0002"
+
+    def test_write_racing_the_lock_is_not_lost(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a save landing just before the lock is taken is loaded, not remapped."""
+        IDManager(tmp_path, store=SnapshotStore(tmp_path)).get_requirement_id("aaaaaaaaaaaa")
+        store = SnapshotStore(tmp_path)
+        manager1 = IDManager(tmp_path, store=store)
+        manager2 = IDManager(tmp_path, store=SnapshotStore(tmp_path))
+        assert store.is_mapped
+
+        file_lock = store._file_lock
+        raced = False
+
+        @contextmanager
+        def racing_lock() -> Iterator[None]:
+            nonlocal raced
+            if not raced:
+                raced = True
+                assert manager2.get_requirement_id("bbbbbbbbbbbb") == "REQ-0002"
+            with file_lock():
+                yield
+
+        monkeypatch.setattr(store, "_file_lock", racing_lock)
+
+        assert manager1.get_requirement_id("cccccccccccc") == "REQ-0003"
+        assert manager2.get_requirement_id("dddddddddddd") == "REQ-0004"
+        reloaded = IDManager(tmp_path, store=SnapshotStore(tmp_path))
+        assert reloaded.get_all_requirement_ids() == [
+            "REQ-0001",
+            "REQ-0002",
+            "REQ-0003",
+            "REQ-0004",
+        ]
+        assert reloaded.get_requirement_id("cccccccccccc") == "REQ-0003"
+
+    def test_no_snapshot_for_irregular_keys(self, tmp_path: Path) -> None:
+        """Test that maps with non-hex keys are kept in JSON only."""
+        manager = IDManager(tmp_path, store=SnapshotStore(tmp_path))
+        manager.get_requirement_id("aaaaaaaaaaaa")
+        assert (tmp_path / ".idmap.bin").exists()
+
+        manager.get_requirement_id("hash1")
+        assert not (tmp_path / ".idmap.bin").exists()
+        reloaded = IDManager(tmp_path, store=SnapshotStore(tmp_path))
+        assert reloaded.get_requirement_id("hash1") == "REQ-0002"
+
+
+class TestCreateStore:
+    """Tests for create_store factory."""
+
+    def test_known_backends(self, tmp_path: Path) -> None:
+        """Test creating stores by name."""
+        assert isinstance(create_store("json", tmp_path), JSONStore)
+        assert isinstance(create_store("journal", tmp_path), JournalStore)
+        assert isinstance(create_store("snapshot", tmp_path), SnapshotStore)
+        assert isinstance(create_store("sqlite", tmp_path), SQLiteStore)
+
+    def test_unknown_backend(self, tmp_path: Path) -> None:
+        """Test that unknown backend names are rejected."""
+        with pytest.raises(ValueError, match="Unknown ID storage backend"):
+            create_store("cassandra", tmp_path)
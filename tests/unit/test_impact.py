@@ -2,6 +2,8 @@
 
 from pathlib import Path
 
+from spec_test_generator import SpecTestGenerator
+from spec_test_generator.generator import load_policy
 from spec_test_generator.impact import ImpactAnalyzer
 
 
@@ -170,3 +172,40 @@ class TestImpactAnalyzer:
 
         assert path.exists()
         assert "IMPACT_REPORT.md" in str(path)
+
+    def test_compare_does_not_write(self, tmp_path: Path) -> None:
+        """Test that comparing PRDs leaves the output directory untouched."""
+        baseline = tmp_path / "baseline.md"
+        baseline.write_text("# PRD\n\n## Functional Requirements\n1) Req A")
+
+        current = tmp_path / "current.md"
+        current.write_text("# PRD\n\n## Functional Requirements\n1) Req A\n2) Req B")
+
+        output_dir = tmp_path / "spec"
+        analyzer = ImpactAnalyzer(output_dir)
+        report = analyzer.compare(baseline, current)
+
+        added = [c for c in report.changes if c.change_type == "added"]
+        assert added[0].req_id == "REQ-0002"
+        assert not output_dir.exists()
+
+    def test_reads_ids_with_policy_storage(self, tmp_path: Path) -> None:
+        """Test that the policy's ID backend and prefixes are used to look up IDs."""
+        baseline = tmp_path / "baseline.md"
+        baseline.write_text("# PRD\n\n## Functional Requirements\n1) Req A\n2) Req B")
+
+        current = tmp_path / "current.md"
+        current.write_text("# PRD\n\n## Functional Requirements\n1) Req A")
+
+        policy_path = tmp_path / "policy.yaml"
+        policy_path.write_text("ids:\n  storage: sqlite\n  requirement_prefix: R\n")
+        output_dir = tmp_path / "spec"
+        SpecTestGenerator(baseline, policy_path=policy_path, output_dir=output_dir).generate()
+
+        analyzer = ImpactAnalyzer(output_dir, policy=load_policy(policy_path))
+        report = analyzer.compare(baseline, current)
+        analyzer.close()
+
+        removed = [c for c in report.changes if c.change_type == "removed"]
+        assert removed[0].req_id == "R-0002"
+        assert not (output_dir / ".idmap.json").exists()
@@ -0,0 +1,56 @@
+"""Tests for keyword rule matching."""
+
+import random
+
+from spec_test_generator.keywords import DEFAULT_KEYWORD_RULES, KeywordMatcher, keyword_matcher
+from spec_test_generator.models import PolicyConfig
+
+
+class TestKeywordMatcher:
+    """Tests for KeywordMatcher class."""
+
+    def test_scan_sets_rule_bits(self) -> None:
+        """Test that a scan reports every rule with a keyword in the text."""
+        matcher = KeywordMatcher(DEFAULT_KEYWORD_RULES)
+
+        keywords = matcher.scan("Users must be AUTHENTICATED to see the list")
+
+        matched = [name for name in matcher.rules if matcher.has(keywords, name)]
+        assert matched == ["validation", "listing", "auth", "user"]
+        assert keywords == matcher.mask("validation", "listing", "auth", "user")
+
+    def test_overlapping_keywords(self) -> None:
+        """Test keywords inside or overlapping other keywords."""
+        matcher = KeywordMatcher({"a": ["ab"], "b": ["bc"], "c": ["abcd"], "d": ["c"]})
+
+        assert matcher.scan("abc") == matcher.mask("a", "b", "d")
+        assert matcher.scan("xabcdx") == matcher.mask("a", "b", "c", "d")
+        assert matcher.scan("nothing here") == 0
+
+    def test_matches_substring_checks(self) -> None:
+        """Test that scans agree with one substring check per keyword."""
+        matcher = KeywordMatcher(DEFAULT_KEYWORD_RULES)
+        words = ["must", "auth", "listing", "Error", "user", "data", "base", "x", " "]
+        rng = random.Random(7)
+
+        for _ in range(500):
+            text = "".join(rng.choice(words) for _ in range(rng.randint(0, 8)))
+            expected = {
+                name
+                for name, keywords in DEFAULT_KEYWORD_RULES.items()
+                if any(keyword in text.lower() for keyword in keywords)
+            }
+            keywords = matcher.scan(text)
+            assert {name for name in matcher.rules if matcher.has(keywords, name)} == expected
+
+    def test_policy_rules(self) -> None:
+        """Test that policies override rules and share compiled matchers."""
+        policy = PolicyConfig.from_dict({"keywords": {"auth": ["login", "sso"], "pii": ["ssn"]}})
+
+        matcher = keyword_matcher(policy)
+
+        assert matcher.has(matcher.scan("SSO login"), "auth")
+        assert not matcher.has(matcher.scan("auth token"), "auth")
+        assert matcher.has(matcher.scan("store the SSN"), "pii")
+        assert keyword_matcher(PolicyConfig.from_dict(dict(policy.config))) is matcher
+        assert keyword_matcher(PolicyConfig.from_dict({})).rules == tuple(DEFAULT_KEYWORD_RULES)
@@ -0,0 +1,145 @@
+"""Tests for output artifact writing."""
+
+from pathlib import Path
+
+import pytest
+
+from spec_test_generator import models
+from spec_test_generator.models import PolicyConfig, Priority, Requirement
+from spec_test_generator.output import (
+    ARTIFACT_MANIFEST_FILE,
+    ArtifactManifest,
+    ArtifactWriteError,
+    OutputGenerator,
+    write_if_changed,
+)
+
+
+def _result() -> dict:
+    return {
+        "requirements": [
+            Requirement(id="REQ-0001", statement="The system SHALL export", priority=Priority.P0),
+            Requirement(
+                id="REQ-0002",
+                statement="The system SHALL list reports",
+                priority=Priority.P1,
+                feature_area="Reports",
+            ),
+        ],
+        "test_plan": models.TestPlan(strategy={"Unit tests": "Everything"}),
+        "test_cases": [],
+        "traceability": [],
+    }
+
+
+class TestArtifactManifest:
+    """Tests for ArtifactManifest class."""
+
+    def test_trusts_digest_of_unmodified_files(self, tmp_path: Path) -> None:
+        """Test that a file the manifest recorded is compared without reading it."""
+        path = tmp_path / "a.md"
+        manifest = ArtifactManifest(tmp_path)
+        assert write_if_changed(path, "one", manifest)
+        manifest.save()
+
+        manifest = ArtifactManifest(tmp_path)
+        assert not write_if_changed(path, "one", manifest)
+        assert write_if_changed(path, "two", manifest)
+        assert not write_if_changed(path, "two", manifest)
+
+    def test_detects_external_edits(self, tmp_path: Path) -> None:
+        """Test that a file edited outside the generator is hashed, not trusted."""
+        path = tmp_path / "a.md"
+        manifest = ArtifactManifest(tmp_path)
+        write_if_changed(path, "one", manifest)
+        manifest.save()
+
+        path.write_text("edited")
+
+        manifest = ArtifactManifest(tmp_path)
+        assert write_if_changed(path, "one", manifest)
+        assert path.read_text() == "one"
+
+    def test_unknown_identical_file_is_skipped(self, tmp_path: Path) -> None:
+        """Test that an existing identical file is kept and added to the manifest."""
+        path = tmp_path / "a.md"
+        path.write_text("one")
+        before = path.stat().st_mtime_ns
+
+        manifest = ArtifactManifest(tmp_path)
+        assert not write_if_changed(path, "one", manifest)
+        manifest.save()
+
+        assert path.stat().st_mtime_ns == before
+        assert "a.md" in (tmp_path / ARTIFACT_MANIFEST_FILE).read_text()
+
+
+class TestOutputGenerator:
+    """Tests for OutputGenerator write reports."""
+
+    def test_reports_written_and_skipped(self, tmp_path: Path) -> None:
+        """Test that a rerun with the same result skips every artifact."""
+        policy = PolicyConfig.from_dict({})
+        first = OutputGenerator(_result(), policy, tmp_path)
+        artifacts = first.generate_all()
+        assert sorted(first.report.written) == sorted(artifacts.values())
+        assert first.report.skipped == []
+
+        result = _result()
+        result["test_plan"].strategy["E2E tests"] = "Top flows"
+        second = OutputGenerator(result, policy, tmp_path)
+        second.generate_all()
+
+        assert second.report.written == [tmp_path / "TEST_PLAN.md"]
+        assert len(second.report.skipped) == 3
+
+    def test_parallel_matches_sequential(self, tmp_path: Path) -> None:
+        """Test that parallel writes produce the same files, mapping and report."""
+        policy = PolicyConfig.from_dict({})
+        runs = {}
+        for workers in (1, 4):
+            output_dir = tmp_path / str(workers)
+            output_dir.mkdir()
+            output = OutputGenerator(_result(), policy, output_dir, workers=workers)
+            artifacts = output.generate_all(gherkin=True)
+            runs[workers] = (
+                {name: path.relative_to(output_dir) for name, path in artifacts.items()},
+                [path.relative_to(output_dir) for path in output.report.written],
+                {
+                    path.relative_to(output_dir): path.read_bytes()
+                    for path in sorted(output_dir.rglob("*"))
+                    if path.is_file() and path.name != ARTIFACT_MANIFEST_FILE
+                },
+            )
+
+        names = list(runs[1][0])
+        assert names[:4] == ["REQUIREMENTS.md", "TEST_PLAN.md", "TEST_CASES.md", "TRACEABILITY.csv"]
+        assert names[4:] == ["features/general.feature", "features/reports.feature"]
+        assert runs[4] == runs[1]
+
+    def test_workers_default_to_policy(self, tmp_path: Path) -> None:
+        """Test that workers come from the policy's output.workers."""
+        policy = PolicyConfig.from_dict({"output": {"workers": 3}})
+
+        assert OutputGenerator(_result(), policy, tmp_path).workers == 3
+        assert OutputGenerator(_result(), PolicyConfig.from_dict({}), tmp_path).workers == 1
+
+    def test_failures_are_collected(self, tmp_path: Path) -> None:
+        """Test that every artifact is attempted and all failures are raised together."""
+        # Directories in the way of two artifacts
+        (tmp_path / "TEST_PLAN.md").mkdir()
+        (tmp_path / "TRACEABILITY.csv").mkdir()
+        output = OutputGenerator(_result(), PolicyConfig.from_dict({}), tmp_path, workers=4)
+
+        with pytest.raises(ArtifactWriteError, match="Failed to write 2 artifact") as exc_info:
+            output.generate_all()
+
+        assert list(exc_info.value.errors) == ["TEST_PLAN.md", "TRACEABILITY.csv"]
+        assert (tmp_path / "REQUIREMENTS.md").is_file()
+        assert (tmp_path / "TEST_CASES.md").is_file()
+        assert not [path for path in tmp_path.iterdir() if path.suffix == ".tmp"]
+        # The artifacts that were written are in the manifest
+        manifest = ArtifactManifest(tmp_path)
+        assert not write_if_changed(
+            tmp_path / "TEST_CASES.md", (tmp_path / "TEST_CASES.md").read_text(), manifest
+        )
@@ -0,0 +1,96 @@
+"""Tests for the shared parse cache."""
+
+import os
+from pathlib import Path
+
+from spec_test_generator.parse_cache import ParseCache, get_parse_cache
+from spec_test_generator.parser import PRDParser
+
+PRD = "# PRD: Test\n\n## Functional Requirements\n1) First\n2) Second\n"
+
+
+class TestParseCache:
+    """Tests for ParseCache class."""
+
+    def test_reuses_parse_of_same_version(self, tmp_path: Path) -> None:
+        """Test that parsers of an unchanged file share one parse."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(PRD)
+        cache = ParseCache()
+
+        first = PRDParser(prd_file, parse_cache=cache).parse()
+        first.functional_requirements.append("Mutated")
+        second = PRDParser(prd_file, parse_cache=cache).parse()
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert second.functional_requirements == ["First", "Second"]
+
+    def test_reparses_changed_content(self, tmp_path: Path) -> None:
+        """Test that edits miss while a touch without edits still hits."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(PRD)
+        cache = ParseCache()
+        PRDParser(prd_file, parse_cache=cache).parse()
+
+        st = prd_file.stat()
+        os.utime(prd_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        PRDParser(prd_file, parse_cache=cache).parse()
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        prd_file.write_text(PRD + "3) Third\n")
+        parsed = PRDParser(prd_file, parse_cache=cache).parse()
+        assert parsed.functional_requirements == ["First", "Second", "Third"]
+        assert cache.misses == 2
+
+    def test_lru_eviction(self, tmp_path: Path) -> None:
+        """Test that the least recently used parse is evicted first."""
+        cache = ParseCache(maxsize=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.md"
+            path.write_text(PRD.replace("Test", name))
+            paths.append(path)
+
+        for path in (paths[0], paths[1], paths[0], paths[2], paths[0]):
+            PRDParser(path, parse_cache=cache).parse()
+
+        assert cache.misses == 3
+        PRDParser(paths[1], parse_cache=cache).parse()
+        assert cache.misses == 4
+
+    def test_on_disk_entries_shared(self, tmp_path: Path) -> None:
+        """Test that a cache directory serves parses to a fresh cache."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(PRD)
+        PRDParser(prd_file, parse_cache=ParseCache(directory=tmp_path / "cache")).parse()
+
+        cache = ParseCache(directory=tmp_path / "cache")
+        parsed = PRDParser(prd_file, parse_cache=cache).parse()
+
+        assert (cache.hits, cache.misses) == (1, 0)
+        assert parsed == PRDParser(prd_file).parse()
+
+    def test_hit_sets_section_layout(self, tmp_path: Path) -> None:
+        """Test that parsers served from the cache can read sections on demand."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(PRD + "\n## Nötes\n- Ünïcode note\n", encoding="utf-8")
+        PRDParser(prd_file, use_mmap=True, parse_cache=ParseCache(directory=tmp_path / "c")).parse()
+
+        for cache in (get_parse_cache(tmp_path / "c"), ParseCache(directory=tmp_path / "c")):
+            PRDParser(prd_file, use_mmap=True, parse_cache=cache).parse()
+            parser = PRDParser(prd_file, use_mmap=True, parse_cache=cache)
+            parser.parse()
+
+            assert cache.misses == 0
+            assert parser.headings is not None
+            assert [node.title for node in parser.headings.level(2)] == [
+                "Functional Requirements",
+                "Nötes",
+            ]
+            assert parser.section_text("Nötes") == "- Ünïcode note\n"
+
+    def test_get_parse_cache_is_process_wide(self, tmp_path: Path) -> None:
+        """Test that the shared caches are singletons per directory."""
+        assert get_parse_cache() is get_parse_cache()
+        assert get_parse_cache(tmp_path) is get_parse_cache(str(tmp_path))
+        assert get_parse_cache(tmp_path).directory == tmp_path.resolve()
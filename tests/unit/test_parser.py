@@ -4,7 +4,7 @@ from pathlib import Path
 
 import pytest
 
-from spec_test_generator.parser import PRDParser
+from spec_test_generator.parser import _SECTION_KINDS, PRDParser, _classify_by_keywords
 
 
 class TestPRDParser:
@@ -80,3 +80,181 @@ Build something cool
 
         assert len(result.notes) == 2
         assert "Important note 1" in result.notes[0]
+
+    def test_streaming_matches_default(self) -> None:
+        """Test that streaming mode extracts the same fields as the default parse."""
+        prd_file = Path(__file__).parents[2] / "examples" / "sample_prd.md"
+
+        default = PRDParser(prd_file).parse()
+        streamed = PRDParser(prd_file, streaming=True).parse()
+
+        assert streamed.raw_content == ""
+        streamed.raw_content = default.raw_content
+        assert streamed == default
+
+    def test_streaming_keeps_raw_content_on_request(self, tmp_path: Path) -> None:
+        """Test that streaming mode only keeps the raw text when asked."""
+        prd_content = "# PRD: Test\n\n## Goal\nShip it\n\n## Requirements\n1) Do it\n"
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(prd_content)
+
+        result = PRDParser(prd_file, streaming=True, keep_raw_content=True).parse()
+
+        assert result.raw_content == prd_content
+        assert result.goal == "Ship it"
+        assert result.functional_requirements == ["Do it"]
+
+    def test_section_cache_reparses_changed_sections_only(self, tmp_path: Path) -> None:
+        """Test that only sections whose content changed are re-extracted."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(
+            "# PRD: Test\n\n## Functional Requirements\n1) First\n2) Second\n\n## Notes\n- A note\n"
+        )
+        cache_dir = tmp_path / "spec"
+
+        first = PRDParser(prd_file, cache_dir=cache_dir)
+        first.parse()
+        assert first.reparsed_sections == ["Functional Requirements", "Notes"]
+
+        prd_file.write_text(
+            "# PRD: Test\n\n## Functional Requirements\n1) First\n2) Second\n3) Third\n\n"
+            "## Notes\n- A note\n"
+        )
+        second = PRDParser(prd_file, cache_dir=cache_dir)
+        result = second.parse()
+
+        assert second.reparsed_sections == ["Functional Requirements"]
+        assert result.functional_requirements == ["First", "Second", "Third"]
+        assert result.notes == ["A note"]
+
+        uncached = PRDParser(prd_file).parse()
+        uncached.section_hashes = result.section_hashes
+        assert result == uncached
+
+    def test_corrupt_section_cache_ignored(self, tmp_path: Path) -> None:
+        """Test that an unreadable cache is treated as empty and rewritten."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text("# PRD\n\n## Notes\n- A note\n")
+        (tmp_path / ".prdcache.json").write_text("{not json")
+
+        parser = PRDParser(prd_file, cache_dir=tmp_path)
+        assert parser.parse().notes == ["A note"]
+        assert parser.reparsed_sections == ["Notes"]
+        assert PRDParser(prd_file, cache_dir=tmp_path).parse().notes == ["A note"]
+
+    def test_mmap_matches_default(self) -> None:
+        """Test that memory-mapped parsing extracts the same fields."""
+        prd_file = Path(__file__).parents[2] / "examples" / "sample_prd.md"
+
+        default = PRDParser(prd_file).parse()
+        mapped = PRDParser(prd_file, use_mmap=True, keep_raw_content=True).parse()
+
+        assert mapped == default
+
+    def test_modes_agree_on_unicode_list_items(self, tmp_path: Path) -> None:
+        """Test that non-ASCII digits and whitespace start list items in every mode."""
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(
+            "# PRD: Test\n\n## Functional Requirements\n"
+            "١. Arabic-Indic numbered\n３) Full-width numbered\n\u00a0- Indented bullet\n"
+            "-\u00a0Bullet\nÜnïcode prose\n - Ünïcode bullet\n1) ASCII numbered\n",
+            encoding="utf-8",
+        )
+        expected = [
+            "Arabic-Indic numbered",
+            "Full-width numbered",
+            "Indented bullet",
+            "Bullet",
+            "Ünïcode bullet",
+            "ASCII numbered",
+        ]
+
+        for options in ({}, {"use_mmap": True}, {"streaming": True}):
+            result = PRDParser(prd_file, **options).parse()
+            assert result.functional_requirements == expected, options
+
+    def test_mmap_section_offsets(self, tmp_path: Path) -> None:
+        """Test that sections are located by byte offsets and decoded on demand."""
+        prd_content = "# PRD: Tëst\n\n## Goal\nShip it\n## Empty\n## Notes\n- Ünïcode note\n"
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(prd_content, encoding="utf-8")
+
+        parser = PRDParser(prd_file, use_mmap=True)
+        result = parser.parse()
+
+        assert result.raw_content == ""
+        assert result.title == "PRD: Tëst"
+        assert result.notes == ["Ünïcode note"]
+        assert list(parser.section_offsets) == ["Goal", "Empty", "Notes"]
+        start, end = parser.section_offsets["Goal"]
+        assert prd_file.read_bytes()[start:end] == b"Ship it"
+        assert parser.section_text("Notes") == "- Ünïcode note\n"
+
+    def test_heading_tree(self, tmp_path: Path) -> None:
+        """Test that H1-H4 headings are nested with offsets and indexed by name."""
+        prd_content = (
+            "# PRD: Test\n"
+            "## Functional Requirements\n"
+            "### Feature: Search\n"
+            "1) Search by name\n"
+            "#### Edge cases\n"
+            "- Empty query\n"
+            "### Feature: Export\n"
+            "1) Export to CSV\n"
+            "## Notes\n"
+            "- A note\n"
+        )
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(prd_content)
+
+        parser = PRDParser(prd_file)
+        result = parser.parse()
+
+        assert result.functional_requirements == ["Search by name", "Empty query", "Export to CSV"]
+        assert parser.headings is not None
+        (title,) = parser.headings.root.children
+        functional, notes = title.children
+        assert [child.title for child in functional.children] == [
+            "Feature: Search",
+            "Feature: Export",
+        ]
+        (edge_cases,) = parser.headings.find("  edge CASES: ")
+        assert edge_cases.path == [
+            "PRD: Test",
+            "Functional Requirements",
+            "Feature: Search",
+            "Edge cases",
+        ]
+        assert prd_content[edge_cases.content_start : edge_cases.end] == "- Empty query"
+        assert prd_content[functional.content_start : functional.end].endswith("Export to CSV")
+
+    def test_duplicate_headings_kept(self, tmp_path: Path) -> None:
+        """Test that repeated headings add to the parse instead of replacing it."""
+        prd_content = (
+            "# PRD: Test\n"
+            "## Goal\nFirst goal\n"
+            "## Notes\n- First note\n"
+            "## Requirements\n1) Generic\n"
+            "## Functional Requirements\n1) Specific\n"
+            "## Notes\n- Second note\n"
+            "## Goal\nSecond goal\n"
+        )
+        prd_file = tmp_path / "prd.md"
+        prd_file.write_text(prd_content)
+
+        for options in ({}, {"use_mmap": True}, {"streaming": True}):
+            parser = PRDParser(prd_file, **options)
+            result = parser.parse()
+            assert result.notes == ["First note", "Second note"]
+            assert result.functional_requirements == ["Generic", "Specific"]
+            assert result.goal == "First goal\n\nSecond goal"
+
+        parser = PRDParser(prd_file, cache_dir=tmp_path)
+        parser.parse()
+        assert len(parser.headings.find("notes")) == 2
+        assert list(parser.section_offsets)[-2:] == ["Notes (2)", "Goal (2)"]
+
+    def test_section_kind_table_matches_keywords(self) -> None:
+        """Test that the heading lookup table agrees with keyword classification."""
+        for name, kind in _SECTION_KINDS.items():
+            assert _classify_by_keywords(name) == kind, name
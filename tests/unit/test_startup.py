@@ -0,0 +1,67 @@
+"""Tests for package and CLI import cost."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import spec_test_generator
+
+SRC = Path(__file__).resolve().parents[2] / "src"
+
+# Import time of the package's own modules when starting the CLI, in ms.
+# Measured at ~8 ms; the budget leaves room for slow CI machines.
+CLI_IMPORT_BUDGET_MS = 40
+
+# Modules the CLI must not load before a command needs them
+HEAVY_MODULES = (
+    "yaml",
+    "sqlite3",
+    "concurrent.futures",
+    "socketserver",
+    "spec_test_generator.generator",
+    "spec_test_generator.coverage",
+    "spec_test_generator.impact",
+)
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Self import time per module in microseconds, from ``-X importtime``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env={**os.environ, "PYTHONPATH": str(SRC)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "[us]" not in line:
+            self_us, _, name = line[len("import time:") :].split("|")
+            times[name.strip()] = int(self_us)
+    return times
+
+
+class TestStartup:
+    """Tests for lazy imports."""
+
+    def test_package_import_is_lazy(self) -> None:
+        """Test that importing the package loads none of its submodules."""
+        times = _import_times("import spec_test_generator")
+
+        assert [name for name in times if name.startswith("spec_test_generator.")] == []
+
+    def test_cli_import_budget(self) -> None:
+        """Test that starting the CLI skips heavy modules and stays within budget."""
+        times = _import_times("import spec_test_generator.__main__")
+
+        assert [name for name in HEAVY_MODULES if name in times] == []
+        own_ms = sum(t for name, t in times.items() if name.startswith("spec_test_generator"))
+        assert own_ms / 1000 < CLI_IMPORT_BUDGET_MS
+
+    def test_public_names_resolve(self) -> None:
+        """Test that every public name imports on access and is listed by dir()."""
+        assert spec_test_generator.__all__ == list(spec_test_generator._LAZY_IMPORTS)
+        for name in spec_test_generator.__all__:
+            assert getattr(spec_test_generator, name).__name__ == name
+        assert set(spec_test_generator.__all__) <= set(dir(spec_test_generator))